@@ -0,0 +1,124 @@
+# api/async_views.py
+"""
+Async variants of the public read endpoints and the feedback form.
+
+Used instead of the sync views when ``API_ASYNC_VIEWS`` is on, which is
+the default for the ASGI (uvicorn worker) deployment mode. A slow client
+or a slow SMTP server then only parks a coroutine instead of holding one
+of the few gunicorn workers. Payloads are built by the same helpers as
+api/views.py, so responses are identical.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.mail import send_mail
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from core.cache import acached_response
+from core.models import HistoricEvent, HistoricPerson, HistoricPlace
+from .views import (
+    _event_document,
+    _event_persons,
+    _event_photos,
+    _geojson_response,
+    _places_geojson_body,
+    _interview_entry,
+    _interview_queryset,
+    _interviews_cache_control,
+    _interviews_response,
+    _person_document,
+    _person_events,
+    _person_places,
+    _place_document,
+    _place_events,
+    _place_persons,
+    _place_photos,
+    feedback_mail,
+)
+
+
+async def _alist(qs):
+    return [row async for row in qs]
+
+
+async def places_geojson(request):
+    """Lightweight GeoJSON for map pins (name & brief in tooltip)."""
+    async def build():
+        body = await sync_to_async(_places_geojson_body)()
+        return _geojson_response(body), []
+    return await acached_response(request, build, tags=["places"])
+
+
+async def interviews_feed(request):
+    async def build():
+        entries = [_interview_entry(r) async for r in _interview_queryset()]
+        return _interviews_response(entries), []
+    return _interviews_cache_control(
+        await acached_response(request, build, tags=["interviews"])
+    )
+
+
+async def place_details(request, pk: int):
+    async def build():
+        p = await aget_object_or_404(HistoricPlace, pk=pk)
+        return _place_document(
+            request, p,
+            await _alist(_place_photos(p.id)),
+            await _alist(_place_events(p.id)),
+            await _alist(_place_persons(p.id)),
+        )
+    return await acached_response(request, build, tags=[f"place:{pk}"])
+
+
+async def event_details(request, pk: int):
+    async def build():
+        e = await aget_object_or_404(
+            HistoricEvent.objects.select_related("place"), pk=pk
+        )
+        return _event_document(
+            request, e,
+            await _alist(_event_photos(e.id)),
+            await _alist(_event_persons(e.id)),
+        )
+    return await acached_response(request, build, tags=[f"event:{pk}"])
+
+
+async def person_details(request, pk: int):
+    async def build():
+        person = await aget_object_or_404(
+            HistoricPerson.objects.select_related("profile_photo"), pk=pk
+        )
+        return _person_document(
+            request, person,
+            await _alist(_person_events(person.id)),
+            await _alist(_person_places(person.id)),
+        )
+    return await acached_response(request, build, tags=[f"person:{pk}"])
+
+
+@csrf_exempt  # same as FeedbackView: public form, no session auth
+@require_POST
+async def feedback(request):
+    """POST /api/v1/feedback/ — see FeedbackView for the body format."""
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse({"detail": "Invalid JSON."}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({"detail": "Invalid JSON."}, status=400)
+    else:
+        data = request.POST
+
+    mail = feedback_mail(data)
+    if mail is None:
+        return JsonResponse({"detail": "Message is required."}, status=400)
+
+    # SMTP does not touch the database: run it off the ORM thread.
+    await sync_to_async(send_mail, thread_sensitive=False)(
+        *mail, fail_silently=False
+    )
+    return JsonResponse({"detail": "Feedback sent."})
@@ -0,0 +1,134 @@
+# api/authentication.py
+"""
+JWT authentication with a per-process cache of verified tokens.
+
+simplejwt's JWTAuthentication verifies the signature and loads the User row
+on every request. Here:
+
+* a verified token is remembered (bounded LRU, JWT_AUTH_CACHE_SIZE entries)
+  until its ``exp``, so repeat requests with the same token skip both the
+  signature check and the user lookup. The cache holds the claims and the
+  user's field values, never objects handed to a request: every request
+  gets its own token and user instances, which views are free to mutate
+  (per-object caches such as ``_perm_cache``) without other threads
+  seeing it;
+* tokens issued by ``ClaimsTokenObtainPairSerializer`` carry the claims the
+  API needs (username, is_staff, is_superuser), and resolve to a stateless
+  ``TokenUser`` without querying the database at all. Older tokens without
+  those claims fall back to one user query, which is then cached too.
+
+As with any stateless JWT, deactivating a user or changing their password
+takes effect for API calls when their access token expires
+(SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"]).
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+USER_CLAIMS = ("username", "is_staff", "is_superuser")
+
+
+class TokenCache:
+    """Thread-safe LRU of ``key -> (value, expires_at)``."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[1] <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return item[0]
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+token_cache = TokenCache(settings.JWT_AUTH_CACHE_SIZE)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issue tokens that carry USER_CLAIMS (copied into refreshed tokens)."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        key = hashlib.sha256(raw_token).hexdigest()
+        cached = token_cache.get(key)
+        if cached is None:
+            validated_token = self.get_validated_token(raw_token)
+            cached = (validated_token, self._user_row(validated_token))
+            token_cache.set(key, cached, validated_token["exp"])
+
+        cached_token, row = cached
+        token = copy.copy(cached_token)
+        token.payload = copy.deepcopy(cached_token.payload)
+        if row is None:
+            return TokenUser(token), token
+        return get_user_model().from_db(*row), token
+
+    def _user_row(self, validated_token):
+        """
+        ``from_db`` arguments for the token's user, or None when the claims
+        are enough to build a TokenUser.
+        """
+        if all(claim in validated_token for claim in USER_CLAIMS):
+            return None
+        user = self.get_user(validated_token)
+        fields = user._meta.concrete_fields
+        return (user._state.db, [f.attname for f in fields],
+                [getattr(user, f.attname) for f in fields])
+
+
+class LazyAuthenticationMixin:
+    """
+    Skip authentication for anonymous reads: a safe request without an
+    Authorization header is anonymous, so no authenticator needs to run.
+    """
+
+    def perform_authentication(self, request):
+        if (request.method in SAFE_METHODS
+                and api_settings.AUTH_HEADER_NAME not in request.META):
+            request._not_authenticated()
+            return
+        super().perform_authentication(request)
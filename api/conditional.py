@@ -0,0 +1,123 @@
+# api/conditional.py
+"""
+Conditional GET and Cache-Control for the ModelViewSets.
+
+Validators are computed without rendering the body:
+
+* list:     one ``SELECT MAX(<modified>), COUNT(*)`` over the filtered
+            queryset (an edit moves MAX, a delete moves COUNT)
+* retrieve: the row's ``<modified>`` value only
+
+Junction tables have no modified column; their validators use the
+``model:<label>`` cache tag that core.signals bumps on every change.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from core.cache import tag_versions
+
+MODIFIED_FIELDS = ("date_modified", "modified_at")
+
+
+def model_tag(model):
+    return f"model:{model._meta.label_lower}"
+
+
+class ConditionalGetMixin:
+    """Adds ETag/Last-Modified/Cache-Control to list and retrieve."""
+
+    # Key into settings.API_CACHE_CONTROL; defaults to the router basename.
+    cache_policy = None
+
+    def _modified_field(self, model):
+        for name in MODIFIED_FIELDS:
+            try:
+                model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            return name
+        return None
+
+    def _etag(self, request, *parts):
+        raw = "|".join(str(p) for p in (
+            self.basename,
+            request.get_full_path(),
+            getattr(request.accepted_renderer, "format", ""),
+            *parts,
+        ))
+        digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+        return f'W/"{digest}"'
+
+    def _list_validators(self, request, queryset):
+        field = self._modified_field(queryset.model)
+        if field is None:
+            count = queryset.order_by().count()
+            version = tag_versions([model_tag(queryset.model)])
+            return self._etag(request, count, *version.values()), None
+        agg = queryset.order_by().aggregate(last=Max(field), n=Count("pk"))
+        return self._etag(request, agg["last"], agg["n"]), agg["last"]
+
+    def _detail_validators(self, request, queryset):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        filters = {self.lookup_field: self.kwargs[lookup]}
+        field = self._modified_field(queryset.model)
+        if field is None:
+            if not queryset.filter(**filters).exists():
+                return None, None
+            version = tag_versions([model_tag(queryset.model)])
+            return self._etag(request, *filters.values(),
+                              *version.values()), None
+        last = queryset.filter(**filters).values_list(field, flat=True).first()
+        if last is None:
+            return None, None
+        return self._etag(request, *filters.values(), last), last
+
+    def _cache_control(self, request):
+        if request.user and request.user.is_authenticated:
+            return "private, no-cache"
+        policies = settings.API_CACHE_CONTROL
+        return policies.get(self.cache_policy or self.basename,
+                            policies["default"])
+
+    def _conditional(self, request, etag, last_modified, respond):
+        if etag is None:
+            return respond()
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = respond()
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        response["Cache-Control"] = self._cache_control(request)
+        patch_vary_headers(response, ["Accept", "Authorization"])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag, last = self._list_validators(request, queryset)
+        return self._conditional(
+            request, etag, last,
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            ),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag, last = self._detail_validators(request, queryset)
+        return self._conditional(
+            request, etag, last,
+            lambda: super(ConditionalGetMixin, self).retrieve(
+                request, *args, **kwargs
+            ),
+        )
@@ -0,0 +1,278 @@
+# api/exports.py
+"""
+Constant-memory exports of every place.
+
+    GET /api/v1/exports/places.geojson   GeoJSON FeatureCollection
+    GET /api/v1/exports/places.ndjson    one GeoJSON Feature per line
+    GET /api/v1/exports/places.csv       research columns, incl. history
+    GET /api/v1/exports/places.gpkg      OGC GeoPackage (EPSG:4326 points)
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` and
+encoded EXPORT_CHUNK_SIZE at a time, so memory does not grow with the
+number of places. The text formats are streamed as they are encoded; a
+GeoPackage is an SQLite database that must be complete before it can be
+read, so it is written to a temporary file (the rows still pass through
+in chunks) and that file is streamed.
+
+The map endpoint (``places_geojson``) joins the same GeoJSON chunks into
+its cached body instead of building a list of dicts, one dict and one
+string.
+"""
+import csv
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_safe
+
+from core.models import HistoricPlace
+
+MAP_FIELDS = ("id", "place_name", "brief", "latitude", "longitude",
+              "event_count", "person_count", "photo_count")
+CSV_FIELDS = ("id", "place_name", "latitude", "longitude", "date_start",
+              "date_end", "brief", "history", "date_added", "date_modified")
+
+GEOJSON_HEAD = '{"type": "FeatureCollection", "features": ['
+GEOJSON_TAIL = "]}"
+FILE_BLOCK_SIZE = 64 * 1024
+
+
+def place_rows(fields, ordering=("pk",)):
+    return (HistoricPlace.objects.order_by(*ordering)
+            .values_list(*fields)
+            .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE))
+
+
+def feature(row):
+    """A GeoJSON Feature for a MAP_FIELDS row."""
+    pk, name, brief, latitude, longitude, events, people, photos = row
+    return {
+        "type": "Feature",
+        "id": pk,
+        "geometry": {
+            "type": "Point",
+            "coordinates": [float(longitude), float(latitude)],
+        },
+        "properties": {
+            "name": name,
+            "brief": brief or "",
+            # Maintained counts (core/counters.py): no COUNT per place
+            "events": events,
+            "people": people,
+            "photos": photos,
+        },
+    }
+
+
+def _batches(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= settings.EXPORT_CHUNK_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def geojson_chunks(rows):
+    """A FeatureCollection as byte chunks; same bytes as JsonResponse."""
+    yield GEOJSON_HEAD.encode()
+    separator = ""
+    for batch in _batches(rows):
+        yield (separator + ", ".join(
+            json.dumps(feature(row)) for row in batch)).encode()
+        separator = ", "
+    yield GEOJSON_TAIL.encode()
+
+
+def ndjson_chunks(rows):
+    for batch in _batches(rows):
+        yield "".join(json.dumps(feature(row)) + "\n"
+                      for row in batch).encode()
+
+
+class _Echo:
+    """File-like object whose write() returns what it was given."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_FIELDS).encode()
+    for batch in _batches(rows):
+        yield "".join(writer.writerow(row) for row in batch).encode()
+
+
+# --- GeoPackage (http://www.geopackage.org/spec/) ---------------------------
+
+GPKG_APPLICATION_ID = 0x47504B47  # "GPKG"
+GPKG_USER_VERSION = 10300         # 1.3.0
+WGS84 = 4326
+GPKG_TABLE = "places"
+GPKG_SCHEMA = f"""
+CREATE TABLE gpkg_spatial_ref_sys (
+    srs_name TEXT NOT NULL, srs_id INTEGER PRIMARY KEY,
+    organization TEXT NOT NULL, organization_coordsys_id INTEGER NOT NULL,
+    definition TEXT NOT NULL, description TEXT);
+CREATE TABLE gpkg_contents (
+    table_name TEXT NOT NULL PRIMARY KEY, data_type TEXT NOT NULL,
+    identifier TEXT UNIQUE, description TEXT DEFAULT '',
+    last_change DATETIME NOT NULL, min_x DOUBLE, min_y DOUBLE,
+    max_x DOUBLE, max_y DOUBLE,
+    srs_id INTEGER REFERENCES gpkg_spatial_ref_sys(srs_id));
+CREATE TABLE gpkg_geometry_columns (
+    table_name TEXT NOT NULL, column_name TEXT NOT NULL,
+    geometry_type_name TEXT NOT NULL, srs_id INTEGER NOT NULL,
+    z TINYINT NOT NULL, m TINYINT NOT NULL,
+    PRIMARY KEY (table_name, column_name));
+CREATE TABLE {GPKG_TABLE} (
+    fid INTEGER PRIMARY KEY, geom POINT, place_name TEXT,
+    latitude DOUBLE, longitude DOUBLE, date_start TEXT, date_end TEXT,
+    brief TEXT, history TEXT, date_added DATETIME, date_modified DATETIME);
+"""
+WGS84_WKT = (
+    'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,'
+    '298.257223563]],PRIMEM["Greenwich",0],UNIT["degree",'
+    '0.0174532925199433],AUTHORITY["EPSG","4326"]]'
+)
+SPATIAL_REF_SYS = [
+    ("Undefined cartesian SRS", -1, "NONE", -1, "undefined", None),
+    ("Undefined geographic SRS", 0, "NONE", 0, "undefined", None),
+    ("WGS 84 geodetic", WGS84, "EPSG", WGS84, WGS84_WKT, None),
+]
+# GeoPackageBinary header: magic, version 0, flags (little-endian, no
+# envelope), srs_id; then a little-endian WKB Point.
+_GPKG_POINT = struct.Struct("<2sBBi" + "BIdd")
+
+
+def gpkg_point(longitude, latitude):
+    return _GPKG_POINT.pack(b"GP", 0, 0b00000001, WGS84,
+                            1, 1, longitude, latitude)
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def write_geopackage(path, rows):
+    db = sqlite3.connect(path)
+    try:
+        db.execute(f"PRAGMA application_id = {GPKG_APPLICATION_ID}")
+        db.execute(f"PRAGMA user_version = {GPKG_USER_VERSION}")
+        db.executescript(GPKG_SCHEMA)
+        db.executemany("INSERT INTO gpkg_spatial_ref_sys VALUES "
+                       "(?, ?, ?, ?, ?, ?)", SPATIAL_REF_SYS)
+        db.execute("INSERT INTO gpkg_geometry_columns VALUES "
+                   "(?, 'geom', 'POINT', ?, 0, 0)", (GPKG_TABLE, WGS84))
+        for batch in _batches(rows):
+            db.executemany(
+                f"INSERT INTO {GPKG_TABLE} VALUES "
+                f"(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(pk, gpkg_point(float(lon), float(lat)), name,
+                  float(lat), float(lon), start, end, brief, history,
+                  _iso(added), _iso(modified))
+                 for (pk, name, lat, lon, start, end, brief, history,
+                      added, modified) in batch],
+            )
+        bounds = db.execute(
+            f"SELECT min(longitude), min(latitude), max(longitude), "
+            f"max(latitude) FROM {GPKG_TABLE}").fetchone()
+        db.execute(
+            "INSERT INTO gpkg_contents VALUES "
+            "(?, 'features', ?, 'Historic places', ?, ?, ?, ?, ?, ?)",
+            (GPKG_TABLE, GPKG_TABLE,
+             timezone.now().strftime("%Y-%m-%dT%H:%M:%SZ"), *bounds, WGS84),
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+# --- views ------------------------------------------------------------------
+
+def _stream(request, chunks):
+    """
+    Stream ``chunks`` (a sync generator that reads the database). Under
+    ASGI, Django would buffer a sync iterator whole, so it is pulled one
+    chunk at a time through sync_to_async instead.
+    """
+    if not isinstance(request, ASGIRequest):
+        return chunks
+
+    async def pull():
+        next_chunk = sync_to_async(lambda: next(chunks, None))
+        while (chunk := await next_chunk()) is not None:
+            yield chunk
+    return pull()
+
+
+def _filename(extension):
+    return f"places-{timezone.localdate():%Y%m%d}.{extension}"
+
+
+TEXT_FORMATS = {
+    # format: (chunks, fields, content type, download?)
+    "geojson": (geojson_chunks, MAP_FIELDS, "application/geo+json", False),
+    "ndjson": (ndjson_chunks, MAP_FIELDS, "application/x-ndjson", False),
+    "csv": (csv_chunks, CSV_FIELDS, "text/csv; charset=utf-8", True),
+}
+
+
+@require_safe
+def places_export(request, fmt):
+    """Every place as GeoJSON, NDJSON, CSV or GeoPackage; see above."""
+    if fmt == "gpkg":
+        response = _geopackage_response(request)
+    elif fmt in TEXT_FORMATS:
+        encode, fields, content_type, download = TEXT_FORMATS[fmt]
+        response = StreamingHttpResponse(
+            _stream(request, encode(place_rows(fields))),
+            content_type=content_type,
+        )
+        if download:
+            response["Content-Disposition"] = (
+                f'attachment; filename="{_filename(fmt)}"')
+    else:
+        raise Http404("Unknown export format.")
+    response["Cache-Control"] = settings.API_CACHE_CONTROL["place"]
+    return response
+
+
+def _read_blocks(handle):
+    with handle:
+        while block := handle.read(FILE_BLOCK_SIZE):
+            yield block
+
+
+def _geopackage_response(request):
+    fd, path = tempfile.mkstemp(suffix=".gpkg", dir=settings.EXPORT_TEMP_DIR)
+    os.close(fd)
+    try:
+        write_geopackage(path, place_rows(CSV_FIELDS))
+        handle = open(path, "rb")
+    finally:
+        # The open handle keeps the data until the response closes it
+        os.unlink(path)
+    content_type = "application/geopackage+sqlite3"
+    if not isinstance(request, ASGIRequest):
+        return FileResponse(handle, as_attachment=True,
+                            filename=_filename("gpkg"),
+                            content_type=content_type)
+    # FileResponse would be read whole under ASGI as well
+    size = os.fstat(handle.fileno()).st_size
+    response = StreamingHttpResponse(
+        _stream(request, _read_blocks(handle)), content_type=content_type)
+    response["Content-Length"] = str(size)
+    response["Content-Disposition"] = (
+        f'attachment; filename="{_filename("gpkg")}"')
+    return response
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the query planner's table statistics (ANALYZE). The admin "
+        "reads large tables' row counts from them (core.admin."
+        "EstimatedCountPaginator), and SQLite chooses indexes with them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS,
+            help="Database alias (default %(default)r).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        connection = connections[options["database"]]
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            if connection.vendor == "sqlite":
+                cursor.execute("PRAGMA optimize")
+        self.stdout.write(self.style.SUCCESS(
+            f"Analyzed {connection.alias} "
+            f"in {time.monotonic() - started:.2f}s"
+        ))
@@ -0,0 +1,74 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.cache import bump_tags
+from core.models import Photo
+from core.photometa import FIELDS
+
+
+def _read(photo):
+    return photo if photo.read_metadata() else None
+
+
+class Command(BaseCommand):
+    help = (
+        "Read size, MIME type, dimensions, EXIF orientation/date and a "
+        "perceptual hash from the files of existing photos, in parallel."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Re-read every photo, not only those never inspected.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=min(8, os.cpu_count() or 1),
+            help="Files read concurrently (default: CPUs, at most 8). "
+                 "Pillow releases the GIL while decoding, so threads "
+                 "scale.",
+        )
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--budget", type=float, default=None,
+            help="Stop after the batch that passes this many seconds; the "
+                 "rest is read on the next run (default: no limit).",
+        )
+
+    def handle(self, *args, **options):
+        photos = Photo.objects.order_by("pk").only("pk", "image", *FIELDS)
+        if not options["all"]:
+            photos = photos.filter(metadata_read_at__isnull=True)
+
+        started = time.monotonic()
+        budget = options["budget"]
+        done = missing = unreadable = 0
+        batch_size = options["batch_size"]
+        last_pk = 0
+        with ThreadPoolExecutor(options["workers"]) as pool:
+            while budget is None or time.monotonic() - started < budget:
+                batch = list(photos.filter(pk__gt=last_pk)[:batch_size])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+                batch = [p for p in batch if p.image]
+                read = [p for p in pool.map(_read, batch) if p is not None]
+                missing += len(batch) - len(read)
+                unreadable += sum(p.width is None for p in read)
+
+                now = timezone.now()
+                for photo in read:
+                    photo.modified_at = now
+                Photo.objects.bulk_update(read, [*FIELDS, "modified_at"])
+                # bulk_update sends no signals: invalidate like core.signals
+                bump_tags(*(f"photo:{p.pk}" for p in read))
+                done += len(read)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Read metadata of {done} photo(s) in "
+            f"{time.monotonic() - started:.1f}s ({missing} missing from "
+            f"storage, {unreadable} not decodable as images)"
+        ))
@@ -0,0 +1,23 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.neighbors import rebuild_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the nearby-places table from scratch (after loaddata or a "
+        "change of PLACE_NEIGHBORS_K / PLACE_NEIGHBORS_RADIUS_M). Saves "
+        "and deletes keep it up to date incrementally."
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rows = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {rows} neighbour links (k={settings.PLACE_NEIGHBORS_K}, "
+            f"radius={settings.PLACE_NEIGHBORS_RADIUS_M:g} m) "
+            f"in {time.monotonic() - started:.2f}s"
+        ))
@@ -0,0 +1,76 @@
+import datetime
+import fcntl
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import PhotoUpload
+
+
+def _remove_unlocked(path):
+    """Delete a partial file unless a PATCH is writing it; True if gone."""
+    try:
+        fh = open(path, "r+b")
+    except FileNotFoundError:
+        return True
+    with fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        os.remove(path)
+    return True
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete resumable uploads (api/uploads.py) that received no chunk "
+        "for PHOTO_UPLOAD_EXPIRY_HOURS, with their partial files, and "
+        "partial files no upload refers to."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Only report what would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        expiry = datetime.timedelta(hours=settings.PHOTO_UPLOAD_EXPIRY_HOURS)
+        cutoff = timezone.now() - expiry
+
+        abandoned = finished = 0
+        stale = PhotoUpload.objects.filter(modified_at__lt=cutoff)
+        for upload in stale.only("pk", "photo", "partial_path"):
+            if upload.photo_id is None:
+                # Finished uploads only keep their row; the file is the photo's
+                if not dry_run and not _remove_unlocked(upload.partial_path):
+                    continue
+                abandoned += 1
+            else:
+                finished += 1
+            if not dry_run:
+                upload.delete()
+
+        orphans = 0
+        temp_dir = settings.PHOTO_UPLOAD_TEMP_DIR
+        if os.path.isdir(temp_dir):
+            known = set(PhotoUpload.objects.values_list("partial_path",
+                                                        flat=True))
+            old = time.time() - expiry.total_seconds()
+            for entry in os.scandir(temp_dir):
+                if (entry.is_file() and entry.name.endswith(".part")
+                        and entry.path not in known
+                        and entry.stat().st_mtime < old):
+                    if dry_run or _remove_unlocked(entry.path):
+                        orphans += 1
+
+        verb = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {abandoned} abandoned and {finished} finished upload(s) "
+            f"and {orphans} orphaned partial file(s)"
+        ))
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import HistoricInterview
+from core.youtube import OEmbedError, oembed_provider
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch YouTube oEmbed metadata (title, channel) for interviews. "
+        "Runs out of band so no page ever waits on YouTube."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Refetch every interview, not only those never fetched.",
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=5.0,
+            help="Per-request timeout in seconds (default: 5).",
+        )
+        parser.add_argument(
+            "--budget", type=float, default=None,
+            help="Stop after this many seconds; the rest is fetched on "
+                 "the next run (default: no limit).",
+        )
+
+    def handle(self, *args, **options):
+        fetch = oembed_provider()
+        interviews = HistoricInterview.objects.exclude(youtube_video_id="")
+        if not options["all"]:
+            interviews = interviews.filter(metadata_fetched_at__isnull=True)
+
+        deadline = (time.monotonic() + options["budget"]
+                    if options["budget"] is not None else None)
+        fetched = failed = 0
+        # save() re-parses youtube_url: load it, or each save defers a SELECT
+        for interview in interviews.only("pk", "youtube_url",
+                                         "youtube_video_id"):
+            if deadline is not None and time.monotonic() >= deadline:
+                self.stdout.write("Time budget exhausted; stopping")
+                break
+            try:
+                data = fetch(interview.youtube_video_id, options["timeout"])
+            except OEmbedError as exc:
+                failed += 1
+                self.stderr.write(f"interview {interview.pk}: {exc}")
+                continue
+            interview.video_title = (data.get("title") or "")[:255]
+            interview.video_author = (data.get("author_name") or "")[:255]
+            interview.metadata_fetched_at = timezone.now()
+            # save() bumps the "interviews" cache tag via core.signals
+            interview.save(update_fields=[
+                "video_title", "video_author", "metadata_fetched_at",
+            ])
+            fetched += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Fetched metadata for {fetched} interview(s) ({failed} failed)"
+        ))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.cache import bump_tags
+from core.counters import cache_tags, true_counts
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the link counts of places, events and people from the "
+        "link tables and fix any that drifted (bulk edits, raw SQL, "
+        "loaddata)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Only report drifted counts, and fail if there are any.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = 0
+        for parent, expressions in true_counts().items():
+            name = parent._meta.verbose_name_plural
+            differs = Q()
+            for field in expressions:
+                differs |= ~Q(**{field: F(f"true_{field}")})
+            pks = list(
+                parent.objects.order_by()
+                .annotate(**{f"true_{field}": expression
+                             for field, expression in expressions.items()})
+                .filter(differs)
+                .values_list("pk", flat=True)
+            )
+            if not pks:
+                self.stdout.write(f"{name}: counts match")
+                continue
+            drifted += len(pks)
+            self.stdout.write(self.style.WARNING(
+                f"{name}: {len(pks)} row(s) with drifted counts"
+            ))
+            if options["check"]:
+                continue
+            for start in range(0, len(pks), BATCH_SIZE):
+                # Recomputed in the UPDATE itself, not from the values read
+                # above, so links changed meanwhile are not lost
+                parent.objects.filter(
+                    pk__in=pks[start:start + BATCH_SIZE]
+                ).update(**expressions, date_modified=timezone.now())
+            bump_tags(*cache_tags([(parent, pk) for pk in pks]))
+
+        if drifted and options["check"]:
+            raise CommandError(f"{drifted} row(s) have drifted counts")
+        self.stdout.write(self.style.SUCCESS(
+            f"Fixed the counts of {drifted} row(s)" if drifted
+            else "All link counts match"
+        ))
@@ -0,0 +1,79 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from core.slow_queries import log_files, read_entries
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarize the slow-query log (core/slow_queries.py): the query "
+        "templates that took the most time in total, where they came from "
+        "and the plan of their slowest run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top", type=int, default=10,
+            help="Number of templates to show (default 10).",
+        )
+        parser.add_argument(
+            "--hours", type=float, default=None,
+            help="Only entries from the last HOURS hours.",
+        )
+        parser.add_argument(
+            "--no-plans", action="store_true",
+            help="Leave out the query plans.",
+        )
+
+    def handle(self, *args, **options):
+        since = (time.time() - options["hours"] * 3600
+                 if options["hours"] is not None else None)
+        groups = {}
+        for entry in read_entries():
+            if since is not None and entry.get("at", 0) < since:
+                continue
+            group = groups.setdefault(entry["template"], {
+                "count": 0, "total": 0.0, "slowest": entry,
+                "origins": Counter(),
+            })
+            group["count"] += 1
+            group["total"] += entry["ms"]
+            where = [entry.get("origin")]
+            if entry.get("view"):
+                where.append(f"view {entry['view']}")
+            group["origins"][" in ".join(filter(None, where)) or "?"] += 1
+            if entry["ms"] > group["slowest"]["ms"]:
+                group["slowest"] = entry
+
+        if not groups:
+            files = ", ".join(str(p) for p in log_files()) or "no log files"
+            self.stdout.write(f"No slow queries logged ({files})")
+            return
+
+        ranked = sorted(groups.items(), key=lambda item: item[1]["total"],
+                        reverse=True)
+        self.stdout.write(
+            f"{sum(g['count'] for g in groups.values())} slow queries, "
+            f"{len(groups)} templates; worst by total time:"
+        )
+        for rank, (sql, group) in enumerate(ranked[:options["top"]], 1):
+            slowest = group["slowest"]
+            self.stdout.write("")
+            self.stdout.write(self.style.WARNING(
+                f"#{rank}  {group['total']:.1f} ms total, "
+                f"{group['count']} run(s), "
+                f"{group['total'] / group['count']:.1f} ms mean, "
+                f"{slowest['ms']:.1f} ms max"
+            ))
+            self.stdout.write(f"    {sql}")
+            for origin, count in group["origins"].most_common(3):
+                self.stdout.write(f"    from {origin} ({count}x)")
+            if slowest.get("params"):
+                self.stdout.write(
+                    f"    slowest with params: {', '.join(slowest['params'])}")
+            if slowest.get("plan") and not options["no_plans"]:
+                self.stdout.write("    plan:")
+                for line in slowest["plan"]:
+                    self.stdout.write(f"      {line}")
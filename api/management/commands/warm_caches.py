@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from core.models import HistoricEvent, HistoricPerson, HistoricPlace
+
+
+def warm_imports():
+    """Modules the first requests would otherwise import lazily."""
+    import PIL.Image  # noqa: F401
+    import rest_framework.renderers  # noqa: F401
+    import rest_framework.pagination  # noqa: F401
+
+
+def public_documents():
+    """(name, url) of every cached public document, most important first."""
+    yield "places.geojson", reverse("places-geojson")
+    yield "interviews feed", reverse("interviews-feed")
+    for pk in HistoricPlace.objects.values_list("pk", flat=True):
+        yield f"place {pk}", reverse("place-details", args=[pk])
+    for pk in HistoricEvent.objects.values_list("pk", flat=True):
+        yield f"event {pk}", reverse("event-details", args=[pk])
+    for pk in HistoricPerson.objects.values_list("pk", flat=True):
+        yield f"person {pk}", reverse("person-details", args=[pk])
+
+
+class Command(BaseCommand):
+    help = (
+        "Prebuild the shared response cache (map GeoJSON, every detail "
+        "document) within a time budget. Run at container start."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--budget", type=float, default=30.0,
+            help="Stop after this many seconds (default: 30).",
+        )
+        parser.add_argument(
+            "--host", action="append", dest="hosts",
+            help="Host to warm for (repeatable). Cached documents contain "
+                 "absolute media URLs, so they are stored per host. "
+                 "Defaults to every concrete entry in ALLOWED_HOSTS.",
+        )
+        parser.add_argument(
+            "--https", action="store_true",
+            help="Warm the https:// variants instead of http://.",
+        )
+
+    def handle(self, *args, **options):
+        deadline = time.monotonic() + options["budget"]
+        hosts = options["hosts"] or [
+            h for h in settings.ALLOWED_HOSTS
+            if h and not h.startswith(".") and "*" not in h
+        ] or ["localhost"]
+
+        warm_imports()
+        clients = {host: Client(HTTP_HOST=host) for host in hosts}
+
+        built = failed = 0
+        out_of_time = False
+        for name, url in public_documents():
+            for host in hosts:
+                if time.monotonic() >= deadline:
+                    out_of_time = True
+                    break
+                response = clients[host].get(url, secure=options["https"])
+                if response.status_code == 200:
+                    built += 1
+                else:
+                    failed += 1
+                    self.stderr.write(
+                        f"{name} @ {host}: HTTP {response.status_code}"
+                    )
+            if out_of_time:
+                break
+
+        used = options["budget"] - max(deadline - time.monotonic(), 0)
+        summary = (f"Warmed {built} documents for {len(hosts)} host(s) "
+                   f"in {used:.1f}s ({failed} failed)")
+        if out_of_time:
+            self.stdout.write(self.style.WARNING(
+                summary + "; time budget exhausted, the rest stays lazy"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
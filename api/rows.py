@@ -0,0 +1,171 @@
+# api/rows.py
+"""
+Read-only fast path for list endpoints.
+
+A ModelSerializer builds a model instance per row and runs every field's
+``get_attribute``/``to_representation`` on it. For a list page the same
+output can be produced from plain ``values_list`` tuples: ``RowConverter``
+inspects the serializer's fields once and compiles one converter per
+column (Decimals, dates, datetimes, file URLs; plain values pass
+through untouched).
+
+Only simple fields are supported: model columns, foreign keys rendered as
+primary keys, and file fields. Anything else (nested or method fields,
+many-to-many) raises ImproperlyConfigured when the converter is built.
+
+``ValuesListMixin`` uses it for ``list`` when ``fast_list`` is set on the
+viewset and settings.API_FAST_LISTS is on; writes, retrieve and the
+browsable forms keep using the regular serializers.
+"""
+import datetime
+import decimal
+import functools
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _decimal(field):
+    coerce = getattr(field, "coerce_to_string",
+                     api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.localize or field.normalize_output or not coerce:
+        return lambda request: field.to_representation
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    context.prec = field.max_digits
+
+    def convert(value):
+        return f"{value.quantize(exponent, field.rounding, context):f}"
+    return lambda request: convert
+
+
+def _date(field):
+    if getattr(field, "format", api_settings.DATE_FORMAT) != ISO_8601:
+        return lambda request: field.to_representation
+    return lambda request: datetime.date.isoformat
+
+
+def _datetime(field):
+    if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601:
+        return lambda request: field.to_representation
+
+    def make(request):
+        # The active timezone may change per request
+        tz = (field.timezone if hasattr(field, "timezone")
+              else field.default_timezone())
+
+        def convert(value):
+            if tz is not None:
+                value = value.astimezone(tz)
+            text = value.isoformat()
+            return text[:-6] + "Z" if text.endswith("+00:00") else text
+        return convert
+    return make
+
+
+def _file(field, model_field):
+    if not getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+        return lambda request: (lambda name: name or None)
+    storage = model_field.storage
+
+    def make(request):
+        def convert(name):
+            if not name:
+                return None
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request else url
+        return convert
+    return make
+
+
+# Fields whose representation of a database value is the value itself
+_PLAIN = (
+    serializers.BooleanField, serializers.CharField, serializers.ChoiceField,
+    serializers.FloatField, serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class RowConverter:
+    """
+    Turns ``queryset.values_list(*converter.columns)`` rows into the dicts
+    ``serializer_class(many=True)`` would return for the same rows.
+    """
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        names, columns, special = [], [], []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                model_field = None
+            if (model_field is None or model_field.many_to_many
+                    or not model_field.concrete):
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} is not a column; "
+                    f"it cannot be served from values_list()"
+                )
+            index = len(columns)
+            names.append(name)
+            columns.append(model_field.attname)
+
+            if isinstance(field, serializers.DecimalField):
+                special.append((index, name, _decimal(field)))
+            elif isinstance(field, serializers.DateTimeField):
+                special.append((index, name, _datetime(field)))
+            elif isinstance(field, serializers.DateField):
+                special.append((index, name, _date(field)))
+            elif isinstance(field, serializers.FileField):
+                special.append((index, name, _file(field, model_field)))
+            elif not isinstance(field, _PLAIN):
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name}: "
+                    f"{type(field).__name__} has no row converter"
+                )
+        self.names = tuple(names)
+        self.columns = tuple(columns)
+        self._special = special
+
+    def convert(self, rows, request=None):
+        names = self.names
+        special = [(i, name, make(request))
+                   for i, name, make in self._special]
+        out = []
+        for row in rows:
+            item = dict(zip(names, row))
+            for i, name, convert in special:
+                value = row[i]
+                if value is not None:
+                    item[name] = convert(value)
+            out.append(item)
+        return out
+
+
+@functools.cache
+def row_converter(serializer_class):
+    return RowConverter(serializer_class)
+
+
+class ValuesListMixin:
+    """``list`` from values_list() rows when ``fast_list`` is True."""
+
+    fast_list = False
+
+    def list(self, request, *args, **kwargs):
+        if not (self.fast_list and settings.API_FAST_LISTS):
+            return super().list(request, *args, **kwargs)
+        converter = row_converter(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values_list(*converter.columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                converter.convert(page, request))
+        return Response(converter.convert(rows, request))
@@ -0,0 +1,274 @@
+# api/uploads.py
+"""
+Resumable (tus-like) photo uploads.
+
+    POST   /api/v1/uploads/          Upload-Length: <bytes>
+                                     {"file_name": "...", "caption": "..."}
+    HEAD   /api/v1/uploads/<id>/     -> Upload-Offset / Upload-Length
+    PATCH  /api/v1/uploads/<id>/     Upload-Offset: <bytes>
+                                     Content-Type: application/offset+octet-stream
+    DELETE /api/v1/uploads/<id>/     abandon the upload
+
+Each PATCH body is streamed straight onto the partial file on disk, so a
+dropped connection only loses the chunk in flight: the client asks for the
+current offset with HEAD and resumes from there. When the last byte arrives
+the partial file is moved (not copied) into the photo storage and the Photo
+row is created with the size we already know. Its content-addressed name
+comes from a digest chained over the chunks as they are written, so the
+file is not reopened in that request: dimensions, EXIF and the hash are read in the background
+(core/photometa.py, ``read_later``).
+
+A PATCH holds an exclusive lock (``flock``) on the partial file while it
+checks the offset, writes and finalizes, so two requests for the same
+upload can never interleave their bytes: the second one gets 409. The
+lock is per file, so it holds across workers, and the kernel drops it if
+a worker dies mid-chunk.
+
+Uploads that receive no chunk for PHOTO_UPLOAD_EXPIRY_HOURS (announced
+in Upload-Expires) are deleted with their partial file by
+``manage.py expire_uploads``.
+"""
+import fcntl
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core import photometa
+from core.media import chain_digest
+from core.models import Photo, PhotoUpload
+from .serializers import PhotoSerializer
+
+TUS_VERSION = "1.0.0"
+OFFSET_CONTENT_TYPE = "application/offset+octet-stream"
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def _int_header(request, name):
+    try:
+        value = int(request.headers.get(name, ""))
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+def _offset_headers(upload):
+    return {
+        "Tus-Resumable": TUS_VERSION,
+        "Upload-Offset": str(upload.offset),
+        "Upload-Length": str(upload.total_size),
+        "Upload-Expires": http_date(upload.expires_at.timestamp()),
+        "Cache-Control": "no-store",
+    }
+
+
+def _finalize(upload):
+    """Move the assembled file into photo storage and create the Photo."""
+    photo = Photo(caption=upload.caption)
+    photo._content_digest = upload.content_digest
+    storage = photo.image.storage
+    name = photo.image.field.generate_filename(photo, upload.file_name)
+    name = storage.get_available_name(name)
+    dest = storage.path(name)
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+
+    photo.image.name = name
+    photo.file_size = upload.total_size
+    moved = False
+    try:
+        with transaction.atomic():
+            photo.save()
+            upload.photo = photo
+            upload.save(update_fields=["photo", "modified_at"])
+            photometa.read_later(photo.pk)
+            # Last, so a failed save leaves the partial file in place
+            os.replace(upload.partial_path, dest)
+            moved = True
+    except BaseException:
+        if moved:
+            # The rows were rolled back: put the file back for a retry
+            os.replace(dest, upload.partial_path)
+        raise
+    return photo
+
+
+class PhotoUploadCreateView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        total_size = _int_header(request, "Upload-Length")
+        file_name = os.path.basename(
+            (request.data.get("file_name") or "").strip()
+        )
+        caption = (request.data.get("caption") or "").strip()
+
+        if total_size is None or total_size == 0:
+            return Response(
+                {"detail": "Upload-Length header is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if total_size > settings.PHOTO_UPLOAD_MAX_SIZE:
+            return Response(
+                {"detail": "Upload exceeds the maximum photo size."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        ext = file_name.rsplit(".", 1)[-1].lower() if "." in file_name else ""
+        if ext not in dict(Photo.FileType.choices):
+            return Response(
+                {"detail": "Unsupported file type."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(caption) > 250:
+            return Response(
+                {"detail": "Caption is too long."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        upload = PhotoUpload(
+            file_name=file_name,
+            caption=caption,
+            total_size=total_size,
+            created_by_id=request.user.pk,
+        )
+        temp_dir = settings.PHOTO_UPLOAD_TEMP_DIR
+        os.makedirs(temp_dir, exist_ok=True)
+        upload.partial_path = os.path.join(temp_dir, f"{upload.id}.part")
+        open(upload.partial_path, "wb").close()
+        upload.save()
+
+        headers = _offset_headers(upload)
+        headers["Location"] = request.build_absolute_uri(f"{upload.id}/")
+        return Response(
+            {"id": str(upload.id), "offset": 0, "length": total_size},
+            status=status.HTTP_201_CREATED,
+            headers=headers,
+        )
+
+
+class PhotoUploadView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_upload(self, request, pk):
+        return get_object_or_404(
+            PhotoUpload, pk=pk, created_by_id=request.user.pk
+        )
+
+    def head(self, request, pk):
+        upload = self.get_upload(request, pk)
+        return Response(status=status.HTTP_200_OK,
+                        headers=_offset_headers(upload))
+
+    def _completed(self, request, upload):
+        return Response(
+            PhotoSerializer(upload.photo, context={"request": request}).data,
+            status=status.HTTP_200_OK,
+            headers=_offset_headers(upload),
+        )
+
+    def patch(self, request, pk):
+        upload = self.get_upload(request, pk)
+
+        if upload.photo_id is not None:
+            return self._completed(request, upload)
+        if request.content_type != OFFSET_CONTENT_TYPE:
+            return Response(
+                {"detail": f"Content-Type must be {OFFSET_CONTENT_TYPE}."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        try:
+            fh = open(upload.partial_path, "r+b")
+        except FileNotFoundError:
+            # Finalized by a concurrent request meanwhile
+            upload.refresh_from_db()
+            if upload.photo_id is not None:
+                return self._completed(request, upload)
+            return Response(
+                {"detail": "The partial upload is gone; start again."},
+                status=status.HTTP_410_GONE,
+                headers={"Tus-Resumable": TUS_VERSION},
+            )
+        with fh:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return Response(
+                    {"detail": "Concurrent write to the same upload."},
+                    status=status.HTTP_409_CONFLICT,
+                    headers=_offset_headers(upload),
+                )
+            # The offset (or completion) may have moved before the lock
+            # was ours; from here on only this request changes them.
+            upload.refresh_from_db()
+            if upload.photo_id is not None:
+                return self._completed(request, upload)
+            return self._write(request, upload, fh)
+
+    def _write(self, request, upload, fh):
+        offset = _int_header(request, "Upload-Offset")
+        if offset != upload.offset:
+            return Response(
+                {"detail": "Upload-Offset does not match the server offset."},
+                status=status.HTTP_409_CONFLICT,
+                headers=_offset_headers(upload),
+            )
+        length = _int_header(request, "Content-Length") or 0
+        if upload.offset + length > upload.total_size:
+            return Response(
+                {"detail": "Chunk runs past Upload-Length."},
+                status=status.HTTP_400_BAD_REQUEST,
+                headers=_offset_headers(upload),
+            )
+
+        written = upload.offset
+        digest = upload.content_digest
+        stream = request.stream
+        try:
+            fh.seek(upload.offset)
+            fh.truncate()
+            while stream is not None and written < upload.total_size:
+                block = stream.read(
+                    min(READ_BLOCK_SIZE, upload.total_size - written)
+                )
+                if not block:
+                    break
+                fh.write(block)
+                written += len(block)
+                digest = chain_digest(digest, block)
+            fh.flush()
+        finally:
+            # Record whatever reached the disk, even if the client went away
+            # mid-chunk, so the next HEAD lets it resume from there.
+            upload.modified_at = timezone.now()  # postpones expiry
+            PhotoUpload.objects.filter(pk=upload.pk).update(
+                offset=written, content_digest=digest,
+                modified_at=upload.modified_at)
+            upload.offset = written
+            upload.content_digest = digest
+
+        if not upload.is_complete:
+            return Response(status=status.HTTP_204_NO_CONTENT,
+                            headers=_offset_headers(upload))
+
+        photo = _finalize(upload)
+        return Response(
+            PhotoSerializer(photo, context={"request": request}).data,
+            status=status.HTTP_201_CREATED,
+            headers=_offset_headers(upload),
+        )
+
+    def delete(self, request, pk):
+        upload = self.get_upload(request, pk)
+        if upload.photo_id is None:
+            try:
+                os.remove(upload.partial_path)
+            except FileNotFoundError:
+                pass
+        upload.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT,
+                        headers={"Tus-Resumable": TUS_VERSION})
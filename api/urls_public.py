@@ -0,0 +1,72 @@
+# api/urls_public.py
+"""
+Anonymous, read-mostly API routes: the map, detail documents, feedback and
+the read side of the router. Served on their own by the lean public
+profile (config.settings_public); api/urls.py adds auth and uploads.
+"""
+from django.conf import settings
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from .exports import places_export
+from .views import (
+    HealthView, places_geojson, place_details, event_details, person_details,
+    PhotoViewSet, HistoricPersonViewSet,
+    HistoricPlaceViewSet, HistoricEventViewSet,
+    PersonPlaceViewSet, EventPersonViewSet,
+    EventPhotoViewSet, PlacePhotoViewSet,
+    HistoricInterviewViewSet, FeedbackView, interviews_feed,
+    graph_neighborhood, graph_path, timeline_histogram,
+)
+
+if settings.API_ASYNC_VIEWS:
+    from . import async_views
+    places_geojson = async_views.places_geojson
+    place_details = async_views.place_details
+    event_details = async_views.event_details
+    person_details = async_views.person_details
+    interviews_feed = async_views.interviews_feed
+    feedback_view = async_views.feedback
+else:
+    feedback_view = FeedbackView.as_view()
+
+router = DefaultRouter()
+router.register(r"photos", PhotoViewSet, basename="photo")
+router.register(r"people", HistoricPersonViewSet, basename="person")
+router.register(r"places", HistoricPlaceViewSet, basename="place")
+router.register(r"events", HistoricEventViewSet, basename="event")
+router.register(r"person-places", PersonPlaceViewSet, basename="person-place")
+router.register(r"event-people", EventPersonViewSet, basename="event-person")
+router.register(r"event-photos", EventPhotoViewSet, basename="event-photo")
+router.register(r"place-photos", PlacePhotoViewSet, basename="place-photo")
+router.register(r"interviews", HistoricInterviewViewSet, basename="interview")
+
+public_patterns = [
+    path("health/", HealthView.as_view(), name="health"),
+
+    # Map data & details
+    path("places.geojson", places_geojson, name="places-geojson"),
+    path("places/<int:pk>/details/", place_details, name="place-details"),
+    path("events/<int:pk>/details/", event_details, name="event-details"),
+    path("persons/<int:pk>/details/", person_details, name="person-details"),
+    path("interviews/feed/", interviews_feed, name="interviews-feed"),
+
+    # Streaming exports of every place: geojson, ndjson, csv, gpkg
+    path("exports/places.<str:fmt>", places_export, name="places-export"),
+
+    # Relationship graph: n-hop neighbourhood, shortest connection
+    path("graph/path/", graph_path, name="graph-path"),
+    path(
+        "graph/<str:kind>/<int:pk>/",
+        graph_neighborhood,
+        name="graph-neighborhood",
+    ),
+    # Events/places per year or decade, from precomputed buckets
+    path("timeline/histogram/", timeline_histogram,
+         name="timeline-histogram"),
+    path("feedback/", feedback_view, name="feedback"),
+]
+
+urlpatterns = public_patterns + [
+    path("", include(router.urls)),
+]
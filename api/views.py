@@ -1,11 +1,20 @@
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.mail import send_mail
 from django.shortcuts import get_object_or_404
 
+from core.cache import cached_response
+from core.graph import (
+    GRAPH_TAG, KINDS, LABELS_TAG, get_graph, labels as graph_labels
+)
+from core.photo_order import reorder
+from core.timeline import GRANULARITIES, TIMELINE_TAG, histogram
+from core.youtube import thumbnail_url
 from core.models import (
     Photo,
     HistoricPerson,
@@ -15,8 +24,13 @@ from core.models import (
     EventPerson,
     EventPhoto,
     PlacePhoto,
-    HistoricInterview
+    HistoricInterview,
+    PlaceNeighbor,
 )
+from .authentication import LazyAuthenticationMixin
+from .conditional import ConditionalGetMixin
+from .exports import MAP_FIELDS, geojson_chunks, place_rows
+from .rows import ValuesListMixin
 from .serializers import (
     PhotoSerializer,
     HistoricPersonSerializer,
@@ -54,89 +68,181 @@ class FeedbackView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request):
-        name = (request.data.get("name") or "").strip()
-        email = (request.data.get("email") or "").strip()
-        message = (request.data.get("message") or "").strip()
-
-        if not message:
+        mail = feedback_mail(request.data)
+        if mail is None:
             return Response(
                 {"detail": "Message is required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        subject = "New feedback from CAAHT Web Map"
+        send_mail(*mail, fail_silently=False)
 
-        lines = []
-        if name:
-            lines.append(f"Name: {name}")
-        if email:
-            lines.append(f"Email: {email}")
-        if name or email:
-            lines.append("")
-        lines.append(message)
+        return Response({"detail": "Feedback sent."},
+                        status=status.HTTP_200_OK)
 
-        body = "\n".join(lines)
 
-        recipient = getattr(
-            settings,
-            "FEEDBACK_RECIPIENT",
-            "support@historicalcairo.com",
-        )
+def feedback_mail(data):
+    """
+    Build the ``send_mail`` arguments (subject, body, from, recipients) for
+    a feedback submission, or None when the message is missing.
+    """
+    name = (data.get("name") or "").strip()
+    email = (data.get("email") or "").strip()
+    message = (data.get("message") or "").strip()
+
+    if not message:
+        return None
+
+    subject = "New feedback from CAAHT Web Map"
+
+    lines = []
+    if name:
+        lines.append(f"Name: {name}")
+    if email:
+        lines.append(f"Email: {email}")
+    if name or email:
+        lines.append("")
+    lines.append(message)
+
+    body = "\n".join(lines)
+
+    recipient = getattr(
+        settings,
+        "FEEDBACK_RECIPIENT",
+        "support@historicalcairo.com",
+    )
+    return subject, body, settings.DEFAULT_FROM_EMAIL, [recipient]
 
-        send_mail(
-            subject,
-            body,
-            settings.DEFAULT_FROM_EMAIL,
-            [recipient],
-            fail_silently=False,
-        )
 
-        return Response({"detail": "Feedback sent."},
-                        status=status.HTTP_200_OK)
+class BaseReadWrite(LazyAuthenticationMixin, ConditionalGetMixin,
+                    ValuesListMixin, viewsets.ModelViewSet):
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
 
-class BaseReadWrite(viewsets.ModelViewSet):
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+class PhotoOrderMixin:
+    """Adds ``PUT {id}/photo-order/`` for the viewset's gallery kind."""
+
+    photo_gallery = None  # "place" or "event" (core/photo_order.py)
+
+    @action(detail=True, methods=["put"], url_path="photo-order")
+    def photo_order(self, request, pk=None):
+        """
+        PUT /api/v1/{places|events}/{id}/photo-order/  {"photos": [12, 7, 30]}
+
+        Reorder the whole gallery at once: every photo of the place/event,
+        by photo id, first to last.
+        """
+        parent = self.get_object()
+        photos = (request.data.get("photos")
+                  if isinstance(request.data, dict) else None)
+        if not isinstance(photos, list) or not all(
+                type(photo) is int for photo in photos):
+            return Response({"detail": "photos must be a list of photo ids."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            reorder(self.photo_gallery, parent.pk, photos)
+        except ValidationError as exc:
+            return Response({"detail": " ".join(exc.messages)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response({self.photo_gallery: parent.pk, "photos": photos})
 
 
 class PhotoViewSet(BaseReadWrite):
     queryset = Photo.objects.all()
     serializer_class = PhotoSerializer
+    fast_list = True
 
 
 class HistoricPersonViewSet(BaseReadWrite):
-    queryset = HistoricPerson.objects.select_related("profile_photo").all()
+    queryset = (HistoricPerson.objects.select_related("profile_photo")
+                .prefetch_related("events"))
     serializer_class = HistoricPersonSerializer
 
 
-class HistoricPlaceViewSet(BaseReadWrite):
+class HistoricPlaceViewSet(PhotoOrderMixin, BaseReadWrite):
     queryset = HistoricPlace.objects.all()
     serializer_class = HistoricPlaceSerializer
+    fast_list = True
+    photo_gallery = "place"
+
+    @action(detail=True, methods=["get"])
+    def nearby(self, request, pk=None):
+        """
+        GET /api/v1/places/{id}/nearby/?k=5&radius=1000
+
+        Up to ``k`` places within ``radius`` meters, closest first, from the
+        precomputed neighbour table (core/neighbors.py).
+        """
+        if not pk.isdigit():
+            raise Http404
+        max_k = settings.PLACE_NEIGHBORS_K
+        max_radius = settings.PLACE_NEIGHBORS_RADIUS_M
+        try:
+            k = int(request.query_params.get("k", min(5, max_k)))
+            radius = float(request.query_params.get("radius", max_radius))
+        except ValueError:
+            return Response({"detail": "k and radius must be numbers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not (1 <= k <= max_k and 0 < radius <= max_radius):
+            return Response(
+                {"detail": f"k must be 1-{max_k} and radius 0-"
+                           f"{max_radius:g} meters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        links = list(
+            PlaceNeighbor.objects
+            .filter(place_id=pk, distance_m__lte=radius)
+            .order_by("distance_m")
+            .values_list("distance_m", "neighbor_id", "neighbor__place_name",
+                         "neighbor__brief", "neighbor__latitude",
+                         "neighbor__longitude")[:k]
+        )
+        if not links:
+            get_object_or_404(HistoricPlace.objects.only("pk"), pk=pk)
+        response = Response({
+            "place": int(pk),
+            "radius_m": radius,
+            "results": [
+                {"id": nid, "name": name, "brief": brief or "",
+                 "distance_m": round(d), "latitude": float(lat),
+                 "longitude": float(lon)}
+                for d, nid, name, brief, lat, lon in links
+            ],
+        })
+        response["Cache-Control"] = settings.API_CACHE_CONTROL["place"]
+        return response
 
 
-class HistoricEventViewSet(BaseReadWrite):
+class HistoricEventViewSet(PhotoOrderMixin, BaseReadWrite):
     queryset = HistoricEvent.objects.all()
     serializer_class = HistoricEventSerializer
+    fast_list = True
+    photo_gallery = "event"
 
 
 class PersonPlaceViewSet(BaseReadWrite):
     queryset = PersonPlace.objects.select_related("person", "place").all()
     serializer_class = PersonPlaceSerializer
+    fast_list = True
 
 
 class EventPersonViewSet(BaseReadWrite):
     queryset = EventPerson.objects.select_related("event", "person").all()
     serializer_class = EventPersonSerializer
+    fast_list = True
 
 
 class EventPhotoViewSet(BaseReadWrite):
     queryset = EventPhoto.objects.select_related("event", "photo").all()
     serializer_class = EventPhotoSerializer
+    fast_list = True
 
 
 class PlacePhotoViewSet(BaseReadWrite):
     queryset = PlacePhoto.objects.select_related("place", "photo").all()
     serializer_class = PlacePhotoSerializer
+    fast_list = True
 
 
 class HistoricInterviewViewSet(BaseReadWrite):
@@ -144,25 +250,62 @@ class HistoricInterviewViewSet(BaseReadWrite):
     serializer_class = HistoricInterviewSerializer
 
 
+def _places_geojson_body():
+    # Encoded chunk by chunk (api/exports.py) rather than as a list of
+    # feature dicts, then one dict, then one string
+    rows = place_rows(MAP_FIELDS, HistoricPlace._meta.ordering)
+    return b"".join(geojson_chunks(rows))
+
+
+def _geojson_response(body):
+    return HttpResponse(body, content_type="application/json")
+
+
 def places_geojson(request):
     """Lightweight GeoJSON for map pins (name & brief in tooltip)."""
-    features = []
-    qs = HistoricPlace.objects.all().only(
-        "id", "place_name", "brief", "latitude", "longitude"
+    def build():
+        return _geojson_response(_places_geojson_body()), []
+    return cached_response(request, build, tags=["places"])
+
+
+def _interview_queryset():
+    return HistoricInterview.objects.values(
+        "id", "interviewee_name", "interviewer_name", "interview_date",
+        "brief_description", "youtube_video_id", "video_title",
+    )
+
+
+def _interview_entry(row):
+    video_id = row["youtube_video_id"] or None
+    return {
+        "id": row["id"],
+        "interviewee_name": row["interviewee_name"],
+        "interviewer_name": row["interviewer_name"],
+        "interview_date": row["interview_date"].isoformat(),
+        "brief_description": row["brief_description"],
+        "video_id": video_id,
+        "thumbnail_url": thumbnail_url(video_id) if video_id else None,
+        "title": row["video_title"] or None,
+    }
+
+
+def _interviews_response(entries):
+    return JsonResponse({"interviews": entries})
+
+
+def _interviews_cache_control(response):
+    response["Cache-Control"] = settings.API_CACHE_CONTROL["interview"]
+    return response
+
+
+def interviews_feed(request):
+    """Every interview, compact and unpaginated, for the oral history tab."""
+    def build():
+        entries = [_interview_entry(r) for r in _interview_queryset()]
+        return _interviews_response(entries), []
+    return _interviews_cache_control(
+        cached_response(request, build, tags=["interviews"])
     )
-    for p in qs:
-        features.append({
-            "type": "Feature",
-            "id": p.id,
-            "geometry": {
-                "type": "Point",
-                "coordinates": [
-                    float(p.longitude),
-                    float(p.latitude)
-                ]},
-            "properties": {"name": p.place_name, "brief": p.brief or ""},
-        })
-    return JsonResponse({"type": "FeatureCollection", "features": features})
 
 
 def _abs(request, url):
@@ -170,41 +313,52 @@ def _abs(request, url):
     return request.build_absolute_uri(url) if url else None
 
 
-def place_details(request, pk: int):
-    """Rich detail for a place: fields, photos, events, persons."""
-    p = get_object_or_404(HistoricPlace, pk=pk)
-
-    photos = [
-        {
-            "url": _abs(request,
-                        pp.photo.image.url) if getattr(
-                                                pp.photo,
-                                                "image", None
-                                            ) else None,
-            "caption": pp.photo.caption,
-            "order": pp.photo_order,
-        }
-        for pp in (PlacePhoto.objects
-                   .select_related("photo")
-                   .filter(place=p)
-                   .order_by("photo_order"))
-        if getattr(pp.photo, "image", None)
-    ]
+def _photo_entry(request, link):
+    """Shape a PlacePhoto/EventPhoto row (photo preloaded) for details."""
+    return {
+        "url": _abs(request, link.photo.image.url),
+        "caption": link.photo.caption,
+        "order": link.photo_order,
+        # Lets the client reserve layout space before the image loads
+        "width": link.photo.width,
+        "height": link.photo.height,
+    }
 
-    events = list(
-        HistoricEvent.objects.filter(place=p)
-        .values("id", "event_name", "event_date")
-        .order_by("-event_date")
-    )
 
-    persons = list(
-        HistoricPerson.objects.filter(personplace__place=p)
-        .distinct()
-        .values("id", "first_name", "last_name")
-        .order_by("last_name", "first_name")
-    )
+# Querysets, payload shapes and cache tags shared by the sync views below
+# and the async variants in api/async_views.py, so both return identical
+# JSON and are invalidated by the same model changes (core.signals).
+
+def _tags(kind, rows, key="id"):
+    return [f"{kind}:{row[key]}" for row in rows]
 
-    data = {
+
+def _photo_tags(photo_links):
+    return [f"photo:{link.photo_id}" for link in photo_links]
+
+
+def _place_photos(place_id):
+    return (PlacePhoto.objects
+            .select_related("photo")
+            .filter(place_id=place_id)
+            .order_by("photo_order"))
+
+
+def _place_events(place_id):
+    return (HistoricEvent.objects.filter(place_id=place_id)
+            .values("id", "event_name", "event_date")
+            .order_by("-event_date"))
+
+
+def _place_persons(place_id):
+    return (HistoricPerson.objects.filter(personplace__place_id=place_id)
+            .distinct()
+            .values("id", "first_name", "last_name")
+            .order_by("last_name", "first_name"))
+
+
+def _place_data(request, p, photo_links, events, persons):
+    return {
         "id": p.id,
         "name": p.place_name,
         "date_start": p.date_start,
@@ -213,50 +367,61 @@ def place_details(request, pk: int):
         "history": p.history,
         "latitude": float(p.latitude),
         "longitude": float(p.longitude),
-        "photos": photos,
+        "photos": [
+            _photo_entry(request, pp)
+            for pp in photo_links
+            if getattr(pp.photo, "image", None)
+        ],
         "events": events,
         "persons": persons,
     }
-    return JsonResponse(data)
 
 
-def event_details(request, pk: int):
-    e = get_object_or_404(HistoricEvent.objects.select_related("place"), pk=pk)
-    photos = [
-        {
-            "url": _abs(
-                    request,
-                    ep.photo.image.url
-                ) if getattr(ep.photo, "image", None) else None,
-            "caption": ep.photo.caption,
-            "order": ep.photo_order,
-        }
-        for ep in (EventPhoto.objects
-                   .select_related("photo")
-                   .filter(event=e)
-                   .order_by("photo_order"))
-        if getattr(ep.photo, "image", None)
-    ]
-    people = list(
-        HistoricPerson.objects.filter(eventperson__event=e)
-        .values("id", "first_name", "last_name")
-        .order_by("last_name", "first_name")
-    )
-    data = {
+def _event_photos(event_id):
+    return (EventPhoto.objects
+            .select_related("photo")
+            .filter(event_id=event_id)
+            .order_by("photo_order"))
+
+
+def _event_persons(event_id):
+    return (HistoricPerson.objects.filter(eventperson__event_id=event_id)
+            .values("id", "first_name", "last_name")
+            .order_by("last_name", "first_name"))
+
+
+def _event_data(request, e, photo_links, people):
+    return {
         "id": e.id,
         "name": e.event_name,
         "date": e.event_date,
         "description": e.event_description,
         "significance": e.significance,
         "place": {"id": e.place_id, "name": e.place.place_name},
-        "photos": photos,
+        "photos": [
+            _photo_entry(request, ep)
+            for ep in photo_links
+            if getattr(ep.photo, "image", None)
+        ],
         "persons": people,
     }
-    return JsonResponse(data)
 
 
-def person_details(request, pk: int):
-    person = get_object_or_404(HistoricPerson, pk=pk)
+def _person_events(person_id):
+    return (HistoricEvent.objects.filter(eventperson__person_id=person_id)
+            .select_related("place")
+            .values("id", "event_name",
+                    "event_date", "place__id", "place__place_name")
+            .order_by("-event_date"))
+
+
+def _person_places(person_id):
+    return (HistoricPlace.objects.filter(personplace__person_id=person_id)
+            .values("id", "place_name")
+            .order_by("place_name"))
+
+
+def _person_data(request, person, events, places):
     profile_photo_url = None
     if getattr(
         person,
@@ -264,20 +429,7 @@ def person_details(request, pk: int):
         None
     ) and getattr(person.profile_photo, "image", None):
         profile_photo_url = _abs(request, person.profile_photo.image.url)
-
-    events = list(
-        HistoricEvent.objects.filter(eventperson__person=person)
-        .select_related("place")
-        .values("id", "event_name",
-                "event_date", "place__id", "place__place_name")
-        .order_by("-event_date")
-    )
-    places = list(
-        HistoricPlace.objects.filter(personplace__person=person)
-        .values("id", "place_name")
-        .order_by("place_name")
-    )
-    data = {
+    return {
         "id": person.id,
         "first_name": person.first_name,
         "last_name": person.last_name,
@@ -288,4 +440,228 @@ def person_details(request, pk: int):
         "events": events,
         "places": places,
     }
-    return JsonResponse(data)
+
+
+def _place_document(request, p, photo_links, events, persons):
+    data = _place_data(request, p, photo_links, events, persons)
+    tags = (_tags("event", events) + _tags("person", persons)
+            + _photo_tags(photo_links))
+    return JsonResponse(data), tags
+
+
+def _event_document(request, e, photo_links, people):
+    data = _event_data(request, e, photo_links, people)
+    tags = ([f"place:{e.place_id}"] + _tags("person", people)
+            + _photo_tags(photo_links))
+    return JsonResponse(data), tags
+
+
+def _person_document(request, person, events, places):
+    data = _person_data(request, person, events, places)
+    tags = (_tags("event", events) + _tags("place", events, "place__id")
+            + _tags("place", places))
+    if person.profile_photo_id:
+        tags.append(f"photo:{person.profile_photo_id}")
+    return JsonResponse(data), tags
+
+
+def place_details(request, pk: int):
+    """Rich detail for a place: fields, photos, events, persons."""
+    def build():
+        p = get_object_or_404(HistoricPlace, pk=pk)
+        return _place_document(
+            request, p,
+            list(_place_photos(p.id)),
+            list(_place_events(p.id)),
+            list(_place_persons(p.id)),
+        )
+    return cached_response(request, build, tags=[f"place:{pk}"])
+
+
+def event_details(request, pk: int):
+    def build():
+        e = get_object_or_404(
+            HistoricEvent.objects.select_related("place"), pk=pk
+        )
+        return _event_document(
+            request, e,
+            list(_event_photos(e.id)),
+            list(_event_persons(e.id)),
+        )
+    return cached_response(request, build, tags=[f"event:{pk}"])
+
+
+def person_details(request, pk: int):
+    def build():
+        person = get_object_or_404(
+            HistoricPerson.objects.select_related("profile_photo"), pk=pk
+        )
+        return _person_document(
+            request, person,
+            list(_person_events(person.id)),
+            list(_person_places(person.id)),
+        )
+    return cached_response(request, build, tags=[f"person:{pk}"])
+
+
+# ---------- Relationship graph (core/graph.py) ----------
+
+GRAPH_MAX_DEPTH = 3
+GRAPH_MAX_NODES = 500
+GRAPH_MAX_PATH_HOPS = 10
+
+
+def _graph_node_id(node):
+    return f"{node[0]}:{node[1]}"
+
+
+def _parse_graph_node(value):
+    kind, _, pk = (value or "").partition(":")
+    if kind not in KINDS or not pk.isdigit():
+        return None
+    return kind, int(pk)
+
+
+def _graph_index(graph, node):
+    try:
+        return graph.index[node]
+    except KeyError:
+        raise Http404(f"No {node[0]} with id {node[1]}.")
+
+
+def _graph_nodes(graph, indices, hops=None):
+    nodes = [graph.node(i) for i in indices]
+    names = graph_labels(nodes)
+    entries = []
+    for i, node in zip(indices, nodes):
+        entry = {"id": _graph_node_id(node), "type": node[0], "pk": node[1],
+                 "label": names.get(node, "")}
+        if hops is not None:
+            entry["hops"] = hops[i]
+        entries.append(entry)
+    return entries
+
+
+def graph_neighborhood(request, kind, pk: int):
+    """
+    GET /api/v1/graph/<person|place|event>/<id>/?depth=2
+
+    Everything within ``depth`` hops (max 3, at most 500 nodes) and the
+    edges between them.
+    """
+    if kind not in KINDS:
+        raise Http404
+    try:
+        depth = int(request.GET.get("depth", 1))
+    except ValueError:
+        depth = 0
+    if not 1 <= depth <= GRAPH_MAX_DEPTH:
+        return JsonResponse(
+            {"detail": f"depth must be 1-{GRAPH_MAX_DEPTH}."}, status=400
+        )
+
+    def build():
+        graph = get_graph()
+        start = _graph_index(graph, (kind, pk))
+        hops, truncated = graph.neighborhood(start, depth, GRAPH_MAX_NODES)
+        order = sorted(hops, key=lambda i: (hops[i], i))
+        nodes = _graph_nodes(graph, order, hops)
+        edges = [
+            [_graph_node_id(graph.node(u)), _graph_node_id(graph.node(v))]
+            for u, v in graph.edges_within(hops)
+        ]
+        return JsonResponse({
+            "root": _graph_node_id((kind, pk)),
+            "depth": depth,
+            "truncated": truncated,
+            "nodes": nodes,
+            "edges": edges,
+        }), []
+    return cached_response(request, build, tags=[GRAPH_TAG, LABELS_TAG])
+
+
+def graph_path(request):
+    """
+    GET /api/v1/graph/path/?from=person:3&to=event:9
+
+    Shortest chain of relationships between two entities (``path`` is
+    null when they are not connected within 10 hops).
+    """
+    source = _parse_graph_node(request.GET.get("from"))
+    target = _parse_graph_node(request.GET.get("to"))
+    if source is None or target is None:
+        return JsonResponse(
+            {"detail": "from and to must look like person:3, place:5 or "
+                       "event:9."},
+            status=400,
+        )
+
+    def build():
+        graph = get_graph()
+        path = graph.shortest_path(_graph_index(graph, source),
+                                   _graph_index(graph, target),
+                                   GRAPH_MAX_PATH_HOPS)
+        nodes = _graph_nodes(graph, path or [])
+        return JsonResponse({
+            "from": _graph_node_id(source),
+            "to": _graph_node_id(target),
+            "hops": len(path) - 1 if path else None,
+            "path": nodes if path else None,
+        }), []
+    return cached_response(request, build, tags=[GRAPH_TAG, LABELS_TAG])
+
+
+# ---------- Timeline histogram (core/timeline.py) ----------
+
+def _parse_bbox(value):
+    """(min_lon, min_lat, max_lon, max_lat) from "w,s,e,n", or None."""
+    try:
+        west, south, east, north = (float(v) for v in value.split(","))
+    except ValueError:
+        return None
+    if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+        return None
+    return west, south, east, north
+
+
+def timeline_histogram(request):
+    """
+    GET /api/v1/timeline/histogram/?granularity=year|decade
+        &significance=NATIONAL,GLOBAL&bbox=min_lon,min_lat,max_lon,max_lat
+
+    Number of events, and of places by start year, per year or decade.
+    ``significance`` filters the events (places have none).
+    """
+    granularity = request.GET.get("granularity", "year")
+    if granularity not in GRANULARITIES:
+        return JsonResponse(
+            {"detail": "granularity must be year or decade."}, status=400
+        )
+    significance = [
+        value.strip().upper()
+        for value in request.GET.get("significance", "").split(",")
+        if value.strip()
+    ]
+    if not set(significance) <= set(HistoricEvent.Significance.values):
+        return JsonResponse(
+            {"detail": "significance must be one or more of "
+                       f"{', '.join(HistoricEvent.Significance.values)}."},
+            status=400,
+        )
+    bbox = None
+    if "bbox" in request.GET:
+        bbox = _parse_bbox(request.GET["bbox"])
+        if bbox is None:
+            return JsonResponse(
+                {"detail": "bbox must be min_lon,min_lat,max_lon,max_lat."},
+                status=400,
+            )
+
+    def build():
+        return JsonResponse({
+            "granularity": granularity,
+            "buckets": histogram(granularity, significance, bbox),
+        }), []
+    response = cached_response(request, build, tags=[TIMELINE_TAG])
+    response["Cache-Control"] = settings.API_CACHE_CONTROL["timeline"]
+    return response
@@ -8,9 +8,16 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
 import os
+from importlib import import_module
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# Import the URLconf (and with it every view module) now instead of on the
+# first request, so gunicorn --preload shares it with all workers.
+from django.conf import settings  # noqa: E402
+
+import_module(settings.ROOT_URLCONF)
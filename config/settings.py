@@ -3,6 +3,8 @@ import environ
 import os
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # --- env
@@ -24,8 +26,9 @@ ALLOWED_HOSTS = [
 ]
 
 INSTALLED_APPS = [
-    # Django
-    "django.contrib.admin",
+    # Django (SimpleAdminConfig: admin modules are discovered lazily in
+    # config/urls_admin.py, not at startup)
+    "django.contrib.admin.apps.SimpleAdminConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -43,6 +46,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.compression.CompressionMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -50,6 +54,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -82,17 +87,58 @@ DATABASES = {
     }
 }
 
+# --- Cache
+# Shared by all workers in the container: response cache (core/cache.py),
+# CMS permission cache. Any django-environ cache URL works, e.g.
+# redis://redis:6379/1 or locmemcache:// for a single process.
+CACHES = {
+    "default": env.cache_url(
+        "CACHE_URL",
+        default="filecache:///tmp/cairo-cache/?MAX_ENTRIES=5000",
+    ),
+}
+
+# Public GET responses: fresh for API_CACHE_TTL seconds (or until a tagged
+# model changes), then served stale for up to API_CACHE_STALE_TTL more
+# while one worker rebuilds them.
+API_CACHE_TTL = env.int("API_CACHE_TTL", default=600)
+API_CACHE_STALE_TTL = env.int("API_CACHE_STALE_TTL", default=24 * 3600)
+
+# Cache-Control for anonymous GETs on the /api/v1/ viewsets, keyed by router
+# basename (api/conditional.py). Responses always carry ETag/Last-Modified,
+# so once max-age runs out Caddy and browsers revalidate with a cheap 304.
+API_CACHE_CONTROL = {
+    "default": "public, max-age=60, stale-while-revalidate=300",
+    "place": "public, max-age=300, stale-while-revalidate=3600",
+    "event": "public, max-age=300, stale-while-revalidate=3600",
+    "person": "public, max-age=300, stale-while-revalidate=3600",
+    "interview": "public, max-age=900, stale-while-revalidate=86400",
+    "photo": "public, max-age=900, stale-while-revalidate=86400",
+    "timeline": "public, max-age=300, stale-while-revalidate=3600",
+}
+
 # --- Static files
 STATIC_URL = "/static/"
 STATIC_ROOT = env("STATIC_ROOT", default=str(BASE_DIR / "staticfiles"))
 
-# Frontend assets live in frontend/, collected into STATIC_ROOT
+# Frontend assets live in frontend/, collected into STATIC_ROOT.
+# Production images point FRONTEND_DIR at the output of
+# tools/build_frontend.py (minified JS/CSS, WOFF2 fonts).
+FRONTEND_DIR = env("FRONTEND_DIR", default=str(BASE_DIR / "frontend"))
 STATICFILES_DIRS = [
-    BASE_DIR / "frontend",
+    FRONTEND_DIR,
 ]
 
-# WhiteNoise settings
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# WhiteNoise settings: hashed names + gzip/Brotli siblings, also for
+# index.html (see core.storage / core.views.frontend_index)
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "core.storage.FrontendStaticFilesStorage",
+    },
+}
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "America/Chicago"
@@ -106,13 +152,95 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = env("MEDIA_ROOT", default=str(BASE_DIR / "media"))
 
+# Media is served by core.media.serve_media. Photo names carry a digest of
+# their content, so they are cached for good (MEDIA_CACHE_CONTROL); files
+# stored before that get MEDIA_CACHE_CONTROL_UNHASHED and are revalidated
+# with their ETag/Last-Modified.
+# Set MEDIA_ACCEL_MODE to "x-accel" (Caddy/nginx) or "x-sendfile" (Apache)
+# to let the proxy send the bytes; MEDIA_ACCEL_PREFIX is the internal
+# location the proxy maps to MEDIA_ROOT.
+MEDIA_CACHE_CONTROL = env(
+    "MEDIA_CACHE_CONTROL",
+    default="public, max-age=31536000, immutable",
+)
+MEDIA_CACHE_CONTROL_UNHASHED = env(
+    "MEDIA_CACHE_CONTROL_UNHASHED",
+    default="public, max-age=3600",
+)
+MEDIA_ACCEL_MODES = ("", "x-accel", "x-sendfile")
+MEDIA_ACCEL_MODE = env("MEDIA_ACCEL_MODE", default="")
+if MEDIA_ACCEL_MODE not in MEDIA_ACCEL_MODES:
+    raise ImproperlyConfigured(
+        f"MEDIA_ACCEL_MODE must be one of {MEDIA_ACCEL_MODES}, "
+        f"not {MEDIA_ACCEL_MODE!r}."
+    )
+MEDIA_ACCEL_PREFIX = env("MEDIA_ACCEL_PREFIX", default="/protected-media/")
+
+# --- Resumable photo uploads (api/uploads.py)
+# Partial files must live on the same filesystem as MEDIA_ROOT so the
+# finished upload can be moved into place instead of copied.
+PHOTO_UPLOAD_TEMP_DIR = env(
+    "PHOTO_UPLOAD_TEMP_DIR",
+    default=str(Path(MEDIA_ROOT) / "uploads" / "partial"),
+)
+PHOTO_UPLOAD_MAX_SIZE = env.int(
+    "PHOTO_UPLOAD_MAX_SIZE", default=500 * 1024 * 1024
+)
+# Uploads with no chunk for this long are deleted by manage.py
+# expire_uploads (run at container start), partial file included
+PHOTO_UPLOAD_EXPIRY_HOURS = env.float("PHOTO_UPLOAD_EXPIRY_HOURS", default=24)
+
+# --- Interview video metadata (manage.py fetch_interview_metadata).
+# Callable (video_id, timeout) -> oEmbed dict; point it at a stub offline.
+YOUTUBE_OEMBED_PROVIDER = env(
+    "YOUTUBE_OEMBED_PROVIDER", default="core.youtube.fetch_oembed"
+)
+
+# --- "What's nearby": precomputed neighbour table (core/neighbors.py)
+PLACE_NEIGHBORS_K = env.int("PLACE_NEIGHBORS_K", default=10)
+PLACE_NEIGHBORS_RADIUS_M = env.float("PLACE_NEIGHBORS_RADIUS_M", default=3000)
+
+# --- Public read endpoints: serve the async variants (api/async_views.py).
+# Turned on by gunicorn.conf.py when SERVER_MODE=asgi.
+API_ASYNC_VIEWS = env.bool("API_ASYNC_VIEWS", default=False)
+
+# --- API responses are Brotli/gzip compressed from this size on
+# (core/compression.py); cached documents are stored precompressed
+API_COMPRESSION_MIN_BYTES = env.int("API_COMPRESSION_MIN_BYTES", default=1024)
+
+# --- Place exports (api/exports.py): rows read and encoded per chunk
+EXPORT_CHUNK_SIZE = env.int("EXPORT_CHUNK_SIZE", default=2000)
+# GeoPackages are assembled here before streaming (default: system temp)
+EXPORT_TEMP_DIR = env("EXPORT_TEMP_DIR", default=None)
+
+# --- List endpoints: serialize pages from values_list() rows (api/rows.py)
+API_FAST_LISTS = env.bool("API_FAST_LISTS", default=True)
+
+# --- Request profiler (core/profiling.py): staff send "X-Profile: 1", or
+# a random share of requests is profiled; listed at /cms/profiles/
+PROFILE_SAMPLE_RATE = env.float("PROFILE_SAMPLE_RATE", default=0.0)
+PROFILE_INTERVAL_MS = env.float("PROFILE_INTERVAL_MS", default=5.0)
+PROFILE_DIR = env("PROFILE_DIR", default=str(BASE_DIR / "profiles"))
+PROFILE_KEEP = env.int("PROFILE_KEEP", default=200)
+
+# --- Slow-query log (core/slow_queries.py): statements slower than this
+# are logged with their origin and plan; see manage.py slow_queries. Off
+# (0) unless set: each logged SELECT costs an extra EXPLAIN, so enable it,
+# e.g. SLOW_QUERY_MS=100, while investigating.
+SLOW_QUERY_MS = env.float("SLOW_QUERY_MS", default=0)
+SLOW_QUERY_LOG = env(
+    "SLOW_QUERY_LOG", default=str(BASE_DIR / "logs" / "slow-queries.jsonl")
+)
+SLOW_QUERY_LOG_BYTES = env.int("SLOW_QUERY_LOG_BYTES", default=5 * 1024 * 1024)
+SLOW_QUERY_LOG_BACKUPS = env.int("SLOW_QUERY_LOG_BACKUPS", default=3)
+
 # --- DRF / JWT / OpenAPI
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "api.pagination.DefaultPagination",
@@ -128,8 +256,14 @@ SPECTACULAR_SETTINGS = {
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    # Adds username/is_staff/is_superuser claims (see api/authentication.py)
+    "TOKEN_OBTAIN_SERIALIZER":
+        "api.authentication.ClaimsTokenObtainPairSerializer",
 }
 
+# Verified access tokens remembered per worker process
+JWT_AUTH_CACHE_SIZE = env.int("JWT_AUTH_CACHE_SIZE", default=2048)
+
 # --- CORS
 # --- CSRF trusted origins (for HTTPS behind a proxy)
 _raw_csrf = os.environ.get("CSRF_TRUSTED_ORIGINS", "")
@@ -0,0 +1,49 @@
+# config/settings_public.py
+"""
+Lean public-API profile: DJANGO_SETTINGS_MODULE=config.settings_public.
+
+For workers that only serve anonymous traffic (map, detail documents,
+interviews, frontend, media). The admin, CMS, sessions/messages, JWT auth
+and drf_spectacular are neither installed nor imported, which cuts boot
+time and per-worker memory (see tools/bench_startup.py). The database and
+caches are the same as config.settings, so both profiles can run side by
+side, with the proxy routing /admin/, /cms/, /api/schema/, /api/docs/,
+/api/v1/auth/ and /api/v1/uploads/ to a full-profile worker.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+_FULL_ONLY_APPS = {
+    "django.contrib.admin.apps.SimpleAdminConfig",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "drf_spectacular",
+}
+_FULL_ONLY_MIDDLEWARE = {
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+}
+
+INSTALLED_APPS = [a for a in INSTALLED_APPS if a not in _FULL_ONLY_APPS]
+MIDDLEWARE = [m for m in MIDDLEWARE if m not in _FULL_ONLY_MIDDLEWARE]
+
+ROOT_URLCONF = "config.urls_public"
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    "OPTIONS": {
+        **TEMPLATES[0]["OPTIONS"],
+        "context_processors": [
+            "django.template.context_processors.debug",
+            "django.template.context_processors.request",
+        ],
+    },
+}]
+
+# Anonymous only: writes are rejected by IsAuthenticatedOrReadOnly.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_AUTHENTICATION_CLASSES": [],
+    "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.openapi.AutoSchema",
+}
@@ -1,35 +1,37 @@
 from django.conf import settings
-from django.conf.urls.static import static
-from django.contrib import admin
 from django.urls import path, include
-from django.views.generic import RedirectView
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from core.cms_admin import content_admin_site  # NEW
+from django.urls.resolvers import RoutePattern, URLResolver
+from core.media import serve_media
+from core.views import frontend_index
 
+
+def lazy_include(route, urlconf, app_name=None, namespace=None):
+    """
+    Like ``path(route, include(urlconf))`` but without importing
+    ``urlconf`` until a request under ``route`` (or a reverse()) needs it.
+    """
+    return URLResolver(
+        RoutePattern(route, is_endpoint=False), urlconf,
+        app_name=app_name, namespace=namespace,
+    )
+
+
+# Admin, CMS and API docs (with drf_spectacular's schema machinery) are
+# imported on first use, not when a worker boots.
 urlpatterns = [
-    path("admin/", admin.site.urls),         # full admin (superuser)
-    path("cms/", content_admin_site.urls),   # restricted admin for Editors
+    # full admin (superuser)
+    lazy_include("admin/", "config.urls_admin", "admin", "admin"),
+    # restricted admin for Editors
+    lazy_include("cms/", "config.urls_cms", "admin", "content_admin"),
 
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
     path("api/v1/", include("api.urls")),
-    # NEW: Frontend root → serve static index.html
+    lazy_include("api/", "config.urls_docs"),  # schema/ and docs/
+    # Frontend root → hashed index.html (revalidated, precompressed)
+    path("", frontend_index, name="frontend-root"),
+    # Uploaded media: conditional/range requests, optional proxy offload
     path(
-        "",
-        RedirectView.as_view(
-            url="/static/index.html",
-            permanent=False,
-        ),
-        name="frontend-root",
+        f"{settings.MEDIA_URL.lstrip('/')}<path:path>",
+        serve_media,
+        name="media",
     ),
 ]
-
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL,
-        document_root=settings.MEDIA_ROOT
-    )
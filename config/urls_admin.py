@@ -0,0 +1,13 @@
+# config/urls_admin.py
+"""
+Django admin, included lazily from config/urls.py.
+
+INSTALLED_APPS uses SimpleAdminConfig, so admin modules are discovered
+here, on the first /admin/ request (or reverse()), instead of at boot.
+"""
+from django.contrib import admin
+
+admin.autodiscover()
+
+app_name = "admin"
+urlpatterns = admin.site.get_urls()
@@ -0,0 +1,6 @@
+# config/urls_cms.py
+"""Editors' CMS admin site, included lazily from config/urls.py."""
+from core.cms_admin import content_admin_site
+
+app_name = "admin"
+urlpatterns = content_admin_site.get_urls()
@@ -0,0 +1,20 @@
+# config/urls_public.py
+"""
+URLconf of the lean public profile (config.settings_public): public API,
+frontend and media only. No admin, CMS, token or upload routes, and no
+OpenAPI schema/docs.
+"""
+from django.conf import settings
+from django.urls import path, include
+from core.media import serve_media
+from core.views import frontend_index
+
+urlpatterns = [
+    path("api/v1/", include("api.urls_public")),
+    path("", frontend_index, name="frontend-root"),
+    path(
+        f"{settings.MEDIA_URL.lstrip('/')}<path:path>",
+        serve_media,
+        name="media",
+    ),
+]
@@ -1,4 +1,7 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from .models import (
     Photo,
     HistoricPerson,
@@ -12,12 +15,71 @@ from .models import (
 )
 
 
+# Unfiltered changelists above this many rows show an estimated total.
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids ``SELECT COUNT(*)`` over a whole large table.
+
+    For an unfiltered changelist the row count comes from SQLite's
+    ``sqlite_stat1`` (refreshed by ``ANALYZE``); filtered querysets, small
+    tables and databases without statistics still get an exact count.
+    """
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        if getattr(qs, "query", None) is not None and not qs.query.where:
+            estimate = self._estimate(qs)
+            if estimate is not None and estimate > ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def _estimate(qs):
+        connection = connections[qs.db]
+        if connection.vendor != "sqlite":
+            return None
+        table = qs.model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute(
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1",
+                [table],
+            )
+            row = cursor.fetchone()
+        if not row or not row[0]:
+            return None
+        try:
+            return int(row[0].split()[0])
+        except ValueError:
+            return None
+
+
+class FastChangeListMixin:
+    """Shared changelist settings for the larger content tables."""
+
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) on filtered/searched pages.
+    show_full_result_count = False
+
+
 class PlacePhotoInline(admin.TabularInline):
     model = PlacePhoto
     extra = 1
     max_num = 10
     autocomplete_fields = ("photo",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("photo")
+
 
 class EventPhotoInline(admin.TabularInline):
     model = EventPhoto
@@ -25,33 +87,49 @@ class EventPhotoInline(admin.TabularInline):
     max_num = 10
     autocomplete_fields = ("photo",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("photo")
+
 
 class EventPersonInline(admin.TabularInline):
     model = EventPerson
     extra = 1
     autocomplete_fields = ("event",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("event")
+
 
 @admin.register(Photo)
-class PhotoAdmin(admin.ModelAdmin):
+class PhotoAdmin(FastChangeListMixin, admin.ModelAdmin):
     fields = ("image",
               "caption",
               "file_name",
               "file_type",
+              "mime_type",
               "file_size",
+              ("width", "height", "orientation"),
+              "taken_at",
+              "phash",
               "upload_date")
-    readonly_fields = ("file_name", "file_type", "file_size", "upload_date")
-    list_display = ("id", "file_name", "file_type", "file_size", "upload_date")
-    search_fields = ("file_name", "file_path")
-    list_filter = ("file_type",)
+    readonly_fields = ("file_name", "file_type", "mime_type", "file_size",
+                       "width", "height", "orientation", "taken_at", "phash",
+                       "upload_date")
+    list_display = ("id", "file_name", "file_type", "file_size", "width",
+                    "height", "taken_at", "upload_date")
+    search_fields = ("file_name", "file_path", "phash")
+    list_filter = ("file_type", "mime_type")
 
 
 @admin.register(HistoricPlace)
-class HistoricPlaceAdmin(admin.ModelAdmin):
+class HistoricPlaceAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ("id",
                     "place_name",
                     "latitude",
                     "longitude",
+                    "event_count",
+                    "person_count",
+                    "photo_count",
                     "date_modified")
     search_fields = ("place_name", "brief")
     list_filter = ("date_start", "date_end")
@@ -59,8 +137,10 @@ class HistoricPlaceAdmin(admin.ModelAdmin):
 
 
 @admin.register(HistoricEvent)
-class HistoricEventAdmin(admin.ModelAdmin):
-    list_display = ("id", "event_name", "event_date", "place", "significance")
+class HistoricEventAdmin(FastChangeListMixin, admin.ModelAdmin):
+    list_display = ("id", "event_name", "event_date", "place", "significance",
+                    "person_count", "photo_count")
+    list_select_related = ("place",)
     search_fields = ("event_name", "event_description")
     list_filter = ("significance", "event_date")
     autocomplete_fields = ("place",)
@@ -68,33 +148,50 @@ class HistoricEventAdmin(admin.ModelAdmin):
 
 
 @admin.register(HistoricPerson)
-class HistoricPersonAdmin(admin.ModelAdmin):
-    list_display = ("id", "last_name", "first_name", "dob", "date_modified")
+class HistoricPersonAdmin(FastChangeListMixin, admin.ModelAdmin):
+    list_display = ("id", "last_name", "first_name", "dob", "event_count",
+                    "place_count", "date_modified")
     search_fields = ("first_name", "last_name", "brief")
     autocomplete_fields = ("profile_photo",)
     inlines = [EventPersonInline]  # link many events to this person
 
 
 @admin.register(PersonPlace)
-class PersonPlaceAdmin(admin.ModelAdmin):
+class PersonPlaceAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ("id",
                     "person",
                     "place",
                     "association_date",
                     "association_type")
+    list_select_related = ("person", "place")
     search_fields = ("association_type",)
     autocomplete_fields = ("person", "place")
 
 
 @admin.register(EventPerson)
-class EventPersonAdmin(admin.ModelAdmin):
+class EventPersonAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ("id", "event", "person", "role")
+    list_select_related = ("event", "person")
     search_fields = ("role",)
     autocomplete_fields = ("event", "person")
 
 
+@admin.register(PlacePhoto)
+class PlacePhotoAdmin(FastChangeListMixin, admin.ModelAdmin):
+    list_display = ("id", "place", "photo", "photo_order")
+    list_select_related = ("place", "photo")
+    autocomplete_fields = ("place", "photo")
+
+
+@admin.register(EventPhoto)
+class EventPhotoAdmin(FastChangeListMixin, admin.ModelAdmin):
+    list_display = ("id", "event", "photo", "photo_order")
+    list_select_related = ("event", "photo")
+    autocomplete_fields = ("event", "photo")
+
+
 @admin.register(HistoricInterview)
-class HistoricInterviewAdmin(admin.ModelAdmin):
+class HistoricInterviewAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = (
         "interviewee_name",
         "interviewer_name",
@@ -109,3 +206,9 @@ class HistoricInterviewAdmin(admin.ModelAdmin):
     )
     list_filter = ("interview_date",)
     ordering = ("-interview_date", "interviewee_name")
+    readonly_fields = (
+        "youtube_video_id",
+        "video_title",
+        "video_author",
+        "metadata_fetched_at",
+    )
@@ -0,0 +1,266 @@
+# core/cache.py
+"""
+Shared response cache for the public GET endpoints.
+
+Entries live in the default Django cache (CACHE_URL: file-based by default,
+so every gunicorn worker in the container sees the same copy).
+
+Tags
+    Each entry remembers the version of every tag it was built from, e.g.
+    ``place:12``, ``event:40``, ``person:7``. ``bump_tags`` (called from
+    core.signals on model changes) gives a tag a new version, which makes
+    every entry built from it stale without having to find those entries.
+
+Single flight
+    When an entry is expired or stale, the first worker to take the
+    rebuild lock (``acquire_lock``) rebuilds it; everyone else keeps
+    serving the stale copy until the new one is stored. A cold miss waits
+    briefly for a concurrent rebuild before building it itself. The lock
+    is ``cache.add`` where that is atomic (redis, memcached, locmem); the
+    file cache's ``add`` is a read followed by a write, so there it is an
+    ``flock`` on a lock file beside the entries instead.
+
+Compression
+    JSON entries are stored with their Brotli and gzip encodings
+    (core/compression.py), so a hit is never compressed again; the client's
+    Accept-Encoding picks which stored body is sent.
+"""
+import asyncio
+import fcntl
+import hashlib
+import os
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .compression import encode_all, is_compressible, negotiate, set_encoding
+
+TAG_PREFIX = "tag:"
+LOCK_TIMEOUT = 30
+COLD_WAIT = 2.0
+COLD_POLL = 0.05
+
+
+def _tag_key(tag):
+    return TAG_PREFIX + tag
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def bump_tags(*tags):
+    """Invalidate every cached response built from any of ``tags``."""
+    version = _new_version()
+    cache.set_many({_tag_key(t): version for t in tags}, None)
+
+
+def tag_versions(tags):
+    keys = [_tag_key(t) for t in tags]
+    found = cache.get_many(keys)
+    missing = {k: _new_version() for k in keys if k not in found}
+    if missing:
+        # Never seen (or evicted): start a fresh version so that no older
+        # entry can match it.
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {t: found[_tag_key(t)] for t in tags}
+
+
+async def atag_versions(tags):
+    keys = [_tag_key(t) for t in tags]
+    found = await cache.aget_many(keys)
+    missing = {k: _new_version() for k in keys if k not in found}
+    if missing:
+        await cache.aset_many(missing, None)
+        found.update(missing)
+    return {t: found[_tag_key(t)] for t in tags}
+
+
+def _lock_path(backend, key):
+    lock_dir = os.path.join(backend._dir, "locks")
+    os.makedirs(lock_dir, exist_ok=True)
+    digest = hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+    return os.path.join(lock_dir, digest + ".lock")
+
+
+def acquire_lock(key, timeout=LOCK_TIMEOUT):
+    """
+    Take the cross-worker lock ``key`` without waiting. Returns a token
+    for ``release_lock``, or None if another worker holds it.
+
+    ``timeout`` bounds how long a ``cache.add`` lock outlives a worker that
+    died holding it; a file lock is dropped by the kernel at once.
+    """
+    backend = caches["default"]
+    if not isinstance(backend, FileBasedCache):
+        return True if backend.add(key, 1, timeout) else None
+    path = _lock_path(backend, key)
+    fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        # The holder unlinks the file on release; a lock on an unlinked
+        # file excludes nobody, so only one on the current file counts.
+        if os.fstat(fd).st_ino != os.stat(path).st_ino:
+            raise BlockingIOError
+    except (BlockingIOError, FileNotFoundError):
+        os.close(fd)
+        return None
+    return fd
+
+
+def release_lock(key, token):
+    backend = caches["default"]
+    if not isinstance(backend, FileBasedCache):
+        backend.delete(key)
+        return
+    try:
+        os.unlink(_lock_path(backend, key))
+    finally:
+        os.close(token)
+
+
+def response_key(request, namespace="resp"):
+    digest = hashlib.md5(
+        request.build_absolute_uri().encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def _make_entry(response, versions, ttl):
+    content_type = response["Content-Type"]
+    return {
+        "content": response.content,
+        "content_type": content_type,
+        # {coding: bytes}, compressed once here (core/compression.py)
+        "encoded": (encode_all(response.content)
+                    if is_compressible(content_type) else {}),
+        "tags": list(versions),
+        "versions": versions,
+        "fresh_until": time.time() + ttl,
+    }
+
+
+def _is_fresh(entry, current_versions):
+    return (time.time() < entry["fresh_until"]
+            and entry["versions"] == current_versions)
+
+
+def _encode(request, response, entry):
+    """Serve the entry's precompressed body if the client accepts it."""
+    encoded = entry.get("encoded")
+    if not encoded:
+        return response
+    patch_vary_headers(response, ("Accept-Encoding",))
+    coding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING"))
+    if coding in encoded:
+        response.content = encoded[coding]
+        set_encoding(response, coding)
+    return response
+
+
+def _to_response(request, entry, state):
+    response = HttpResponse(entry["content"],
+                            content_type=entry["content_type"])
+    response["X-Cache"] = state
+    return _encode(request, response, entry)
+
+
+def _merge_versions(base_versions, extra_versions):
+    versions = dict(extra_versions)
+    versions.update(base_versions)
+    return versions
+
+
+def cached_response(request, build, tags=(), ttl=None, stale_ttl=None):
+    """
+    Serve ``build()`` through the shared cache.
+
+    ``tags`` are known before building and are versioned up front, so a
+    change that lands mid-build still invalidates the new entry. ``build``
+    returns ``(response, extra_tags)`` for entities discovered while
+    building (those are versioned afterwards; any race is bounded by
+    ``ttl``). Only 200 responses are stored; exceptions such as Http404
+    propagate and nothing is cached.
+    """
+    ttl = settings.API_CACHE_TTL if ttl is None else ttl
+    stale_ttl = settings.API_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+    key = response_key(request)
+    lock_key = key + ":lock"
+
+    entry = cache.get(key)
+    if entry is not None:
+        if _is_fresh(entry, tag_versions(entry["tags"])):
+            return _to_response(request, entry, "HIT")
+        locked = acquire_lock(lock_key)
+        if locked is None:
+            return _to_response(request, entry, "STALE")
+    else:
+        locked = acquire_lock(lock_key)
+    if locked is None:
+        deadline = time.monotonic() + COLD_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(COLD_POLL)
+            entry = cache.get(key)
+            if entry is not None:
+                return _to_response(request, entry, "HIT")
+
+    try:
+        base_versions = tag_versions(tags)
+        response, extra_tags = build()
+        if response.status_code == 200:
+            versions = _merge_versions(base_versions, tag_versions(extra_tags))
+            entry = _make_entry(response, versions, ttl)
+            cache.set(key, entry, ttl + stale_ttl)
+            response = _encode(request, response, entry)
+    finally:
+        if locked is not None:
+            release_lock(lock_key, locked)
+    response["X-Cache"] = "MISS"
+    return response
+
+
+async def acached_response(request, build, tags=(), ttl=None,
+                           stale_ttl=None):
+    """Async twin of ``cached_response``; ``build`` is a coroutine function."""
+    ttl = settings.API_CACHE_TTL if ttl is None else ttl
+    stale_ttl = settings.API_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+    key = response_key(request)
+    lock_key = key + ":lock"
+
+    entry = await cache.aget(key)
+    if entry is not None:
+        if _is_fresh(entry, await atag_versions(entry["tags"])):
+            return _to_response(request, entry, "HIT")
+        locked = await sync_to_async(acquire_lock)(lock_key)
+        if locked is None:
+            return _to_response(request, entry, "STALE")
+    else:
+        locked = await sync_to_async(acquire_lock)(lock_key)
+    if locked is None:
+        deadline = time.monotonic() + COLD_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(COLD_POLL)
+            entry = await cache.aget(key)
+            if entry is not None:
+                return _to_response(request, entry, "HIT")
+
+    try:
+        base_versions = await atag_versions(tags)
+        response, extra_tags = await build()
+        if response.status_code == 200:
+            versions = _merge_versions(base_versions,
+                                       await atag_versions(extra_tags))
+            entry = _make_entry(response, versions, ttl)
+            await cache.aset(key, entry, ttl + stale_ttl)
+            response = _encode(request, response, entry)
+    finally:
+        if locked is not None:
+            await sync_to_async(release_lock)(lock_key, locked)
+    response["X-Cache"] = "MISS"
+    return response
@@ -1,5 +1,17 @@
 # core/cms_admin.py
+import datetime
+
 from django.contrib.admin import AdminSite
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from . import profiling
+from .cms_permissions import (
+    EDITORS_GROUP, PERMISSION_CACHE_TIMEOUT, user_key
+)
 from .models import (
     HistoricPlace, HistoricEvent, HistoricPerson, Photo, HistoricInterview)
 from .admin import (
@@ -15,12 +27,73 @@ class ContentAdminSite(AdminSite):
 
     def has_permission(self, request):
         user = request.user
-        return user.is_active and (
-            user.is_superuser or user.groups.filter(name="Editors").exists()
-        )
+        if not user.is_active:
+            return False
+        if user.is_superuser:
+            return True
+        # Django asks several times per page (and on every autocomplete
+        # keystroke): memoise on the request, then in the shared cache.
+        # core.signals drops the cached flag when group membership changes.
+        if not hasattr(request, "_cms_is_editor"):
+            key = user_key("editor", user.pk)
+            is_editor = cache.get(key)
+            if is_editor is None:
+                is_editor = user.groups.filter(name=EDITORS_GROUP).exists()
+                cache.set(key, is_editor, PERMISSION_CACHE_TIMEOUT)
+            request._cms_is_editor = is_editor
+        return request._cms_is_editor
+
+    def get_urls(self):
+        return [
+            path("profiles/", self.admin_view(self.profiles_view),
+                 name="profiles"),
+            path("profiles/<str:profile_id>.folded",
+                 self.admin_view(self.profile_stacks_view),
+                 name="profile-stacks"),
+        ] + super().get_urls()
+
+    # Request profiles (core/profiling.py): staff only, not every editor
+    def profiles_view(self, request):
+        if not request.user.is_staff:
+            raise PermissionDenied
+        order = request.GET.get("o", "slowest")
+        profiles = profiling.recent_profiles()
+        for p in profiles:
+            p["started"] = datetime.datetime.fromtimestamp(
+                p["started_at"], datetime.timezone.utc)
+        if order == "slowest":
+            profiles.sort(key=lambda p: p["duration_ms"], reverse=True)
+        return TemplateResponse(request, "cms/profiles.html", {
+            **self.each_context(request),
+            "title": "Request profiles",
+            "profiles": profiles,
+            "order": order,
+        })
+
+    def profile_stacks_view(self, request, profile_id):
+        if not request.user.is_staff:
+            raise PermissionDenied
+        folded = profiling.folded_path(profile_id)
+        if folded is None:
+            raise Http404("No such profile.")
+        return FileResponse(folded.open("rb"), as_attachment=True,
+                            content_type="text/plain; charset=utf-8")
 
     # NEW: force the order: Places, Events, Persons
-    def get_app_list(self, request):
+    def get_app_list(self, request, app_label=None):
+        if app_label is not None:
+            return super().get_app_list(request, app_label)
+        if hasattr(request, "_cms_app_list"):
+            return request._cms_app_list
+        key = user_key("apps", request.user.pk)
+        app_list = cache.get(key)
+        if app_list is None:
+            app_list = self._build_ordered_app_list(request)
+            cache.set(key, app_list, PERMISSION_CACHE_TIMEOUT)
+        request._cms_app_list = app_list
+        return app_list
+
+    def _build_ordered_app_list(self, request):
         # get default list then rearrange
         app_list = super().get_app_list(request)
         # We only registered these models for CMS; but we’ll sort to be safe.
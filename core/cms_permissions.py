@@ -0,0 +1,39 @@
+# core/cms_permissions.py
+"""
+Cache keys for the CMS permission state (see ContentAdminSite).
+
+Kept apart from core/cms_admin.py so core.signals can invalidate entries
+without importing the admin at startup.
+"""
+import time
+
+from django.core.cache import cache
+
+EDITORS_GROUP = "Editors"
+PERMISSION_CACHE_TIMEOUT = 15 * 60
+_GENERATION_KEY = "cms:perm-generation"
+
+
+def _generation():
+    # Unique even after an eviction, so no older entry can match it again
+    return cache.get_or_set(_GENERATION_KEY, time.time_ns, None)
+
+
+def user_key(kind, user_id):
+    return f"cms:{kind}:{_generation()}:{user_id}"
+
+
+def invalidate_user_permissions(user_ids):
+    """Drop cached CMS permission state for the given users."""
+    keys = []
+    for user_id in user_ids:
+        keys += [user_key("editor", user_id), user_key("apps", user_id)]
+    cache.delete_many(keys)
+
+
+def invalidate_all_permissions():
+    """Invalidate every user's cached state (group renamed, perms changed)."""
+    # A new unique generation rather than cache.incr, which the file cache
+    # does as get + set: two concurrent bumps could both store the same
+    # value, and entries cached between them would survive the second.
+    cache.set(_GENERATION_KEY, time.time_ns(), None)
@@ -0,0 +1,159 @@
+# core/compression.py
+"""
+Brotli/gzip compression for API responses.
+
+``CompressionMiddleware`` compresses GET/HEAD responses whose type is in
+COMPRESSIBLE_TYPES (JSON, GeoJSON, NDJSON, CSV) once they reach
+API_COMPRESSION_MIN_BYTES, choosing Brotli over gzip when the client
+accepts both. Streaming responses (api/exports.py) are compressed chunk
+by chunk. HTML and static files are left alone: WhiteNoise serves its
+own precompressed static files, and pages that carry CSRF tokens should
+not be compressed (BREACH).
+
+The shared response cache (core/cache.py) stores each entry already
+compressed in every encoding (``encode_all``), at a higher level than
+would be affordable per request. A cached response carries a
+Content-Encoding header, so the middleware passes it through untouched.
+"""
+import gzip
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/geo+json",
+    "application/x-ndjson",
+    "text/csv",
+}
+# Per request: fast. Cached entries are compressed once: small.
+DYNAMIC_LEVELS = {"br": 4, "gzip": 6}
+CACHED_LEVELS = {"br": 9, "gzip": 9}
+
+CODING_RE = re.compile(r"^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$")
+
+
+def encodings():
+    """Supported encodings, preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding, available=None):
+    """
+    The encoding to use for an Accept-Encoding header, or None. Chooses
+    among ``available`` (preferred first) instead of the encodings this
+    process can compress with, e.g. for precompressed files.
+    """
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        match = CODING_RE.match(part)
+        if not match:
+            continue
+        coding, q = match.groups()
+        try:
+            accepted[coding.lower()] = float(q) if q else 1.0
+        except ValueError:
+            continue
+    best, best_q = None, 0.0
+    for coding in encodings() if available is None else available:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def is_compressible(content_type):
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES
+
+
+def compress(data, coding, level):
+    if coding == "br":
+        return brotli.compress(data, quality=level)
+    # mtime=0: identical input gives identical bytes (and ETags)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def encode_all(data):
+    """{coding: compressed bytes} for a cache entry; {} if too small."""
+    if len(data) < settings.API_COMPRESSION_MIN_BYTES:
+        return {}
+    return {coding: compress(data, coding, CACHED_LEVELS[coding])
+            for coding in encodings()}
+
+
+def _compressor(coding):
+    """(compress, flush) functions of an incremental compressor."""
+    if coding == "br":
+        compressor = brotli.Compressor(quality=DYNAMIC_LEVELS["br"])
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(DYNAMIC_LEVELS["gzip"], zlib.DEFLATED,
+                                  16 + zlib.MAX_WBITS)  # gzip container
+    return compressor.compress, compressor.flush
+
+
+def compress_sequence(chunks, coding):
+    write, finish = _compressor(coding)
+    for chunk in chunks:
+        data = write(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_sequence(chunks, coding):
+    write, finish = _compressor(coding)
+    async for chunk in chunks:
+        data = write(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def set_encoding(response, coding):
+    response.headers["Content-Encoding"] = coding
+    # A strong ETag names exact bytes; the encoded body is different bytes
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = "W/" + etag
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        if not is_compressible(response.get("Content-Type")):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if (request.method not in ("GET", "HEAD")
+                or response.has_header("Content-Encoding")):
+            return response
+        coding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING"))
+        if coding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_sequence(
+                    response.streaming_content, coding)
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, coding)
+            response.headers.pop("Content-Length", None)
+        else:
+            if len(response.content) < settings.API_COMPRESSION_MIN_BYTES:
+                return response
+            compressed = compress(response.content, coding,
+                                  DYNAMIC_LEVELS[coding])
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+        set_encoding(response, coding)
+        return response
@@ -0,0 +1,145 @@
+# core/counters.py
+"""
+Denormalized link counts on places, events and people.
+
+    HistoricPlace.event_count    events at the place
+    HistoricPlace.person_count   distinct people linked by PersonPlace
+    HistoricPlace.photo_count    PlacePhoto rows
+    HistoricEvent.person_count   EventPerson rows
+    HistoricEvent.photo_count    EventPhoto rows
+    HistoricPerson.event_count   EventPerson rows
+    HistoricPerson.place_count   distinct places linked by PersonPlace
+
+core.signals keeps them current: a link row that is added, removed or
+moved to another parent adjusts the parents' counts with one
+``UPDATE ... SET n = n + 1`` (an F expression, so concurrent writers never
+lose an increment). The parent's ``date_modified`` moves with it, which
+keeps the list/detail ETags (api/conditional.py) honest.
+
+A person can be linked to the same place on several dates, so the
+PersonPlace counts are of distinct pairs. An increment cannot tell whether
+a pair is new; those two counts are instead recomputed for the parents
+concerned, in the same single UPDATE (``SET n = (SELECT COUNT(DISTINCT
+...))``), which also stays right when a cascade deletes several links of
+one pair at once.
+
+Bulk operations, raw SQL and loaddata bypass the signals; run
+``manage.py reconcile_counters`` after them to recompute every count from
+the link tables.
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import (
+    EventPerson,
+    EventPhoto,
+    HistoricEvent,
+    HistoricPerson,
+    HistoricPlace,
+    PersonPlace,
+    PlacePhoto,
+)
+
+# link model -> [(foreign key, parent model, counter field)]
+LINKS = {
+    HistoricEvent: [("place", HistoricPlace, "event_count")],
+    PlacePhoto: [("place", HistoricPlace, "photo_count")],
+    EventPhoto: [("event", HistoricEvent, "photo_count")],
+    EventPerson: [("event", HistoricEvent, "person_count"),
+                  ("person", HistoricPerson, "event_count")],
+    PersonPlace: [("place", HistoricPlace, "person_count"),
+                  ("person", HistoricPerson, "place_count")],
+}
+# Link models whose counts are of distinct (foreign key, ...) pairs
+DISTINCT_PAIRS = {PersonPlace}
+
+
+def count_subquery(model, fk, distinct=None):
+    """
+    Correlated COUNT of ``model`` rows pointing at the outer row, or of
+    the distinct values of ``distinct`` among them.
+    """
+    counted = Count(distinct, distinct=True) if distinct else Count("pk")
+    counts = (
+        model.objects.filter(**{fk: OuterRef("pk")})
+        .order_by()
+        .values(fk)
+        .annotate(n=counted)
+        .values("n")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _true_count(model, fk):
+    other = None
+    if model in DISTINCT_PAIRS:
+        other = next(f for f, _, _ in LINKS[model] if f != fk)
+    return count_subquery(model, fk, other)
+
+
+def true_counts():
+    """{parent model: {counter field: expression}} computing each count."""
+    expressions = {}
+    for model, links in LINKS.items():
+        for fk, parent, field in links:
+            expressions.setdefault(parent, {})[field] = _true_count(model, fk)
+    return expressions
+
+
+def cache_tags(parents):
+    """Response cache tags (core/cache.py) of updated (parent, pk) pairs."""
+    tags = {f"{parent._meta.model_name.removeprefix('historic')}:{pk}"
+            for parent, pk in parents}
+    if any(parent is HistoricPlace for parent, _ in parents):
+        tags.add("places")  # place counts are in the map GeoJSON
+    return sorted(tags)
+
+
+def link_key(model, values):
+    """Parent ids of a link row, in LINKS order; ``values`` maps attnames."""
+    return tuple(values.get(f"{fk}_id") for fk, _, _ in LINKS[model])
+
+
+def saved_key(model, pk):
+    """Parent ids of link row ``pk`` as stored, or None."""
+    attnames = [f"{fk}_id" for fk, _, _ in LINKS[model]]
+    row = model.objects.filter(pk=pk).values_list(*attnames).first()
+    return tuple(row) if row is not None else None
+
+
+def adjust(parent, pk, field, delta):
+    rows = parent.objects.filter(pk=pk)
+    if delta < 0:
+        rows = rows.filter(**{f"{field}__gte": -delta})  # never below 0
+    rows.update(**{field: F(field) + delta, "date_modified": timezone.now()})
+
+
+def recount(model, fk, parent, pk, field):
+    parent.objects.filter(pk=pk).update(**{
+        field: _true_count(model, fk), "date_modified": timezone.now(),
+    })
+
+
+def link_moved(model, old_key, new_key):
+    """
+    Apply a link row changing parents; ``old_key``/``new_key`` are None
+    when it was created/deleted. Returns the (parent, pk) pairs updated.
+    """
+    if old_key == new_key:
+        return []
+    changed = []
+    for i, (fk, parent, field) in enumerate(LINKS[model]):
+        old = old_key[i] if old_key else None
+        new = new_key[i] if new_key else None
+        if old == new and model not in DISTINCT_PAIRS:
+            continue
+        for pk, delta in ((old, -1), (new, 1)):
+            if pk is None or (parent, pk) in changed:
+                continue
+            if model in DISTINCT_PAIRS:
+                recount(model, fk, parent, pk, field)
+            else:
+                adjust(parent, pk, field, delta)
+            changed.append((parent, pk))
+    return changed
@@ -0,0 +1,184 @@
+# core/graph.py
+"""
+In-memory relationship graph over people, places and events.
+
+Nodes are every HistoricPerson, HistoricPlace and HistoricEvent; edges come
+from PersonPlace, EventPerson and HistoricEvent.place, and are undirected.
+The adjacency is stored in CSR form (compressed sparse rows) in flat
+``array`` buffers: the neighbours of node ``i`` are
+``indices[indptr[i]:indptr[i + 1]]``. For a few thousand rows that is a
+few hundred KB per worker, and traversals never touch the database.
+
+The graph is built lazily on first use and rebuilt when the ``graph``
+cache tag changes; core.signals bumps it whenever an edge or a node is
+added or removed, so every worker notices on its next request.
+"""
+import threading
+from array import array
+from collections import deque
+
+from .cache import tag_versions
+from .models import (
+    EventPerson, HistoricEvent, HistoricPerson, HistoricPlace, PersonPlace
+)
+
+GRAPH_TAG = "graph"
+# Bumped on any rename as well; responses that show labels depend on it
+LABELS_TAG = "graph-labels"
+KINDS = ("person", "place", "event")
+_MODELS = {
+    "person": HistoricPerson,
+    "place": HistoricPlace,
+    "event": HistoricEvent,
+}
+
+
+class Graph:
+    def __init__(self, nodes, edges):
+        """
+        ``nodes``: [(kind, pk)] in index order.
+        ``edges``: [(u, v)] node-index pairs, each listed once.
+        """
+        self.kinds = array("b", (KINDS.index(kind) for kind, _ in nodes))
+        self.pks = array("q", (pk for _, pk in nodes))
+        self.index = {node: i for i, node in enumerate(nodes)}
+
+        degree = array("i", bytes(4 * (len(nodes) + 1)))
+        for u, v in edges:
+            degree[u + 1] += 1
+            degree[v + 1] += 1
+        for i in range(len(nodes)):
+            degree[i + 1] += degree[i]
+        self.indptr = degree
+        self.indices = array("i", bytes(4 * degree[-1]))
+        fill = array("i", degree[:-1])
+        for u, v in edges:
+            self.indices[fill[u]] = v
+            fill[u] += 1
+            self.indices[fill[v]] = u
+            fill[v] += 1
+
+    def __len__(self):
+        return len(self.pks)
+
+    def node(self, i):
+        return KINDS[self.kinds[i]], self.pks[i]
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def neighborhood(self, start, depth, max_nodes):
+        """
+        BFS from ``start`` up to ``depth`` hops. Returns ({index: hops},
+        truncated) where ``truncated`` is True if ``max_nodes`` was hit.
+        """
+        hops = {start: 0}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            if hops[u] == depth:
+                continue
+            for v in self.neighbors(u):
+                if v in hops:
+                    continue
+                if len(hops) >= max_nodes:
+                    return hops, True
+                hops[v] = hops[u] + 1
+                queue.append(v)
+        return hops, False
+
+    def edges_within(self, nodes):
+        """Edges with both ends in ``nodes``, each once, as (u, v), u < v."""
+        return [
+            (u, v) for u in nodes for v in self.neighbors(u)
+            if u < v and v in nodes
+        ]
+
+    def shortest_path(self, source, target, max_hops):
+        """Node indices from ``source`` to ``target``, or None."""
+        if source == target:
+            return [source]
+        parent = {source: None}
+        frontier = [source]
+        for _ in range(max_hops):
+            next_frontier = []
+            for u in frontier:
+                for v in self.neighbors(u):
+                    if v in parent:
+                        continue
+                    parent[v] = u
+                    if v == target:
+                        path = [v]
+                        while parent[path[-1]] is not None:
+                            path.append(parent[path[-1]])
+                        return path[::-1]
+                    next_frontier.append(v)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return None
+
+
+def build_graph():
+    nodes = [
+        (kind, pk)
+        for kind in KINDS
+        for pk in _MODELS[kind].objects.order_by("pk")
+        .values_list("pk", flat=True)
+    ]
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = set()
+
+    def link(a, b):
+        u, v = index[a], index[b]
+        edges.add((min(u, v), max(u, v)))
+
+    # order_by(): the models' default orderings would sort whole tables
+    for person, place in PersonPlace.objects.order_by().values_list(
+            "person_id", "place_id"):
+        link(("person", person), ("place", place))
+    for event, person in EventPerson.objects.order_by().values_list(
+            "event_id", "person_id"):
+        link(("event", event), ("person", person))
+    for event, place in HistoricEvent.objects.order_by().values_list(
+            "pk", "place_id"):
+        link(("event", event), ("place", place))
+    return Graph(nodes, sorted(edges))
+
+
+_lock = threading.Lock()
+_current = None  # (tag version, Graph)
+
+
+def get_graph():
+    """The graph for the current ``graph`` tag version, rebuilt if stale."""
+    global _current
+    version = tag_versions([GRAPH_TAG])[GRAPH_TAG]
+    current = _current
+    if current is not None and current[0] == version:
+        return current[1]
+    with _lock:
+        if _current is None or _current[0] != version:
+            _current = (version, build_graph())
+        return _current[1]
+
+
+def labels(nodes):
+    """{(kind, pk): display label} for ``nodes``, one query per kind."""
+    wanted = {kind: [] for kind in KINDS}
+    for kind, pk in nodes:
+        wanted[kind].append(pk)
+    out = {}
+    for pk, first, last in HistoricPerson.objects.filter(
+            pk__in=wanted["person"]).order_by().values_list(
+                "pk", "first_name", "last_name"):
+        out["person", pk] = f"{first} {last}".strip()
+    for pk, name in HistoricPlace.objects.filter(
+            pk__in=wanted["place"]).order_by().values_list(
+                "pk", "place_name"):
+        out["place", pk] = name
+    for pk, name in HistoricEvent.objects.filter(
+            pk__in=wanted["event"]).order_by().values_list(
+                "pk", "event_name"):
+        out["event", pk] = name
+    return out
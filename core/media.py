@@ -0,0 +1,205 @@
+# core/media.py
+"""
+Serving for MEDIA_URL in every environment.
+
+Photos are stored under content-addressed names ("<stem>-<digest>.<ext>",
+see ``content_name``): new bytes always get a new URL, so those files are
+served with MEDIA_CACHE_CONTROL (a year, ``immutable``). Files stored
+before names carried a digest can still change under the same name; they
+get MEDIA_CACHE_CONTROL_UNHASHED, a short max-age after which caches
+revalidate against the ETag/Last-Modified validators, usually for a 304.
+Single HTTP byte ranges are honoured.
+
+With ``MEDIA_ACCEL_MODE`` set, Django only checks the path and hands the
+transfer to the front proxy (X-Accel-Redirect for Caddy/nginx, X-Sendfile
+for Apache/lighttpd), so workers never stream image bytes.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import (
+    ImproperlyConfigured,
+    SuspiciousFileOperation,
+)
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_BLOCK_SIZE = 64 * 1024
+DIGEST_LENGTH = 16  # hex digits of SHA-256 kept in names
+HASHED_NAME_RE = re.compile(rf"-[0-9a-f]{{{DIGEST_LENGTH}}}(?:\.\w+)?$")
+
+
+def content_name(filename, digest):
+    """``filename`` with the content digest before its extension."""
+    stem, ext = os.path.splitext(os.path.basename(filename))
+    return f"{stem}-{digest[:DIGEST_LENGTH]}{ext.lower()}"
+
+
+def file_digest(fileobj):
+    """SHA-256 hex digest of a Django File, read in chunks."""
+    digest = hashlib.sha256()
+    for chunk in fileobj.chunks():
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def chain_digest(previous, data):
+    """
+    Digest of ``data`` appended to content whose digest is ``previous``
+    ("" at the start). Chunked uploads (api/uploads.py) keep it per chunk,
+    so the assembled file never has to be read again to be named.
+    """
+    digest = hashlib.sha256(bytes.fromhex(previous))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def _resolve(path):
+    try:
+        full = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Invalid media path.")
+    # Partial chunked uploads live under MEDIA_ROOT but are never public.
+    temp_dir = os.path.realpath(settings.PHOTO_UPLOAD_TEMP_DIR)
+    if os.path.realpath(full).startswith(temp_dir + os.sep):
+        raise Http404("Media file not found.")
+    if not os.path.isfile(full):
+        raise Http404("Media file not found.")
+    return full
+
+
+def _parse_range(header, size):
+    """Return (start, end) inclusive for a single byte range, or None.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # multi-range or unknown unit: serve the whole file
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(request, etag, mtime):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith("W/"):
+        return False  # If-Range needs a strong validator (RFC 9110 13.1.5)
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == mtime
+
+
+def _iter_range(path, start, length):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = fh.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def serve_media(request, path):
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+
+    full = _resolve(path)
+    st = os.stat(full)
+    mtime = int(st.st_mtime)
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(mtime),
+        "Cache-Control": (settings.MEDIA_CACHE_CONTROL
+                          if HASHED_NAME_RE.search(path)
+                          else settings.MEDIA_CACHE_CONTROL_UNHASHED),
+        "Accept-Ranges": "bytes",
+    }
+
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=mtime
+    )
+    if not_modified is not None:
+        for key, value in headers.items():
+            not_modified[key] = value
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(full)
+    content_type = content_type or "application/octet-stream"
+
+    mode = settings.MEDIA_ACCEL_MODE
+    if mode:
+        response = HttpResponse(content_type=content_type)
+        if mode == "x-accel":
+            response["X-Accel-Redirect"] = (
+                settings.MEDIA_ACCEL_PREFIX.rstrip("/") + "/" + quote(path)
+            )
+        elif mode == "x-sendfile":
+            response["X-Sendfile"] = full
+        else:
+            # Would be an empty 200 behind a proxy that ignores the header
+            raise ImproperlyConfigured(
+                f"Unknown MEDIA_ACCEL_MODE {mode!r}; use "
+                f"{settings.MEDIA_ACCEL_MODES}."
+            )
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    range_header = request.headers.get("Range")
+    byte_range = None
+    if range_header and _if_range_matches(request, etag, mtime):
+        try:
+            byte_range = _parse_range(range_header, st.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{st.st_size}"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(full, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_range(full, start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+    if encoding:
+        response["Content-Encoding"] = encoding
+    for key, value in headers.items():
+        response[key] = value
+    return response
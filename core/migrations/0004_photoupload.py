@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-19 06:27
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_historicinterview'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='photo',
+            name='file_type',
+            field=models.CharField(blank=True, choices=[('png', 'png'), ('jpg', 'jpg'), ('jpeg', 'jpeg'), ('tif', 'tif'), ('tiff', 'tiff')], editable=False, max_length=10),
+        ),
+        migrations.CreateModel(
+            name='PhotoUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_name', models.CharField(max_length=255)),
+                ('caption', models.CharField(blank=True, max_length=250)),
+                ('total_size', models.PositiveBigIntegerField()),
+                ('offset', models.PositiveBigIntegerField(default=0)),
+                ('partial_path', models.CharField(editable=False, max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('photo', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload', to='core.photo')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
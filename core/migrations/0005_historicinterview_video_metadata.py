@@ -0,0 +1,73 @@
+# Generated by Django 5.2 on 2026-10-19 06:50
+
+import re
+from urllib.parse import parse_qs, urlsplit
+
+from django.db import migrations, models
+
+# Frozen copy of core.youtube.parse_video_id as of this migration, so later
+# changes to that module cannot change what this migration does.
+VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+YOUTUBE_HOSTS = {
+    "youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com",
+    "youtube-nocookie.com", "www.youtube-nocookie.com",
+}
+PATH_PREFIXES = ("embed", "shorts", "live", "v")
+
+
+def parse_video_id(url):
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return ""
+    host = (parts.hostname or "").lower()
+    segments = [s for s in parts.path.split("/") if s]
+    candidate = ""
+    if host == "youtu.be":
+        candidate = segments[0] if segments else ""
+    elif host in YOUTUBE_HOSTS:
+        if segments[:1] == ["watch"]:
+            candidate = parse_qs(parts.query).get("v", [""])[0]
+        elif len(segments) >= 2 and segments[0] in PATH_PREFIXES:
+            candidate = segments[1]
+    return candidate if VIDEO_ID_RE.match(candidate) else ""
+
+
+def parse_video_ids(apps, schema_editor):
+    HistoricInterview = apps.get_model("core", "HistoricInterview")
+    for interview in HistoricInterview.objects.only("youtube_url"):
+        interview.youtube_video_id = parse_video_id(interview.youtube_url)
+        interview.save(update_fields=["youtube_video_id"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_photoupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicinterview',
+            name='metadata_fetched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicinterview',
+            name='video_author',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='historicinterview',
+            name='video_title',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='historicinterview',
+            name='youtube_video_id',
+            field=models.CharField(blank=True, editable=False, help_text='Parsed from youtube_url on save.', max_length=11),
+        ),
+        migrations.RunPython(parse_video_ids, migrations.RunPython.noop),
+    ]
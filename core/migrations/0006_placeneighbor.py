@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-19 06:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_historicinterview_video_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaceNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('distance_m', models.FloatField()),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.historicplace')),
+                ('place', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbor_links', to='core.historicplace')),
+            ],
+            options={
+                'ordering': ['place_id', 'distance_m'],
+                'indexes': [models.Index(fields=['place', 'distance_m'], name='core_placen_place_i_c95040_idx')],
+                'constraints': [models.UniqueConstraint(fields=('place', 'neighbor'), name='uniq_place_neighbor')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-19 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_placeneighbor'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='historicevent',
+            name='core_histor_event_d_45dab2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='historicinterview',
+            name='core_histor_intervi_8c91f2_idx',
+        ),
+        migrations.AddIndex(
+            model_name='eventperson',
+            index=models.Index(fields=['person', 'event'], name='core_eventp_person__bc1300_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicevent',
+            index=models.Index(fields=['-event_date', 'event_name'], name='core_histor_event_d_7a8832_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicevent',
+            index=models.Index(fields=['place', '-event_date'], name='core_histor_place_i_df4f35_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicinterview',
+            index=models.Index(fields=['-interview_date', 'interviewee_name'], name='core_histor_intervi_9eacd8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personplace',
+            index=models.Index(fields=['-association_date', 'person'], name='core_person_associa_1557f2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personplace',
+            index=models.Index(fields=['place', 'person'], name='core_person_place_i_cf07b2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='photo',
+            index=models.Index(fields=['upload_date'], name='core_photo_upload__2ce6ac_idx'),
+        ),
+    ]
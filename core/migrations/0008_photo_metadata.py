@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-19 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_query_plan_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photo',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='photo',
+            name='mime_type',
+            field=models.CharField(blank=True, editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='photo',
+            name='orientation',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='EXIF orientation (1-8); width/height are as displayed.', null=True),
+        ),
+        migrations.AddField(
+            model_name='photo',
+            name='phash',
+            field=models.CharField(blank=True, editable=False, help_text='Perceptual (difference) hash, for finding duplicates.', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='photo',
+            name='taken_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='photo',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='photo',
+            index=models.Index(fields=['taken_at'], name='core_photo_taken_a_05e554_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='photo',
+            index=models.Index(fields=['phash'], name='core_photo_phash_cfb7d9_idx'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2 on 2026-10-19 07:19
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# parent model: {counter field: (link model, foreign key, distinct field)}
+COUNTS = {
+    "HistoricPlace": {
+        "event_count": ("HistoricEvent", "place", None),
+        "person_count": ("PersonPlace", "place", "person"),
+        "photo_count": ("PlacePhoto", "place", None),
+    },
+    "HistoricEvent": {
+        "person_count": ("EventPerson", "event", None),
+        "photo_count": ("EventPhoto", "event", None),
+    },
+    "HistoricPerson": {
+        "event_count": ("EventPerson", "person", None),
+        "place_count": ("PersonPlace", "person", "place"),
+    },
+}
+
+
+def count_subquery(model, fk, distinct=None):
+    # Frozen copy of core.counters.count_subquery as of this migration
+    counted = Count(distinct, distinct=True) if distinct else Count("pk")
+    counts = (
+        model.objects.filter(**{fk: OuterRef("pk")})
+        .order_by()
+        .values(fk)
+        .annotate(n=counted)
+        .values("n")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def fill_counts(apps, schema_editor):
+    for parent, fields in COUNTS.items():
+        apps.get_model("core", parent).objects.update(**{
+            field: count_subquery(apps.get_model("core", model), fk, distinct)
+            for field, (model, fk, distinct) in fields.items()
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_photo_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicevent',
+            name='person_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='People who took part in the event.'),
+        ),
+        migrations.AddField(
+            model_name='historicevent',
+            name='photo_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Photos of the event.'),
+        ),
+        migrations.AddField(
+            model_name='historicperson',
+            name='event_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Events the person took part in.'),
+        ),
+        migrations.AddField(
+            model_name='historicperson',
+            name='place_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Distinct places linked to the person.'),
+        ),
+        migrations.AddField(
+            model_name='historicplace',
+            name='event_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Events at the place.'),
+        ),
+        migrations.AddField(
+            model_name='historicplace',
+            name='person_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Distinct people linked to the place.'),
+        ),
+        migrations.AddField(
+            model_name='historicplace',
+            name='photo_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Photos of the place.'),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
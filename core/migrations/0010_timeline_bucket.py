@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 07:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_link_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'Event'), ('place', 'Place')], max_length=5)),
+                ('significance', models.CharField(blank=True, max_length=50)),
+                ('year', models.SmallIntegerField()),
+                ('decade', models.SmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('place', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.historicplace')),
+            ],
+            options={
+                'ordering': ['kind', 'year'],
+                'indexes': [models.Index(fields=['kind', 'year'], name='core_timeli_kind_83ed62_idx'), models.Index(fields=['kind', 'decade'], name='core_timeli_kind_f0eb5c_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'place', 'significance', 'year'), name='uniq_timeline_bucket')],
+            },
+        ),
+    ]
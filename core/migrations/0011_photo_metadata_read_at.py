@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-19 07:42
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_inspected(apps, schema_editor):
+    # Photos read before this field existed have a MIME type
+    Photo = apps.get_model("core", "Photo")
+    Photo.objects.exclude(mime_type="").update(metadata_read_at=F("modified_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_timeline_bucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photo',
+            name='metadata_read_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the file was last inspected, readable or not.', null=True),
+        ),
+        migrations.RunPython(mark_inspected, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 07:51
+
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_photo_metadata_read_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photoupload',
+            name='content_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='photo',
+            name='image',
+            field=models.ImageField(upload_to=core.models.photo_upload_to),
+        ),
+    ]
@@ -1,4 +1,8 @@
 # core/models.py
+import datetime
+import uuid
+
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from django.core.validators import (
@@ -6,7 +10,21 @@ from django.core.validators import (
 )
 from django.core.exceptions import ValidationError
 from django.db.models import F, Q
+from . import media, photometa
 from .validators import validate_partial_date
+from .youtube import parse_video_id
+
+
+def photo_upload_to(instance, filename):
+    """
+    Content-addressed name under photos/%Y/%m/, so a URL never serves
+    different bytes and media can be cached as immutable (core/media.py).
+    Chunked uploads set ``_content_digest`` rather than have it re-read.
+    """
+    digest = (getattr(instance, "_content_digest", None)
+              or media.file_digest(instance.image))
+    return timezone.now().strftime("photos/%Y/%m/") + media.content_name(
+        filename, digest)
 
 
 class Photo(models.Model):
@@ -14,9 +32,11 @@ class Photo(models.Model):
         PNG = "png", "png"
         JPG = "jpg", "jpg"
         JPEG = "jpeg", "jpeg"
+        TIF = "tif", "tif"
+        TIFF = "tiff", "tiff"
 
     # NEW: actual uploaded file → this gives you the “Browse…” button
-    image = models.ImageField(upload_to="photos/%Y/%m/")
+    image = models.ImageField(upload_to=photo_upload_to)
 
     # Keep your metadata, but make them read-only/auto-populated
     file_name = models.CharField(max_length=255, editable=False, blank=True)
@@ -32,12 +52,37 @@ class Photo(models.Model):
         editable=False
     )
 
+    # Read from the file itself by core/photometa.py
+    mime_type = models.CharField(max_length=50, blank=True, editable=False)
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(
+        null=True, blank=True, editable=False
+    )
+    orientation = models.PositiveSmallIntegerField(
+        null=True, blank=True, editable=False,
+        help_text="EXIF orientation (1-8); width/height are as displayed.",
+    )
+    taken_at = models.DateTimeField(null=True, blank=True, editable=False)
+    phash = models.CharField(
+        max_length=16, blank=True, editable=False,
+        help_text="Perceptual (difference) hash, for finding duplicates.",
+    )
+    metadata_read_at = models.DateTimeField(
+        null=True, blank=True, editable=False,
+        help_text="When the file was last inspected, readable or not.",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-upload_date"]
-        indexes = [models.Index(fields=["file_name"])]
+        indexes = [
+            models.Index(fields=["file_name"]),
+            models.Index(fields=["upload_date"]),
+            models.Index(fields=["taken_at"]),
+            models.Index(fields=["phash"]),
+        ]
 
     def save(self, *args, **kwargs):
         if self.image and hasattr(self.image, "name"):
@@ -47,17 +92,121 @@ class Photo(models.Model):
             ext = name.split(".")[-1].lower()
             if ext in dict(self.FileType.choices):
                 self.file_type = ext
-            try:
-                self.file_size = self.image.size
-            except Exception:
-                pass
+        # A file uploaded with this save (admin, API) is read like any other:
+        # in the background once it is stored (photometa.read_later), so no
+        # request decodes a large scan. backfill_photo_metadata catches jobs
+        # lost with their worker.
+        new_file = bool(self.image) and not self.image._committed
+        if new_file:
+            self.file_size = self.image.size
+            self.metadata_read_at = None
         super().save(*args, **kwargs)
+        if new_file:
+            photometa.read_later(self.pk)
+
+    def read_metadata(self):
+        """
+        Fill size, MIME type, dimensions, EXIF and hash from the file;
+        False if it is missing from storage (the fields are left alone).
+        """
+        try:
+            self.image.open("rb")
+        except OSError:
+            return False
+        try:
+            meta = photometa.extract(self.image)
+        finally:
+            if self.image._committed:
+                self.image.close()
+        for name, value in meta.items():
+            setattr(self, name, value)
+        # Also when Pillow could not read it: never decoded again on save
+        self.metadata_read_at = timezone.now()
+        return True
 
     def __str__(self):
         return f"{self.file_name or self.image.name}"
 
 
-class HistoricPerson(models.Model):
+class PhotoUpload(models.Model):
+    """
+    A resumable (tus-like) upload in progress.
+
+    Chunks are appended to ``partial_path`` on disk; ``offset`` is the number
+    of bytes received so far. Once ``offset == total_size`` the file is moved
+    into the photo storage and ``photo`` points at the created Photo.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file_name = models.CharField(max_length=255)
+    caption = models.CharField(max_length=250, blank=True)
+    total_size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    partial_path = models.CharField(max_length=500, editable=False)
+    # Chained over the chunks written (core.media.chain_digest); names the photo
+    content_digest = models.CharField(max_length=64, blank=True,
+                                      editable=False)
+
+    photo = models.OneToOneField(
+        Photo,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="upload",
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    @property
+    def is_complete(self):
+        return self.offset >= self.total_size
+
+    @property
+    def expires_at(self):
+        """When expire_uploads may delete the upload, unless it moves."""
+        return self.modified_at + datetime.timedelta(
+            hours=settings.PHOTO_UPLOAD_EXPIRY_HOURS)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.offset}/{self.total_size})"
+
+
+def _counter(help_text):
+    return models.PositiveIntegerField(default=0, editable=False,
+                                       help_text=help_text)
+
+
+class CountedModel(models.Model):
+    """A model with link counts maintained by core/counters.py."""
+
+    COUNTER_FIELDS = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # An update never writes the counts it read earlier over ones the
+        # signals have moved since
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+class HistoricPerson(CountedModel):
     first_name = models.CharField(max_length=25)
     last_name = models.CharField(max_length=25)
     dob = models.DateField(null=True, blank=True)
@@ -75,6 +224,9 @@ class HistoricPerson(models.Model):
         related_name="profile_of"
     )
 
+    event_count = _counter("Events the person took part in.")
+    place_count = _counter("Distinct places linked to the person.")
+
     date_added = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
 
@@ -86,6 +238,8 @@ class HistoricPerson(models.Model):
         blank=True
     )
 
+    COUNTER_FIELDS = ("event_count", "place_count")
+
     class Meta:
         ordering = ["last_name", "first_name"]
         indexes = [models.Index(fields=["last_name", "first_name"])]
@@ -94,7 +248,7 @@ class HistoricPerson(models.Model):
         return f"{self.last_name}, {self.first_name}"
 
 
-class HistoricPlace(models.Model):
+class HistoricPlace(CountedModel):
     place_name = models.CharField(max_length=50)
     latitude = models.DecimalField(
         max_digits=10, decimal_places=8,
@@ -122,9 +276,15 @@ class HistoricPlace(models.Model):
         validators=[MaxLengthValidator(10000)]
     )
 
+    event_count = _counter("Events at the place.")
+    person_count = _counter("Distinct people linked to the place.")
+    photo_count = _counter("Photos of the place.")
+
     date_added = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = ("event_count", "person_count", "photo_count")
+
     class Meta:
         ordering = ["place_name"]
         indexes = [models.Index(fields=["place_name"])]
@@ -141,7 +301,7 @@ class HistoricPlace(models.Model):
         return self.place_name
 
 
-class HistoricEvent(models.Model):
+class HistoricEvent(CountedModel):
     class Significance(models.TextChoices):
         LOCAL = "LOCAL", "Local"
         REGIONAL = "REGIONAL", "Regional"
@@ -164,12 +324,20 @@ class HistoricEvent(models.Model):
         related_name="events",
     )
 
+    person_count = _counter("People who took part in the event.")
+    photo_count = _counter("Photos of the event.")
+
     date_added = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = ("person_count", "photo_count")
+
     class Meta:
         ordering = ["-event_date", "event_name"]
-        indexes = [models.Index(fields=["event_date"])]
+        indexes = [
+            models.Index(fields=["-event_date", "event_name"]),
+            models.Index(fields=["place", "-event_date"]),
+        ]
 
     def __str__(self):
         return f"{self.event_name} ({self.event_date})"
@@ -185,6 +353,10 @@ class PersonPlace(models.Model):
 
     class Meta:
         ordering = ["-association_date", "person_id"]
+        indexes = [
+            models.Index(fields=["-association_date", "person"]),
+            models.Index(fields=["place", "person"]),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["person", "place", "association_date"],
@@ -204,6 +376,7 @@ class EventPerson(models.Model):
 
     class Meta:
         ordering = ["event_id", "person_id"]
+        indexes = [models.Index(fields=["person", "event"])]
         constraints = [
             models.UniqueConstraint(
                 fields=["event", "person"],
@@ -229,11 +402,25 @@ class EventPerson(models.Model):
         return f"{self.person} in {self.event} ({self.role or 'role n/a'})"
 
 
+MAX_PHOTOS = 10
+
+
+def _photos_besides(link, parent, fk):
+    """Photos of the link's parent other than ``link``, from photo_count."""
+    parent_id = getattr(link, f"{fk}_id")
+    count = (parent.objects.filter(pk=parent_id)
+             .values_list("photo_count", flat=True).first()) or 0
+    if link.pk and type(link).objects.filter(
+            pk=link.pk, **{f"{fk}_id": parent_id}).exists():
+        count -= 1  # editing a photo already counted here
+    return count
+
+
 class PlacePhoto(models.Model):
     place = models.ForeignKey(HistoricPlace, on_delete=models.CASCADE)
     photo = models.ForeignKey(Photo, on_delete=models.CASCADE)
     photo_order = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(1), MaxValueValidator(10)]
+        validators=[MinValueValidator(1), MaxValueValidator(MAX_PHOTOS)]
     )
 
     class Meta:
@@ -251,11 +438,9 @@ class PlacePhoto(models.Model):
     def clean(self):
         if self.place_id is None:
             return
-        qs = PlacePhoto.objects.filter(place_id=self.place_id)
-        if self.pk:
-            qs = qs.exclude(pk=self.pk)
-        if qs.count() >= 10 and not qs.filter(photo_order__lt=10).exists():
-            raise ValidationError("A place can have at most 10 photos.")
+        if _photos_besides(self, HistoricPlace, "place") >= MAX_PHOTOS:
+            raise ValidationError(
+                f"A place can have at most {MAX_PHOTOS} photos.")
 
     def __str__(self):
         return f"Photo {self.photo_id} for {self.place} (#{self.photo_order})"
@@ -265,7 +450,7 @@ class EventPhoto(models.Model):  # NEW
     event = models.ForeignKey(HistoricEvent, on_delete=models.CASCADE)
     photo = models.ForeignKey(Photo, on_delete=models.CASCADE)
     photo_order = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(1), MaxValueValidator(10)]
+        validators=[MinValueValidator(1), MaxValueValidator(MAX_PHOTOS)]
     )
 
     class Meta:
@@ -283,16 +468,79 @@ class EventPhoto(models.Model):  # NEW
     def clean(self):
         if self.event_id is None:
             return
-        qs = EventPhoto.objects.filter(event_id=self.event_id)
-        if self.pk:
-            qs = qs.exclude(pk=self.pk)
-        if qs.count() >= 10 and not qs.filter(photo_order__lt=10).exists():
-            raise ValidationError("An event can have at most 10 photos.")
+        if _photos_besides(self, HistoricEvent, "event") >= MAX_PHOTOS:
+            raise ValidationError(
+                f"An event can have at most {MAX_PHOTOS} photos.")
 
     def __str__(self):
         return f"Photo {self.photo_id} for {self.event} (#{self.photo_order})"
 
 
+class PlaceNeighbor(models.Model):
+    """
+    Precomputed nearest places of each place, within
+    PLACE_NEIGHBORS_RADIUS_M and at most PLACE_NEIGHBORS_K per place.
+    Maintained by core/neighbors.py.
+    """
+
+    place = models.ForeignKey(
+        HistoricPlace, on_delete=models.CASCADE, related_name="neighbor_links"
+    )
+    neighbor = models.ForeignKey(
+        HistoricPlace, on_delete=models.CASCADE, related_name="+"
+    )
+    distance_m = models.FloatField()
+
+    class Meta:
+        ordering = ["place_id", "distance_m"]
+        indexes = [models.Index(fields=["place", "distance_m"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["place", "neighbor"], name="uniq_place_neighbor"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.place_id} -> {self.neighbor_id} ({self.distance_m:.0f} m)"
+
+
+class TimelineBucket(models.Model):
+    """
+    Precomputed counts behind the timeline histogram: events per (place,
+    significance, year) and places per start year. Kept per place so a
+    bounding box can be applied; maintained by core/timeline.py.
+    """
+
+    class Kind(models.TextChoices):
+        EVENT = "event", "Event"
+        PLACE = "place", "Place"
+
+    kind = models.CharField(max_length=5, choices=Kind.choices)
+    place = models.ForeignKey(
+        HistoricPlace, on_delete=models.CASCADE, related_name="+"
+    )
+    significance = models.CharField(max_length=50, blank=True)
+    year = models.SmallIntegerField()
+    decade = models.SmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["kind", "year"]
+        indexes = [
+            models.Index(fields=["kind", "year"]),
+            models.Index(fields=["kind", "decade"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "place", "significance", "year"],
+                name="uniq_timeline_bucket",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.year} @ {self.place_id}: {self.count}"
+
+
 class HistoricInterview(models.Model):
     """
     Metadata for oral history / research interviews.
@@ -322,6 +570,17 @@ class HistoricInterview(models.Model):
     youtube_url = models.URLField(
         help_text="Public YouTube URL where the interview video is hosted.",
     )
+    youtube_video_id = models.CharField(
+        max_length=11,
+        blank=True,
+        editable=False,
+        help_text="Parsed from youtube_url on save.",
+    )
+
+    # Filled in by `manage.py fetch_interview_metadata` (YouTube oEmbed)
+    video_title = models.CharField(max_length=255, blank=True)
+    video_author = models.CharField(max_length=255, blank=True)
+    metadata_fetched_at = models.DateTimeField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
@@ -329,9 +588,24 @@ class HistoricInterview(models.Model):
     class Meta:
         ordering = ["-interview_date", "interviewee_name"]
         indexes = [
-            models.Index(fields=["interview_date"]),
+            models.Index(fields=["-interview_date", "interviewee_name"]),
             models.Index(fields=["interviewee_name"]),
         ]
 
     def __str__(self) -> str:
         return f"{self.interviewee_name} ({self.interview_date})"
+
+    def save(self, *args, **kwargs):
+        video_id = parse_video_id(self.youtube_url)
+        if video_id != self.youtube_video_id:
+            # New video: the stored oEmbed metadata belongs to the old one
+            self.youtube_video_id = video_id
+            self.video_title = self.video_author = ""
+            self.metadata_fetched_at = None
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields, "youtube_video_id", "video_title",
+                    "video_author", "metadata_fetched_at",
+                }
+        super().save(*args, **kwargs)
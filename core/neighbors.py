@@ -0,0 +1,135 @@
+# core/neighbors.py
+"""
+k-nearest-neighbour table for HistoricPlace (core.models.PlaceNeighbor).
+
+Each place stores up to PLACE_NEIGHBORS_K other places within
+PLACE_NEIGHBORS_RADIUS_M, by haversine distance, so "what's nearby" is a
+single indexed query on (place, distance_m).
+
+Candidates come from a uniform grid whose cells are one radius across: the
+places within the radius of a point are all in its cell or one of the 8
+around it, so a full build costs O(N x local density) rather than O(N^2).
+
+When a place is added, moved or deleted, only the places within the radius
+of its old and new positions can have a different neighbour list;
+``update_around`` recomputes just those.
+"""
+import heapq
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import HistoricPlace, PlaceNeighbor
+
+EARTH_RADIUS_M = 6_371_008.8
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = (math.sin(dphi / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _lon_degrees(meters, lat):
+    """Longitude span of ``meters`` at ``lat`` (generous near the poles)."""
+    return meters / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+
+
+class GridIndex:
+    """Places bucketed into cells at least ``radius_m`` wide."""
+
+    def __init__(self, points, radius_m):
+        self.points = points
+        max_lat = max((abs(lat) for lat, _ in points.values()), default=0.0)
+        self.cell_lat = radius_m / METERS_PER_DEGREE
+        self.cell_lon = _lon_degrees(radius_m, min(max_lat + self.cell_lat, 90))
+        self.cells = defaultdict(list)
+        for pk, (lat, lon) in points.items():
+            self.cells[self._cell(lat, lon)].append(pk)
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.cell_lat),
+                math.floor(lon / self.cell_lon))
+
+    def candidates(self, lat, lon):
+        row, col = self._cell(lat, lon)
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                yield from self.cells.get((row + dr, col + dc), ())
+
+
+def nearest(index, pk, lat, lon, k, radius_m):
+    """[(distance_m, neighbor_pk)] of the ``k`` closest places to ``pk``."""
+    found = []
+    for other in index.candidates(lat, lon):
+        if other == pk:
+            continue
+        d = haversine_m(lat, lon, *index.points[other])
+        if d <= radius_m:
+            found.append((d, other))
+    return heapq.nsmallest(k, found)
+
+
+def _points(queryset):
+    return {
+        pk: (float(lat), float(lon))
+        for pk, lat, lon in queryset.values_list("pk", "latitude", "longitude")
+    }
+
+
+def _neighbor_rows(index, pks, k, radius_m):
+    rows = []
+    for pk in pks:
+        lat, lon = index.points[pk]
+        rows.extend(
+            PlaceNeighbor(place_id=pk, neighbor_id=other, distance_m=d)
+            for d, other in nearest(index, pk, lat, lon, k, radius_m)
+        )
+    return rows
+
+
+def rebuild_all():
+    """Recompute the whole table. Returns the number of rows written."""
+    k, radius = settings.PLACE_NEIGHBORS_K, settings.PLACE_NEIGHBORS_RADIUS_M
+    index = GridIndex(_points(HistoricPlace.objects.all()), radius)
+    rows = _neighbor_rows(index, index.points, k, radius)
+    with transaction.atomic():
+        PlaceNeighbor.objects.all().delete()
+        PlaceNeighbor.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def update_around(*positions):
+    """
+    Recompute the neighbours of every place within the radius of any of
+    ``positions`` ((lat, lon) pairs, e.g. a moved place's old and new
+    coordinates). Their candidates all lie within twice the radius, so
+    only that box is loaded.
+    """
+    k, radius = settings.PLACE_NEIGHBORS_K, settings.PLACE_NEIGHBORS_RADIUS_M
+    positions = [(float(lat), float(lon)) for lat, lon in positions]
+    box = HistoricPlace.objects.none()
+    for lat, lon in positions:
+        dlat = 2 * radius / METERS_PER_DEGREE
+        dlon = _lon_degrees(2 * radius, min(abs(lat) + dlat, 90))
+        box = box | HistoricPlace.objects.filter(
+            latitude__range=(lat - dlat, lat + dlat),
+            longitude__range=(lon - dlon, lon + dlon),
+        )
+    index = GridIndex(_points(box), radius)
+    affected = [
+        pk for pk, (plat, plon) in index.points.items()
+        if any(haversine_m(plat, plon, lat, lon) <= radius
+               for lat, lon in positions)
+    ]
+    rows = _neighbor_rows(index, affected, k, radius)
+    with transaction.atomic():
+        PlaceNeighbor.objects.filter(place_id__in=affected).delete()
+        PlaceNeighbor.objects.bulk_create(rows, batch_size=500)
+    return len(affected)
@@ -0,0 +1,65 @@
+# core/photo_order.py
+"""
+Reordering a place or event gallery in one go.
+
+Changing ``photo_order`` row by row collides with the (parent,
+photo_order) unique constraint as soon as two photos swap places, and
+each PATCH runs the ``clean()`` checks again. ``reorder`` takes the
+complete new order and writes it in one transaction with the same three
+statements whatever the size of the gallery:
+
+    SELECT  the gallery's photos and positions     (validation, offset)
+    UPDATE  photo_order = photo_order + <max>      (frees 1..n)
+    UPDATE  photo_order = CASE photo_id WHEN ... END
+
+``QuerySet.update`` sends no signals, so the cache tags core.signals
+would have bumped are bumped here, on commit.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+
+from .cache import bump_tags
+from .models import MAX_PHOTOS, EventPhoto, PlacePhoto
+
+# gallery kind -> (link model, foreign key to the parent)
+GALLERIES = {
+    "place": (PlacePhoto, "place"),
+    "event": (EventPhoto, "event"),
+}
+
+
+def reorder(kind, parent_id, photo_ids):
+    """
+    Put the photos of a place or event gallery in the order of
+    ``photo_ids``, which must list each of its photos exactly once.
+    Raises ValidationError otherwise.
+    """
+    model, fk = GALLERIES[kind]
+    if len(photo_ids) > MAX_PHOTOS:
+        raise ValidationError(
+            f"A {kind} can have at most {MAX_PHOTOS} photos.")
+    if len(set(photo_ids)) != len(photo_ids):
+        raise ValidationError("Each photo can only be listed once.")
+
+    with transaction.atomic():
+        gallery = model.objects.filter(**{f"{fk}_id": parent_id})
+        current = dict(gallery.values_list("photo_id", "photo_order"))
+        if set(current) != set(photo_ids):
+            missing = sorted(set(current) - set(photo_ids))
+            unknown = sorted(set(photo_ids) - set(current))
+            raise ValidationError(
+                f"The order must list every photo of the {kind} and no "
+                f"other (missing: {missing}, not in the {kind}: {unknown})."
+            )
+        if not current:
+            return
+        # Move every row above the highest position in use, so no new
+        # position below collides with an old one while rows are updated
+        gallery.update(photo_order=F("photo_order") + max(current.values()))
+        gallery.update(photo_order=Case(*(
+            When(photo_id=photo_id, then=Value(position))
+            for position, photo_id in enumerate(photo_ids, start=1)
+        )))
+        transaction.on_commit(lambda: bump_tags(
+            f"{kind}:{parent_id}", f"model:{model._meta.label_lower}"))
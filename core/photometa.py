@@ -0,0 +1,179 @@
+# core/photometa.py
+"""
+Photo metadata, read in one pass over the file.
+
+``extract(fileobj)`` returns the Photo fields that depend on the file's
+contents:
+
+* ``file_size``    bytes, from the stream itself (no storage round trip)
+* ``mime_type``    from the leading magic bytes, not the extension
+* ``width``/``height``  as displayed, i.e. after EXIF orientation
+* ``orientation``  EXIF orientation (1-8), None if absent
+* ``taken_at``     EXIF DateTimeOriginal (or DateTime), in TIME_ZONE
+* ``phash``        64-bit difference hash as 16 hex digits
+
+Pillow parses the header, and EXIF with it, when the image is opened;
+the only pixels decoded are those for the hash, and for JPEGs
+``Image.draft`` has the decoder downscale while decoding, so even large
+photos are hashed from a few thousand pixels. Other formats (TIFF, PNG
+scans of up to PHOTO_UPLOAD_MAX_SIZE) are decoded whole, so no file is
+read inside a request: once a photo's file is stored, ``read_later``
+queues it for a background thread when the transaction commits. A job
+lost with its worker is picked up by ``manage.py backfill_photo_metadata``
+(photos whose ``metadata_read_at`` is unset).
+"""
+import datetime
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image
+
+# (offset, signature, MIME type)
+MAGIC = (
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"II*\x00", "image/tiff"),
+    (0, b"MM\x00*", "image/tiff"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (8, b"WEBP", "image/webp"),
+    (4, b"ftypheic", "image/heic"),
+    (4, b"ftypavif", "image/avif"),
+)
+UNKNOWN_MIME = "application/octet-stream"
+HEAD_SIZE = 16
+
+EXIF_ORIENTATION = 0x0112
+EXIF_DATETIME = 0x0132
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_DATE_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+# EXIF orientation -> transpose that displays the image upright
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+HASH_SIZE = 8
+# Photo fields set by read_metadata() (extract() plus when it ran)
+FIELDS = ("file_size", "mime_type", "width", "height", "orientation",
+          "taken_at", "phash", "metadata_read_at")
+READ_ERRORS = (OSError, ValueError, SyntaxError, Image.DecompressionBombError)
+
+
+def sniff_mime(head):
+    for offset, signature, mime in MAGIC:
+        if head[offset:offset + len(signature)] == signature:
+            return mime
+    return UNKNOWN_MIME
+
+
+def _taken_at(exif):
+    raw = (exif.get_ifd(EXIF_IFD).get(EXIF_DATETIME_ORIGINAL)
+           or exif.get(EXIF_DATETIME))
+    if not isinstance(raw, str):
+        return None
+    try:
+        value = datetime.datetime.strptime(raw.strip("\x00 "),
+                                           EXIF_DATE_FORMAT)
+    except ValueError:
+        return None
+    # EXIF times are camera-local with no zone; read them in TIME_ZONE
+    return timezone.make_aware(value)
+
+
+def dhash(image):
+    """Difference hash: compares adjacent pixels of a 9x8 greyscale copy."""
+    small = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE),
+                                      Image.Resampling.BOX)
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            left, right = pixels[offset + col], pixels[offset + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:016x}"
+
+
+def extract(fileobj):
+    """
+    Metadata of the image in ``fileobj`` (a binary file positioned
+    anywhere). Fields that cannot be read are None, or "" for phash;
+    file_size and mime_type are always set.
+    """
+    fileobj.seek(0, os.SEEK_END)
+    meta = {
+        "file_size": fileobj.tell(),
+        "mime_type": UNKNOWN_MIME,
+        "width": None,
+        "height": None,
+        "orientation": None,
+        "taken_at": None,
+        "phash": "",
+    }
+    fileobj.seek(0)
+    meta["mime_type"] = sniff_mime(fileobj.read(HEAD_SIZE))
+    fileobj.seek(0)
+    try:
+        with Image.open(fileobj) as image:
+            exif = image.getexif()
+            orientation = exif.get(EXIF_ORIENTATION)
+            width, height = image.size
+            if orientation in (5, 6, 7, 8):
+                width, height = height, width
+            meta.update(width=width, height=height,
+                        orientation=orientation if orientation in range(1, 9)
+                        else None,
+                        taken_at=_taken_at(exif))
+
+            # Decoding can still fail (truncated file) after the header
+            # was read; dimensions and EXIF are kept in that case.
+            image.draft("RGB", (HASH_SIZE * 8, HASH_SIZE * 8))
+            if orientation in ORIENTATION_TRANSPOSE:
+                image = image.transpose(ORIENTATION_TRANSPOSE[orientation])
+            meta["phash"] = dhash(image)
+    except READ_ERRORS:
+        pass  # not an image Pillow can read: keep what we have
+    finally:
+        fileobj.seek(0)
+    return meta
+
+
+# --- background reads -------------------------------------------------------
+
+# One file at a time per process: decoding a large scan is CPU and memory
+# heavy, and requests come first
+_reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="photometa")
+
+
+def read_later(photo_pk):
+    """Read the stored file of a photo in the background after commit."""
+    transaction.on_commit(lambda: _reader.submit(_read_stored, photo_pk))
+
+
+def _read_stored(photo_pk):
+    from .cache import bump_tags
+    from .models import Photo
+
+    try:
+        photo = Photo.objects.filter(pk=photo_pk).only("pk", "image").first()
+        if photo is None or not photo.image:
+            return
+        if not photo.read_metadata():
+            return  # missing from storage
+        Photo.objects.filter(pk=photo_pk).update(
+            **{name: getattr(photo, name) for name in FIELDS},
+            modified_at=timezone.now(),
+        )
+        # update() sends no signals: invalidate like core.signals
+        bump_tags(f"photo:{photo_pk}")
+    finally:
+        connections.close_all()  # this thread's connections only
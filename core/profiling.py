@@ -0,0 +1,248 @@
+# core/profiling.py
+"""
+Opt-in sampling profiler for production requests.
+
+A request is profiled when
+
+* a staff user (session, or the API's JWT ``Authorization`` header) sends
+  ``X-Profile: 1``; the response then names the profile in X-Profile-Id;
+* or it is drawn at random with probability PROFILE_SAMPLE_RATE (0, the
+  default, never samples).
+
+While the rest of the middleware chain and the view run, a background
+thread reads the request thread's stack every PROFILE_INTERVAL_MS
+(``sys._current_frames``). Requests that are not profiled pay nothing but
+the header check. Each profile is written to PROFILE_DIR as:
+
+    <id>.folded   collapsed stacks ("outer;inner;leaf count" per line),
+                  the input of flamegraph.pl, speedscope and inferno
+    <id>.json     method, path, route, status, duration, sample count and
+                  an SQL summary (count, time, slowest statements)
+
+Only the newest PROFILE_KEEP profiles are kept. The CMS lists them,
+slowest first, at /cms/profiles/ (staff only).
+
+The profile covers the view, not the streaming of a StreamingHttpResponse.
+Under ASGI an async view runs on the event loop rather than on the thread
+that is sampled, so its time appears as a wait inside asgiref.
+"""
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_RE = re.compile(r"^[0-9T-]+-\d+-[0-9a-f]{8}$")
+SLOWEST_QUERIES = 5
+MAX_SQL_LENGTH = 500
+
+
+def _short_filename(filename):
+    """Path of a source file relative to the project or site-packages."""
+    for marker in ("site-packages/", "dist-packages/"):
+        _, found, rest = filename.rpartition(marker)
+        if found:
+            return rest
+    base = str(settings.BASE_DIR) + os.sep
+    return filename.removeprefix(base)
+
+
+class Sampler:
+    """Counts the stacks of one thread, from ``start()`` until ``stop()``."""
+
+    def __init__(self, thread_id, interval, boundary):
+        self.thread_id = thread_id
+        self.interval = interval
+        # Frames at and above this code object (the server, the outer
+        # middleware) are the same in every sample: they are left out
+        self.boundary = boundary
+        self.stacks = Counter()
+        self._names = {}
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="profile-sampler")
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None and not self._stopped.is_set():
+                self.stacks[self._stack(frame)] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        return self.stacks
+
+    def _name(self, code):
+        name = self._names.get(code)
+        if name is None:
+            name = (f"{code.co_qualname} "
+                    f"({_short_filename(code.co_filename)}:"
+                    f"{code.co_firstlineno})").replace(";", ":")
+            self._names[code] = name
+        return name
+
+    def _stack(self, frame):
+        names = []
+        while frame is not None and frame.f_code is not self.boundary:
+            names.append(self._name(frame.f_code))
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+
+class QueryLog:
+    """``execute_wrapper`` that summarises the SQL run during a request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = []  # [(seconds, sql)]
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.total += elapsed
+            self.slowest.append((elapsed, sql[:MAX_SQL_LENGTH]))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SLOWEST_QUERIES:]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 2),
+            "slowest": [{"ms": round(seconds * 1000, 2), "sql": sql}
+                        for seconds, sql in self.slowest],
+        }
+
+
+# --- storage ----------------------------------------------------------------
+
+def _directory():
+    return Path(settings.PROFILE_DIR)
+
+
+def save_profile(meta, stacks):
+    """Write a profile and drop the oldest beyond PROFILE_KEEP; its id."""
+    directory = _directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    profile_id = (f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}"
+                  f"{int(now % 1 * 1e6):06d}-{os.getpid()}-"
+                  f"{uuid.uuid4().hex[:8]}")
+    folded = "".join(f"{stack} {count}\n"
+                     for stack, count in stacks.most_common())
+    (directory / f"{profile_id}.folded").write_text(folded)
+    # The .json appears last (atomically): a listed profile is complete
+    partial = directory / f".{profile_id}.json.tmp"
+    partial.write_text(json.dumps({"id": profile_id, **meta}))
+    os.replace(partial, directory / f"{profile_id}.json")
+    _prune(directory)
+    return profile_id
+
+
+def _prune(directory):
+    names = sorted(p.stem for p in directory.glob("*.json"))
+    for stale in names[:max(len(names) - settings.PROFILE_KEEP, 0)]:
+        for suffix in (".json", ".folded"):
+            (directory / f"{stale}{suffix}").unlink(missing_ok=True)
+
+
+def recent_profiles():
+    """Metadata of the stored profiles, newest first."""
+    profiles = []
+    for path in sorted(_directory().glob("*.json"), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # pruned or being replaced meanwhile
+    return profiles
+
+
+def folded_path(profile_id):
+    """Path of a profile's collapsed stacks, or None for a bad id."""
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    path = _directory() / f"{profile_id}.folded"
+    return path if path.is_file() else None
+
+
+# --- middleware -------------------------------------------------------------
+
+def _is_staff(request):
+    user = getattr(request, "user", None)  # session (full profile only)
+    if user is not None and user.is_staff:
+        return True
+    for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authenticator().authenticate(request)
+        except APIException:
+            return False
+        if result is not None:
+            return bool(result[0].is_staff)
+    return False
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.headers.get(PROFILE_HEADER) == "1" and _is_staff(request):
+            return self.profile(request, "header")
+        rate = settings.PROFILE_SAMPLE_RATE
+        if rate and random.random() < rate:
+            return self.profile(request, "sampled")
+        return self.get_response(request)
+
+    def profile(self, request, reason):
+        queries = QueryLog()
+        sampler = Sampler(threading.get_ident(),
+                          settings.PROFILE_INTERVAL_MS / 1000,
+                          ProfilingMiddleware.profile.__code__)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(queries))
+                response = self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        profile_id = save_profile({
+            "started_at": time.time() - duration,
+            "reason": reason,
+            "method": request.method,
+            "path": request.get_full_path()[:500],
+            "route": match.route if match else "",
+            "view": match.view_name if match else "",
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "samples": sum(stacks.values()),
+            "interval_ms": settings.PROFILE_INTERVAL_MS,
+            "queries": queries.summary(),
+        }, stacks)
+        if reason == "header":
+            response["X-Profile-Id"] = profile_id
+        return response
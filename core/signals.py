@@ -0,0 +1,279 @@
+# core/signals.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_save
+)
+from django.dispatch import receiver
+
+from .cache import bump_tags
+from .cms_permissions import (
+    invalidate_all_permissions, invalidate_user_permissions
+)
+from .counters import LINKS, cache_tags, link_key, link_moved, saved_key
+from .neighbors import update_around
+from . import timeline
+from .models import (
+    EventPerson,
+    EventPhoto,
+    HistoricEvent,
+    HistoricInterview,
+    HistoricPerson,
+    HistoricPlace,
+    PersonPlace,
+    Photo,
+    PlacePhoto,
+)
+
+User = get_user_model()
+
+
+# ---------- CMS permission cache ----------
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def cms_membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, User):
+        invalidate_user_permissions([instance.pk])
+    elif pk_set:
+        invalidate_user_permissions(pk_set)
+    else:
+        # Group.user_set.clear(): we no longer know who was in it
+        invalidate_all_permissions()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def cms_group_permissions_changed(sender, action, **kwargs):
+    if action.startswith("post_"):
+        invalidate_all_permissions()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def cms_group_changed(sender, **kwargs):
+    invalidate_all_permissions()
+
+
+@receiver(post_save, sender=User)
+def cms_user_changed(sender, instance, created, update_fields, **kwargs):
+    # Logins only touch last_login; nothing permission-related changed.
+    if not created and update_fields != frozenset({"last_login"}):
+        invalidate_user_permissions([instance.pk])
+
+
+# ---------- Response cache tags (core/cache.py) ----------
+
+def _bump_on_commit(*tags):
+    # Bump after commit so a rebuild can never store pre-commit data under
+    # the new tag version.
+    transaction.on_commit(lambda: bump_tags(*tags))
+
+
+@receiver(post_save, sender=HistoricPlace)
+@receiver(post_delete, sender=HistoricPlace)
+def cache_place_changed(sender, instance, **kwargs):
+    _bump_on_commit("places", f"place:{instance.pk}")
+
+
+@receiver(post_save, sender=HistoricEvent)
+@receiver(post_delete, sender=HistoricEvent)
+def cache_event_changed(sender, instance, **kwargs):
+    _bump_on_commit(f"event:{instance.pk}", f"place:{instance.place_id}")
+
+
+@receiver(post_save, sender=HistoricPerson)
+@receiver(post_delete, sender=HistoricPerson)
+def cache_person_changed(sender, instance, **kwargs):
+    _bump_on_commit(f"person:{instance.pk}")
+
+
+@receiver(post_save, sender=Photo)
+@receiver(post_delete, sender=Photo)
+def cache_photo_changed(sender, instance, **kwargs):
+    _bump_on_commit(f"photo:{instance.pk}")
+
+
+@receiver(post_save, sender=PersonPlace)
+@receiver(post_delete, sender=PersonPlace)
+def cache_person_place_changed(sender, instance, **kwargs):
+    _bump_on_commit(f"place:{instance.place_id}",
+                    f"person:{instance.person_id}")
+
+
+@receiver(post_save, sender=EventPerson)
+@receiver(post_delete, sender=EventPerson)
+def cache_event_person_changed(sender, instance, **kwargs):
+    _bump_on_commit(f"event:{instance.event_id}",
+                    f"person:{instance.person_id}")
+
+
+@receiver(post_save, sender=PlacePhoto)
+@receiver(post_delete, sender=PlacePhoto)
+def cache_place_photo_changed(sender, instance, **kwargs):
+    _bump_on_commit(f"place:{instance.place_id}")
+
+
+@receiver(post_save, sender=EventPhoto)
+@receiver(post_delete, sender=EventPhoto)
+def cache_event_photo_changed(sender, instance, **kwargs):
+    _bump_on_commit(f"event:{instance.event_id}")
+
+
+@receiver(post_save, sender=HistoricInterview)
+@receiver(post_delete, sender=HistoricInterview)
+def cache_interview_changed(sender, instance, **kwargs):
+    _bump_on_commit("interviews", f"interview:{instance.pk}")
+
+
+@receiver(post_save, sender=PersonPlace)
+@receiver(post_delete, sender=PersonPlace)
+@receiver(post_save, sender=EventPerson)
+@receiver(post_delete, sender=EventPerson)
+@receiver(post_save, sender=HistoricEvent)
+@receiver(post_delete, sender=HistoricEvent)
+@receiver(post_delete, sender=HistoricPerson)
+@receiver(post_delete, sender=HistoricPlace)
+def cache_graph_changed(sender, **kwargs):
+    # Relationship graph (core/graph.py): a node or an edge may have
+    # changed. "graph-labels" covers names shown in graph responses.
+    _bump_on_commit("graph", "graph-labels")
+
+
+@receiver(post_save, sender=HistoricPerson)
+@receiver(post_save, sender=HistoricPlace)
+def cache_graph_node_saved(sender, created, **kwargs):
+    if created:
+        _bump_on_commit("graph", "graph-labels")
+    else:
+        _bump_on_commit("graph-labels")
+
+
+def cache_junction_changed(sender, **kwargs):
+    # Junction tables have no modified column; api/conditional.py versions
+    # their list/detail ETags with this per-model tag instead.
+    _bump_on_commit(f"model:{sender._meta.label_lower}")
+
+
+# Connected per model: a receiver without a sender runs on every save and
+# delete of every model in the project (sessions, log entries, ...)
+for _model in (PersonPlace, EventPerson, PlacePhoto, EventPhoto):
+    post_save.connect(cache_junction_changed, sender=_model)
+    post_delete.connect(cache_junction_changed, sender=_model)
+
+
+# ---------- Link counters (core/counters.py) ----------
+
+def _counts_changed(parents):
+    if parents:
+        _bump_on_commit(*cache_tags(parents))
+
+
+def counters_remember_parents(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._saved_link_key = saved_key(sender, instance.pk)
+
+
+def counters_link_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:  # loaddata: run reconcile_counters
+        return
+    old = None if created else getattr(instance, "_saved_link_key", None)
+    new = link_key(sender, instance.__dict__)
+    if not created and old is None:
+        return  # not known before the save; nothing to move from
+    _counts_changed(link_moved(sender, old, new))
+
+
+def counters_link_deleted(sender, instance, **kwargs):
+    old = link_key(sender, instance.__dict__)
+    _counts_changed(link_moved(sender, old, None))
+
+
+for _model in LINKS:
+    pre_save.connect(counters_remember_parents, sender=_model)
+    post_save.connect(counters_link_saved, sender=_model)
+    post_delete.connect(counters_link_deleted, sender=_model)
+
+
+# ---------- Place neighbour table ----------
+
+def _coords(place):
+    return float(place.latitude), float(place.longitude)
+
+
+@receiver(pre_save, sender=HistoricPlace)
+def neighbors_remember_position(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._saved_coords = (
+        HistoricPlace.objects.filter(pk=instance.pk)
+        .values_list("latitude", "longitude").first()
+    )
+
+
+@receiver(post_save, sender=HistoricPlace)
+def neighbors_place_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:  # loaddata: run `manage.py build_place_neighbors` afterwards
+        return
+    new = _coords(instance)
+    old = getattr(instance, "_saved_coords", None)
+    old = (float(old[0]), float(old[1])) if old else None
+    if old == new:
+        return
+    positions = [new] if old is None else [old, new]
+    transaction.on_commit(lambda: update_around(*positions))
+
+
+@receiver(post_delete, sender=HistoricPlace)
+def neighbors_place_deleted(sender, instance, **kwargs):
+    # Its own rows are gone with the CASCADE; refill the lists it was in
+    position = _coords(instance)
+    transaction.on_commit(lambda: update_around(position))
+
+
+# ---------- Timeline histogram buckets (core/timeline.py) ----------
+
+@receiver(pre_save, sender=HistoricEvent)
+@receiver(pre_save, sender=HistoricPlace)
+def timeline_remember_bucket(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if sender is HistoricEvent:
+        row = (HistoricEvent.objects.filter(pk=instance.pk)
+               .values_list("place_id", "significance", "event_date").first())
+        instance._saved_bucket = row and timeline.event_key(*row)
+    else:
+        date_start = (HistoricPlace.objects.filter(pk=instance.pk)
+                      .values_list("date_start", flat=True).first())
+        instance._saved_bucket = timeline.place_key(instance.pk, date_start)
+
+
+def _bucket(instance):
+    if isinstance(instance, HistoricEvent):
+        return timeline.event_key(instance.place_id, instance.significance,
+                                  instance.event_date)
+    return timeline.place_key(instance.pk, instance.date_start)
+
+
+@receiver(post_save, sender=HistoricEvent)
+@receiver(post_save, sender=HistoricPlace)
+def timeline_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:  # loaddata: run `manage.py build_timeline` afterwards
+        return
+    old = None if created else getattr(instance, "_saved_bucket", None)
+    changed = timeline.moved(old, _bucket(instance))
+    # A place that moved changes what a bounding box includes
+    if changed or sender is HistoricPlace:
+        _bump_on_commit(timeline.TIMELINE_TAG)
+
+
+@receiver(post_delete, sender=HistoricEvent)
+@receiver(post_delete, sender=HistoricPlace)
+def timeline_deleted(sender, instance, **kwargs):
+    # A place's own rows go with the CASCADE
+    if sender is HistoricEvent:
+        timeline.moved(_bucket(instance), None)
+    _bump_on_commit(timeline.TIMELINE_TAG)
@@ -0,0 +1,203 @@
+# core/slow_queries.py
+"""
+Slow-query log.
+
+Every database connection gets a ``SlowQueryLog`` execute wrapper when it
+is created (``connection_created``, see core/apps.py), so requests,
+management commands and workers are all covered. A statement that takes
+at least SLOW_QUERY_MS to execute (0 turns the log off) is appended to
+SLOW_QUERY_LOG as one JSON line with
+
+* the SQL and its parameters (truncated), and a normalized template that
+  groups statements differing only in literals or IN-list lengths;
+* its origin: the innermost frame in the project's own code (a view in
+  api/views.py, an admin in core/admin.py, ...), the project frames
+  above it and, inside a request, the name of the resolved view (admin
+  changelists evaluate their querysets in Django's own templates);
+* the plan, for a SELECT: ``EXPLAIN QUERY PLAN`` on SQLite, the backend's
+  own EXPLAIN elsewhere, run right after the statement with the same
+  parameters.
+
+The time measured is that of ``cursor.execute()``; rows fetched later
+(``.iterator()``) are not included. The file is rotated once it reaches
+SLOW_QUERY_LOG_BYTES, keeping SLOW_QUERY_LOG_BACKUPS older files (.1 is
+the newest). ``manage.py slow_queries`` ranks the templates by total time.
+"""
+import json
+import os
+import re
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.db import DatabaseError, transaction
+
+from . import profiling
+
+MAX_SQL_LENGTH = 2000
+MAX_PARAM_LENGTH = 100
+MAX_PARAMS = 50
+MAX_STACK = 8
+EXPLAINABLE = ("SELECT", "WITH")
+# Wrappers around every query or request, never its origin
+SKIP_FILES = {__file__, profiling.__file__}
+
+_LIST_RE = re.compile(r"(?:%s|\?)(?:\s*,\s*(?:%s|\?))+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def template(sql):
+    """``sql`` with literals and parameter lists collapsed."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _LIST_RE.sub("?, ...", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def _short_params(params):
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        params = list(params.values())
+    return [repr(value)[:MAX_PARAM_LENGTH]
+            for value in list(params)[:MAX_PARAMS]]
+
+
+def _origin():
+    """
+    (project frames of the stack, innermost first, as "path:line name";
+    view name of the request being handled, or "").
+    """
+    base = str(settings.BASE_DIR) + os.sep
+    frames, view = [], ""
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename
+        if code is BaseHandler._get_response.__code__:
+            match = getattr(frame.f_locals.get("request"),
+                            "resolver_match", None)
+            view = match.view_name if match else ""
+            break
+        if (len(frames) < MAX_STACK and filename.startswith(base)
+                and filename not in SKIP_FILES
+                and "-packages" + os.sep not in filename):
+            frames.append(f"{filename.removeprefix(base)}:{frame.f_lineno} "
+                          f"{code.co_qualname}")
+        frame = frame.f_back
+    return frames, view
+
+
+class SlowQueryLog:
+    """``execute_wrapper`` recording statements slower than SLOW_QUERY_MS."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.explaining or not settings.SLOW_QUERY_MS:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed = (time.perf_counter() - started) * 1000
+        if elapsed >= settings.SLOW_QUERY_MS:
+            stack, view = _origin()
+            record({
+                "at": time.time(),
+                "db": self.connection.alias,
+                "ms": round(elapsed, 2),
+                "template": template(sql),
+                "sql": sql[:MAX_SQL_LENGTH],
+                "params": None if many else _short_params(params),
+                "many": many,
+                "origin": stack[0] if stack else "",
+                "stack": stack,
+                "view": view,
+                "plan": None if many else self.explain(sql, params),
+            })
+        return result
+
+    def explain(self, sql, params):
+        """The query plan of a SELECT, one line per step; else None."""
+        if not sql.lstrip().upper().startswith(EXPLAINABLE):
+            return None
+        self.explaining = True
+        try:
+            prefix = self.connection.ops.explain_query_prefix()
+            # In a transaction, a savepoint: a failed EXPLAIN must not
+            # break it. In autocommit there is nothing to protect.
+            guard = (transaction.atomic(using=self.connection.alias)
+                     if self.connection.in_atomic_block else nullcontext())
+            with guard:
+                with self.connection.cursor() as cursor:
+                    cursor.execute(f"{prefix} {sql}", params)
+                    return [str(row[-1]) for row in cursor.fetchall()]
+        except DatabaseError as exc:  # incl. NotSupportedError
+            return [f"EXPLAIN failed: {exc}"]
+        finally:
+            self.explaining = False
+
+
+def install(sender, connection, **kwargs):
+    """``connection_created`` receiver; the wrapper outlives reconnects."""
+    if not any(isinstance(wrapper, SlowQueryLog)
+               for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(SlowQueryLog(connection))
+
+
+# --- storage ----------------------------------------------------------------
+
+def log_files():
+    """The log and its backups, newest first, that exist."""
+    path = Path(settings.SLOW_QUERY_LOG)
+    backups = range(1, settings.SLOW_QUERY_LOG_BACKUPS + 1)
+    candidates = [path] + [path.with_name(f"{path.name}.{n}") for n in backups]
+    return [p for p in candidates if p.is_file()]
+
+
+def record(entry):
+    path = Path(settings.SLOW_QUERY_LOG)
+    line = json.dumps(entry, default=str) + "\n"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # One append per line: lines from several workers do not interleave
+        with open(path, "a") as handle:
+            handle.write(line)
+            size = handle.tell()
+        if size >= settings.SLOW_QUERY_LOG_BYTES:
+            _rotate(path)
+    except OSError:
+        pass  # the log must never fail the query it describes
+
+
+def _rotate(path):
+    backups = settings.SLOW_QUERY_LOG_BACKUPS
+    if not backups:
+        path.unlink(missing_ok=True)
+        return
+    for n in range(backups - 1, 0, -1):
+        older = path.with_name(f"{path.name}.{n}")
+        if older.exists():
+            os.replace(older, path.with_name(f"{path.name}.{n + 1}"))
+    os.replace(path, path.with_name(f"{path.name}.1"))
+
+
+def read_entries():
+    """Every logged entry, oldest file first; unreadable lines skipped."""
+    for path in reversed(log_files()):
+        try:
+            with open(path) as handle:
+                for line in handle:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # cut short by a crash or a rotation
+        except OSError:
+            continue
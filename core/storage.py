@@ -0,0 +1,29 @@
+# core/storage.py
+from django.conf import settings
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class FrontendStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    WhiteNoise's hashed + gzip/Brotli storage, extended to HTML pages.
+
+    Absolute ``src``/``href`` references under STATIC_URL inside ``*.html``
+    files are rewritten to their hashed names, so ``index.<hash>.html``
+    points at immutable ``app.<hash>.js`` / ``styles.<hash>.css``.
+    """
+
+    patterns = CompressedManifestStaticFilesStorage.patterns + (
+        (
+            "*.html",
+            (
+                (
+                    rf'(?P<matched>src="(?P<url>{settings.STATIC_URL}[^"]+)")',
+                    'src="%(url)s"',
+                ),
+                (
+                    rf'(?P<matched>href="(?P<url>{settings.STATIC_URL}[^"]+)")',
+                    'href="%(url)s"',
+                ),
+            ),
+        ),
+    )
@@ -0,0 +1,111 @@
+"""
+Synthetic rows for the tests that need realistic table sizes: large enough
+that SQLite's planner prefers an index whenever a usable one exists.
+"""
+import datetime
+
+from django.db import connection
+
+from core.models import (
+    EventPerson,
+    EventPhoto,
+    HistoricEvent,
+    HistoricInterview,
+    HistoricPerson,
+    HistoricPlace,
+    PersonPlace,
+    Photo,
+    PlacePhoto,
+)
+from core.neighbors import rebuild_all as rebuild_neighbors
+from core.timeline import rebuild_all as rebuild_timeline
+
+SIZES = {
+    "places": 2000,
+    "persons": 3000,
+    "events": 6000,
+    "person_places": 9000,
+    "event_persons": 12000,
+    "photos": 1500,
+    "interviews": 400,
+}
+
+
+def seed(rng, sizes=SIZES):
+    """Fill the (empty) test database with synthetic rows."""
+    n = sizes
+    HistoricPlace.objects.bulk_create([
+        HistoricPlace(
+            place_name=f"Place {i}",
+            latitude=round(37.0 + rng.uniform(-0.05, 0.05), 6),
+            longitude=round(-89.18 + rng.uniform(-0.05, 0.05), 6),
+            date_start=str(rng.randrange(1800, 2000)) if i % 3 else None,
+            brief="brief",
+        )
+        for i in range(n["places"])
+    ], batch_size=500)
+    places = list(HistoricPlace.objects.values_list("pk", flat=True))
+
+    HistoricPerson.objects.bulk_create([
+        HistoricPerson(first_name=f"First{i}", last_name=f"Last{i % 700}")
+        for i in range(n["persons"])
+    ], batch_size=500)
+    persons = list(HistoricPerson.objects.values_list("pk", flat=True))
+
+    day0 = datetime.date(1850, 1, 1)
+    HistoricEvent.objects.bulk_create([
+        HistoricEvent(
+            event_name=f"Event {i}",
+            event_date=day0 + datetime.timedelta(days=rng.randrange(60000)),
+            event_description="description",
+            significance=rng.choice(HistoricEvent.Significance.values),
+            place_id=rng.choice(places),
+        )
+        for i in range(n["events"])
+    ], batch_size=500)
+    events = list(HistoricEvent.objects.values_list("pk", flat=True))
+
+    PersonPlace.objects.bulk_create([
+        PersonPlace(
+            person_id=rng.choice(persons),
+            place_id=rng.choice(places),
+            association_date=day0 + datetime.timedelta(
+                days=rng.randrange(60000)),
+        )
+        for _ in range(n["person_places"])
+    ], batch_size=500, ignore_conflicts=True)
+    EventPerson.objects.bulk_create([
+        EventPerson(event_id=rng.choice(events), person_id=rng.choice(persons))
+        for _ in range(n["event_persons"])
+    ], batch_size=500, ignore_conflicts=True)
+
+    Photo.objects.bulk_create([
+        Photo(image=f"photos/2020/01/p{i}.jpg", file_name=f"p{i}.jpg",
+              file_size=1000)
+        for i in range(n["photos"])
+    ], batch_size=500)
+    photos = list(Photo.objects.values_list("pk", flat=True))
+    PlacePhoto.objects.bulk_create([
+        PlacePhoto(place_id=place, photo_id=photos[i % len(photos)],
+                   photo_order=1)
+        for i, place in enumerate(places[: len(photos)])
+    ], batch_size=500)
+    EventPhoto.objects.bulk_create([
+        EventPhoto(event_id=event, photo_id=photos[i % len(photos)],
+                   photo_order=1)
+        for i, event in enumerate(events[: len(photos)])
+    ], batch_size=500)
+
+    HistoricInterview.objects.bulk_create([
+        HistoricInterview(
+            interviewee_name=f"Interviewee {i}",
+            interview_date=day0 + datetime.timedelta(days=rng.randrange(60000)),
+            youtube_url=f"https://youtu.be/abcdefghi{i % 100:02d}",
+        )
+        for i in range(n["interviews"])
+    ], batch_size=500)
+
+    rebuild_neighbors()
+    rebuild_timeline()
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
@@ -0,0 +1,96 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.admin import EstimatedCountPaginator
+from core.models import (
+    EventPerson,
+    EventPhoto,
+    HistoricEvent,
+    HistoricInterview,
+    HistoricPerson,
+    HistoricPlace,
+    PersonPlace,
+    Photo,
+    PlacePhoto,
+)
+from .utils import NO_CACHE, PLAIN_STATIC_STORAGES
+
+CHANGELISTS = (
+    "historicevent",
+    "historicplace",
+    "historicperson",
+    "personplace",
+    "eventperson",
+    "placephoto",
+    "eventphoto",
+    "photo",
+    "historicinterview",
+)
+
+
+@override_settings(CACHES=NO_CACHE, STORAGES=PLAIN_STATIC_STORAGES)
+class ChangelistQueryCountTests(TestCase):
+    """
+    Changelist pages run a fixed number of queries, however many rows they
+    show: relations shown in list_display are loaded in bulk.
+    """
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser(
+            "admin", "admin@example.com", "password"))
+        self.seeded = 0
+
+    def seed(self, total):
+        for i in range(self.seeded, total):
+            place = HistoricPlace.objects.create(
+                place_name=f"Place {i}", latitude=37, longitude=-89)
+            person = HistoricPerson.objects.create(
+                first_name=f"First {i}", last_name=f"Last {i}")
+            event = HistoricEvent.objects.create(
+                event_name=f"Event {i}", event_date=datetime.date(1900, 1, 1),
+                event_description="description", place=place)
+            PersonPlace.objects.create(person=person, place=place)
+            EventPerson.objects.create(event=event, person=person)
+            photo = Photo.objects.create(image=f"photos/{i}.jpg")
+            PlacePhoto.objects.create(place=place, photo=photo, photo_order=1)
+            EventPhoto.objects.create(event=event, photo=photo, photo_order=1)
+            HistoricInterview.objects.create(
+                interviewee_name=f"Interviewee {i}",
+                interview_date=datetime.date(2000, 1, 1),
+                youtube_url="https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        self.seeded = total
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelists(self):
+        self.seed(5)
+        counts = {
+            name: self.count_queries(reverse(f"admin:core_{name}_changelist"))
+            for name in CHANGELISTS
+        }
+        self.seed(30)
+        for name in CHANGELISTS:
+            with self.subTest(changelist=name):
+                with self.assertNumQueries(counts[name]):
+                    self.client.get(reverse(f"admin:core_{name}_changelist"))
+
+
+class EstimatedCountTests(TestCase):
+    def test_analyze_db_provides_row_estimates(self):
+        for i in range(3):
+            HistoricPerson.objects.create(first_name=f"First {i}",
+                                          last_name="Last")
+        queryset = HistoricPerson.objects.all()
+        call_command("analyze_db", stdout=StringIO())
+        self.assertEqual(EstimatedCountPaginator._estimate(queryset), 3)
@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import (
+    CachedJWTAuthentication,
+    ClaimsTokenObtainPairSerializer,
+    token_cache,
+)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = User.objects.create_user("editor", is_staff=True)
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return CachedJWTAuthentication().authenticate(request)
+
+    def test_claims_token_needs_no_query(self):
+        token = ClaimsTokenObtainPairSerializer.get_token(
+            self.user).access_token
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(token)
+        self.assertIsInstance(user, TokenUser)
+        self.assertTrue(user.is_staff)
+
+    def test_each_request_gets_its_own_user_and_token(self):
+        token = AccessToken.for_user(self.user)
+        first_user, first_token = self.authenticate(token)
+        with self.assertNumQueries(0):
+            second_user, second_token = self.authenticate(token)
+        self.assertEqual(second_user, self.user)
+        self.assertIsNot(first_user, second_user)
+        self.assertIsNot(first_token.payload, second_token.payload)
+        first_user.username = "changed"
+        self.assertEqual(self.authenticate(token)[0].username, "editor")
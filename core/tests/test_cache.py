@@ -0,0 +1,56 @@
+import tempfile
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from core.cache import acquire_lock, release_lock
+from core.cms_permissions import invalidate_all_permissions, user_key
+
+
+class LockTestCase(SimpleTestCase):
+    backend = "django.core.cache.backends.filebased.FileBasedCache"
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings = override_settings(CACHES={"default": {
+            "BACKEND": self.backend, "LOCATION": cache_dir.name,
+        }})
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_lock_is_exclusive_until_released(self):
+        token = acquire_lock("resp:x:lock")
+        self.assertIsNotNone(token)
+        self.assertIsNone(acquire_lock("resp:x:lock"))
+        self.assertIsNotNone(acquire_lock("resp:y:lock"))
+        release_lock("resp:x:lock", token)
+        self.assertIsNotNone(acquire_lock("resp:x:lock"))
+
+    def test_one_of_many_concurrent_takers_wins(self):
+        start = threading.Barrier(8)
+        tokens = []
+
+        def take():
+            start.wait()
+            tokens.append(acquire_lock("resp:z:lock"))
+
+        threads = [threading.Thread(target=take) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        won = [t for t in tokens if t is not None]
+        self.assertEqual(len(won), 1)
+        release_lock("resp:z:lock", won[0])
+
+    def test_permission_generation_changes_on_every_invalidation(self):
+        keys = {user_key("editor", 1)}
+        for _ in range(3):
+            invalidate_all_permissions()
+            keys.add(user_key("editor", 1))
+        self.assertEqual(len(keys), 4)
+
+
+class LocmemLockTests(LockTestCase):
+    backend = "django.core.cache.backends.locmem.LocMemCache"
@@ -0,0 +1,115 @@
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from core.media import HASHED_NAME_RE
+from core.models import Photo, PhotoUpload
+from .utils import NO_CACHE
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=3600"
+
+
+class MediaTestCase(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        settings = override_settings(
+            CACHES=NO_CACHE,
+            MEDIA_ROOT=media.name,
+            MEDIA_ACCEL_MODE="",
+            MEDIA_CACHE_CONTROL=IMMUTABLE,
+            MEDIA_CACHE_CONTROL_UNHASHED=REVALIDATE,
+            PHOTO_UPLOAD_TEMP_DIR=os.path.join(media.name, "partial"),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def store(self, name, data=b"0123456789"):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as fh:
+            fh.write(data)
+        return path
+
+
+class ContentNameTests(MediaTestCase):
+    def save(self, data):
+        photo = Photo(image=SimpleUploadedFile("scan.PNG", data))
+        photo.save()
+        return photo.image.name
+
+    def test_name_follows_content(self):
+        first, same, other = self.save(b"a"), self.save(b"a"), self.save(b"b")
+        self.assertRegex(first, r"^photos/\d{4}/\d{2}/scan-[0-9a-f]{16}\.png$")
+        self.assertNotEqual(first, other)
+        # Same bytes, same digest: the storage only adds a suffix
+        self.assertTrue(same.startswith(first[:-len(".png")]))
+
+    def test_chunked_upload_name_is_chained_digest(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("editor"))
+        names = []
+        for data in (b"12345abcde", b"12345ABCDE"):
+            response = client.post(
+                "/api/v1/uploads/", {"file_name": "scan.png"}, format="json",
+                HTTP_UPLOAD_LENGTH=str(len(data)))
+            upload = PhotoUpload.objects.get(pk=response.data["id"])
+            for offset in (0, 5):
+                response = client.generic(
+                    "PATCH", f"/api/v1/uploads/{upload.pk}/",
+                    data[offset:offset + 5],
+                    content_type="application/offset+octet-stream",
+                    HTTP_UPLOAD_OFFSET=str(offset))
+            self.assertEqual(response.status_code, 201)
+            upload.refresh_from_db()
+            names.append(upload.photo.image.name)
+            self.assertRegex(names[-1], HASHED_NAME_RE)
+        self.assertNotEqual(*names)
+
+
+class ServeMediaTests(MediaTestCase):
+    def test_hashed_name_is_immutable(self):
+        self.store("photos/2026/01/scan-0123456789abcdef.png")
+        response = self.client.get(
+            "/media/photos/2026/01/scan-0123456789abcdef.png")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], IMMUTABLE)
+
+    def test_legacy_name_is_revalidated(self):
+        self.store("photos/2020/01/scan.png")
+        response = self.client.get("/media/photos/2020/01/scan.png")
+        self.assertEqual(response["Cache-Control"], REVALIDATE)
+
+    def range_with_if_range(self, if_range):
+        return self.client.get(
+            "/media/photos/2020/01/scan.png",
+            HTTP_RANGE="bytes=2-4", HTTP_IF_RANGE=if_range)
+
+    def test_if_range_with_strong_etag(self):
+        self.store("photos/2020/01/scan.png")
+        etag = self.client.get("/media/photos/2020/01/scan.png")["ETag"]
+        response = self.range_with_if_range(etag)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"234")
+
+    def test_if_range_with_weak_etag_sends_whole_file(self):
+        self.store("photos/2020/01/scan.png")
+        etag = self.client.get("/media/photos/2020/01/scan.png")["ETag"]
+        response = self.range_with_if_range("W/" + etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_range_date_must_match_exactly(self):
+        path = self.store("photos/2020/01/scan.png")
+        mtime = int(os.stat(path).st_mtime)
+        self.assertEqual(
+            self.range_with_if_range(http_date(mtime)).status_code, 206)
+        self.assertEqual(
+            self.range_with_if_range(http_date(mtime + 60)).status_code, 200)
+
@@ -0,0 +1,46 @@
+import io
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from core import photometa
+from core.models import Photo
+from .utils import NO_CACHE
+
+
+def png(width=40, height=30):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(buffer, "PNG")
+    return SimpleUploadedFile("scan.png", buffer.getvalue())
+
+
+class PhotoMetadataTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(CACHES=NO_CACHE, MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_uploaded_file_is_read_after_commit(self):
+        upload = png()
+        with mock.patch.object(photometa._reader, "submit") as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                photo = Photo.objects.create(image=upload)
+                self.assertIsNone(photo.width)  # not decoded in the request
+        submit.assert_called_once_with(photometa._read_stored, photo.pk)
+        self.assertEqual(photo.file_size, upload.size)
+        self.assertIsNone(photo.metadata_read_at)
+
+    def test_backfill_reads_uninspected_photos(self):
+        photo = Photo.objects.create(image=png(40, 30))
+        call_command("backfill_photo_metadata", "--workers", "1",
+                     stdout=io.StringIO())
+        photo.refresh_from_db()
+        self.assertEqual((photo.width, photo.height), (40, 30))
+        self.assertEqual(photo.mime_type, "image/png")
+        self.assertIsNotNone(photo.metadata_read_at)
@@ -0,0 +1,135 @@
+import random
+import re
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import (
+    EventPerson,
+    HistoricInterview,
+    HistoricPlace,
+    Photo,
+    PersonPlace,
+)
+from .synthetic import seed
+from .utils import NO_CACHE
+
+# "SCAN t", "SCAN t USING INDEX i" and "SCAN t USING COVERING INDEX i" all
+# read every row of t; only "SEARCH" is an index lookup.
+FULL_SCAN_RE = re.compile(r"^SCAN (\w+)\b")
+TEMP_BTREE = "USE TEMP B-TREE"
+
+
+def probes(rng):
+    """
+    (name, url, tables allowed to be fully scanned). Only endpoints that
+    return a whole collection may scan its table.
+    """
+    place = rng.choice(list(HistoricPlace.objects.values_list("pk", flat=True)))
+    person = (PersonPlace.objects.values_list("person_id", flat=True)
+              .order_by("?").first())
+    event = (EventPerson.objects.values_list("event_id", flat=True)
+             .order_by("?").first())
+    interview = HistoricInterview.objects.values_list("pk", flat=True).first()
+    photo = Photo.objects.values_list("pk", flat=True).first()
+    graph = {"core_historicplace", "core_historicperson", "core_historicevent",
+             "core_personplace", "core_eventperson"}
+
+    yield "places.geojson", reverse("places-geojson"), {"core_historicplace"}
+    yield "place details", reverse("place-details", args=[place]), set()
+    yield "event details", reverse("event-details", args=[event]), set()
+    yield "person details", reverse("person-details", args=[person]), set()
+    yield ("interviews feed", reverse("interviews-feed"),
+           {"core_historicinterview"})
+    yield "nearby", reverse("place-nearby", args=[place]), set()
+    # The graph is built from full reads of every table it covers
+    yield ("graph", reverse("graph-neighborhood", args=["person", person])
+           + "?depth=2", graph)
+    timeline = reverse("timeline-histogram")
+    yield "timeline", f"{timeline}?granularity=decade", set()
+    yield ("timeline filtered",
+           f"{timeline}?significance=NATIONAL&bbox=-90,36,-89,38", set())
+
+    # A list page counts its table (pagination, ETag) and walks it in
+    # order, so it may scan that table, but must not sort it.
+    details = {
+        "place": ("core_historicplace", place),
+        "person": ("core_historicperson", person),
+        "event": ("core_historicevent", event),
+        "interview": ("core_historicinterview", interview),
+        "photo": ("core_photo", photo),
+    }
+    for basename, (table, pk) in details.items():
+        yield f"{basename} list", reverse(f"{basename}-list"), {table}
+        yield (f"{basename} retrieve",
+               reverse(f"{basename}-detail", args=[pk]), set())
+    junctions = {
+        "person-place": "core_personplace",
+        "event-person": "core_eventperson",
+        "event-photo": "core_eventphoto",
+        "place-photo": "core_placephoto",
+    }
+    for basename, table in junctions.items():
+        yield f"{basename} list", reverse(f"{basename}-list"), {table}
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(details, allow_scan):
+    """
+    Offending lines of a query plan: full scans of tables not in
+    ``allow_scan``, and temp B-tree sorts.
+
+    A sort is accepted in one case only: a join in which every table is
+    reached by an index SEARCH, e.g. the people of one event ordered by
+    name. The sort key lives on a different table than the lookup key, so
+    no index can produce that order, and the rows sorted are bounded by
+    the lookup. A single-table query can always be ordered by an index.
+    """
+    steps = [d for d in details if d.startswith(("SCAN ", "SEARCH "))]
+    bounded_join = (len(steps) > 1
+                    and all(d.startswith("SEARCH ") for d in steps))
+    problems = []
+    for detail in details:
+        match = FULL_SCAN_RE.match(detail)
+        if match and match.group(1) not in allow_scan:
+            problems.append(detail)
+        elif detail.startswith(TEMP_BTREE) and not bounded_join:
+            problems.append(detail)
+    return problems
+
+
+# No slow-query log: its EXPLAINs would show in the captured queries, and
+# synthetic data does not belong in it
+@override_settings(CACHES=NO_CACHE, SLOW_QUERY_MS=0)
+class QueryPlanTests(TestCase):
+    """
+    Every public endpoint and viewset, on synthetic data, runs only
+    SELECTs whose plans use indexes: no unexpected full table scans, no
+    temp B-tree sorts.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(random.Random(0))
+
+    def test_endpoints_use_indexes(self):
+        for name, url, allow_scan in probes(random.Random(0)):
+            with self.subTest(endpoint=name):
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200, url)
+                for query in ctx.captured_queries:
+                    sql = query["sql"]  # parameters are inlined already
+                    if not sql.lstrip().upper().startswith("SELECT"):
+                        continue
+                    details = explain(sql)
+                    self.assertEqual(
+                        plan_problems(details, allow_scan), [],
+                        f"{url}\n{sql}\n" + "\n".join(details))
@@ -0,0 +1,56 @@
+import datetime
+
+from django.contrib.admin.models import LogEntry
+from django.contrib.sessions.models import Session
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.test import TestCase, override_settings
+
+from core.models import (
+    EventPerson,
+    HistoricEvent,
+    HistoricPerson,
+    HistoricPlace,
+)
+from .utils import NO_CACHE
+
+
+class ReceiverTests(TestCase):
+    def test_no_receivers_for_unrelated_models(self):
+        signals = {"pre_save": pre_save, "post_save": post_save,
+                   "post_delete": post_delete}
+        for model in (Session, LogEntry):
+            for name, signal in signals.items():
+                with self.subTest(model=model.__name__, signal=name):
+                    self.assertFalse(signal.has_listeners(model))
+
+
+@override_settings(CACHES=NO_CACHE)
+class LinkCounterTests(TestCase):
+    def setUp(self):
+        self.place = HistoricPlace.objects.create(
+            place_name="Place", latitude=37, longitude=-89)
+        self.event = HistoricEvent.objects.create(
+            event_name="Event", event_date=datetime.date(1900, 1, 1),
+            event_description="description", place=self.place)
+        self.people = [
+            HistoricPerson.objects.create(first_name="A", last_name="B"),
+            HistoricPerson.objects.create(first_name="C", last_name="D"),
+        ]
+
+    def counts(self):
+        self.event.refresh_from_db()
+        return [self.event.person_count] + [
+            HistoricPerson.objects.get(pk=p.pk).event_count
+            for p in self.people]
+
+    def test_link_rows_move_counters(self):
+        self.place.refresh_from_db()
+        self.assertEqual(self.place.event_count, 1)
+        link = EventPerson.objects.create(event=self.event,
+                                          person=self.people[0])
+        self.assertEqual(self.counts(), [1, 1, 0])
+        link.person = self.people[1]
+        link.save()
+        self.assertEqual(self.counts(), [1, 0, 1])
+        link.delete()
+        self.assertEqual(self.counts(), [0, 0, 0])
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.models import HistoricPlace
+from core.slow_queries import log_files, read_entries, record, template
+from .utils import NO_CACHE
+
+
+class SlowQueryTestCase(TestCase):
+    def setUp(self):
+        logs = tempfile.TemporaryDirectory()
+        self.addCleanup(logs.cleanup)
+        self.log = os.path.join(logs.name, "slow.jsonl")
+        settings = override_settings(
+            CACHES=NO_CACHE,
+            SLOW_QUERY_MS=0.001,
+            SLOW_QUERY_LOG=self.log,
+            SLOW_QUERY_LOG_BYTES=1024 * 1024,
+            SLOW_QUERY_LOG_BACKUPS=2,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def entries(self):
+        return [e for e in read_entries() if "core_historicplace" in e["sql"]]
+
+
+class SlowQueryLogTests(SlowQueryTestCase):
+    def test_query_is_logged_with_origin_and_plan(self):
+        list(HistoricPlace.objects.filter(place_name="Cairo"))
+        with open(self.log) as handle:
+            lines = [json.loads(line) for line in handle]
+        entry = [e for e in lines if "core_historicplace" in e["sql"]][-1]
+        self.assertGreater(entry["ms"], 0)
+        self.assertIn("'Cairo'", entry["params"])
+        self.assertIn("= ?", entry["template"])
+        self.assertTrue(entry["origin"].startswith(
+            "core/tests/test_slow_queries.py:"))
+        self.assertIn("test_query_is_logged_with_origin_and_plan",
+                      entry["origin"])
+        self.assertTrue(entry["plan"])
+        self.assertTrue(all(isinstance(step, str) for step in entry["plan"]))
+
+    def test_request_records_view_name(self):
+        self.client.get("/api/v1/places/")
+        self.assertIn("place-list", {e["view"] for e in self.entries()})
+
+    def test_log_is_rotated(self):
+        with override_settings(SLOW_QUERY_LOG_BYTES=1):
+            for _ in range(4):
+                HistoricPlace.objects.count()
+        self.assertEqual([p.name for p in log_files()],
+                         ["slow.jsonl.1", "slow.jsonl.2"])
+
+    def test_off_when_threshold_is_zero(self):
+        with override_settings(SLOW_QUERY_MS=0):
+            HistoricPlace.objects.count()
+        self.assertEqual(self.entries(), [])
+
+
+class TemplateTests(SimpleTestCase):
+    def test_literals_and_lists_are_collapsed(self):
+        self.assertEqual(
+            template("SELECT * FROM t  WHERE a = 'x''y' AND b IN (1, 2, 3)\n"
+                     "AND c = %s AND d IN (%s, %s) LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (?, ...) "
+            "AND c = ? AND d IN (?, ...) LIMIT ?",
+        )
+
+    def test_identifiers_keep_their_digits(self):
+        self.assertEqual(template('SELECT "t1"."col2" FROM t1'),
+                         'SELECT "t1"."col2" FROM t1')
+
+
+class SlowQueriesCommandTests(SlowQueryTestCase):
+    def log_entry(self, sql, ms, origin):
+        record({"at": 0, "ms": ms, "template": template(sql), "sql": sql,
+                "origin": origin, "view": "", "plan": ["SCAN t"]})
+
+    def test_templates_are_ranked_by_total_time(self):
+        self.log_entry("SELECT * FROM a WHERE id = 1", 30, "api/views.py:1 f")
+        self.log_entry("SELECT * FROM a WHERE id = 2", 30, "api/views.py:1 f")
+        self.log_entry("SELECT * FROM b", 50, "core/admin.py:9 g")
+        out = StringIO()
+        call_command("slow_queries", "--no-plans", stdout=out)
+        output = out.getvalue()
+        self.assertIn("3 slow queries, 2 templates", output)
+        self.assertLess(output.index("SELECT * FROM a WHERE id = ?"),
+                        output.index("SELECT * FROM b"))
+        self.assertIn("60.0 ms total, 2 run(s)", output)
+        self.assertIn("from api/views.py:1 f (2x)", output)
+        self.assertNotIn("SCAN t", output)
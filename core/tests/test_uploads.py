@@ -0,0 +1,103 @@
+import datetime
+import fcntl
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import PhotoUpload
+from .utils import NO_CACHE
+
+OFFSET_CONTENT_TYPE = "application/offset+octet-stream"
+
+
+class UploadTestCase(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(
+            CACHES=NO_CACHE,
+            MEDIA_ROOT=media.name,
+            PHOTO_UPLOAD_TEMP_DIR=os.path.join(media.name, "partial"),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("editor"))
+
+    def start(self, length=10):
+        response = self.client.post(
+            "/api/v1/uploads/", {"file_name": "scan.png"}, format="json",
+            HTTP_UPLOAD_LENGTH=str(length))
+        self.assertEqual(response.status_code, 201)
+        return PhotoUpload.objects.get(pk=response.data["id"])
+
+    def patch(self, upload, offset, body):
+        return self.client.generic(
+            "PATCH", f"/api/v1/uploads/{upload.pk}/", body,
+            content_type=OFFSET_CONTENT_TYPE, HTTP_UPLOAD_OFFSET=str(offset))
+
+
+class PatchTests(UploadTestCase):
+    def test_chunk_moves_offset_and_expiry(self):
+        upload = self.start()
+        response = self.patch(upload, 0, b"12345")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response["Upload-Offset"], "5")
+        self.assertIn("Upload-Expires", response)
+
+    def test_concurrent_writer_gets_conflict(self):
+        upload = self.start()
+        with open(upload.partial_path, "r+b") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            response = self.patch(upload, 0, b"12345")
+        self.assertEqual(response.status_code, 409)
+        upload.refresh_from_db()
+        self.assertEqual(upload.offset, 0)
+
+
+class ExpireUploadsTests(UploadTestCase):
+    def age(self, upload, hours):
+        PhotoUpload.objects.filter(pk=upload.pk).update(
+            modified_at=timezone.now() - datetime.timedelta(hours=hours))
+
+    def expire(self, *args):
+        call_command("expire_uploads", *args, stdout=StringIO())
+
+    def test_abandoned_upload_and_file_are_deleted(self):
+        stale, fresh = self.start(), self.start()
+        self.age(stale, 25)
+        self.age(fresh, 1)
+        self.expire()
+        self.assertFalse(PhotoUpload.objects.filter(pk=stale.pk).exists())
+        self.assertFalse(os.path.exists(stale.partial_path))
+        self.assertTrue(PhotoUpload.objects.filter(pk=fresh.pk).exists())
+        self.assertTrue(os.path.exists(fresh.partial_path))
+
+    def test_dry_run_deletes_nothing(self):
+        upload = self.start()
+        self.age(upload, 25)
+        self.expire("--dry-run")
+        self.assertTrue(PhotoUpload.objects.filter(pk=upload.pk).exists())
+        self.assertTrue(os.path.exists(upload.partial_path))
+
+    def test_file_being_written_is_kept(self):
+        upload = self.start()
+        self.age(upload, 25)
+        with open(upload.partial_path, "r+b") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            self.expire()
+        self.assertTrue(PhotoUpload.objects.filter(pk=upload.pk).exists())
+
+    def test_orphaned_partial_file_is_deleted(self):
+        upload = self.start()
+        PhotoUpload.objects.filter(pk=upload.pk).delete()
+        old = timezone.now().timestamp() - 25 * 3600
+        os.utime(upload.partial_path, (old, old))
+        self.expire()
+        self.assertFalse(os.path.exists(upload.partial_path))
@@ -0,0 +1,39 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from core.views import _load_index
+from .utils import NO_CACHE, PLAIN_STATIC_STORAGES
+
+ETAG = '"index.0123456789ab.html"'
+VARIANTS = {None: b"plain", "gzip": b"gzipped", "br": b"brotli"}
+
+
+@override_settings(CACHES=NO_CACHE)
+class FrontendIndexTests(TestCase):
+    def get(self, accept_encoding):
+        with mock.patch("core.views._load_index",
+                        return_value=(ETAG, VARIANTS)):
+            return self.client.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+
+    def test_negotiates_precompressed_variant(self):
+        for accept, encoding, body in (
+            ("gzip, deflate, br", "br", b"brotli"),
+            ("br;q=0, gzip", "gzip", b"gzipped"),
+            ("gzip;q=0", None, b"plain"),
+            ("x-gzip-like", None, b"plain"),
+        ):
+            with self.subTest(accept_encoding=accept):
+                response = self.get(accept)
+                self.assertEqual(response.get("Content-Encoding"), encoding)
+                self.assertEqual(response.content, body)
+                self.assertEqual(response["ETag"], ETAG)
+
+    @override_settings(STORAGES=PLAIN_STATIC_STORAGES)
+    def test_without_manifest_serves_plain_index(self):
+        _load_index.cache_clear()
+        self.addCleanup(_load_index.cache_clear)
+        response = self.client.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertIn(b"<html", response.content.lower())
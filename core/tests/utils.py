@@ -0,0 +1,15 @@
+"""Settings shared by the test modules."""
+from django.conf import settings
+
+NO_CACHE = {"default": {
+    "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+}}
+
+# The manifest storage needs a collectstatic run to render any page that
+# links static files (the admin); tests use the plain storage instead
+PLAIN_STATIC_STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
@@ -0,0 +1,142 @@
+# core/timeline.py
+"""
+Year/decade histogram of events and places (core.models.TimelineBucket).
+
+The table holds one row per (kind, place, significance, year) with the
+number of events, or of places starting (``date_start``), in it. It stays
+small (at most one row per place and year it has events in) and is summed
+per year or decade through the (kind, year)/(kind, decade) indexes, so the
+histogram never reads HistoricEvent or parses place dates.
+
+Saves and deletes move single counts (``event_changed``/``place_changed``,
+called from core.signals); ``rebuild_all`` recomputes the table, e.g.
+after loaddata.
+"""
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractYear
+
+from .models import HistoricEvent, HistoricPlace, TimelineBucket
+
+TIMELINE_TAG = "timeline"  # response cache tag (core/cache.py)
+GRANULARITIES = ("year", "decade")
+# Leading year of a partial date (core.validators): "1894", "c. 1894-05"
+PARTIAL_YEAR_RE = re.compile(r"^\s*(?:ca?\.?\s+)?(\d{4})\b", re.IGNORECASE)
+
+EVENT, PLACE = TimelineBucket.Kind.EVENT, TimelineBucket.Kind.PLACE
+EVENT_DATE = HistoricEvent._meta.get_field("event_date")
+
+
+def decade_of(year):
+    return year - year % 10
+
+
+def partial_year(value):
+    match = PARTIAL_YEAR_RE.match(value or "")
+    return int(match.group(1)) if match else None
+
+
+def event_key(place_id, significance, event_date):
+    """The bucket an event counts in; None for an unsaved date."""
+    if place_id is None or event_date is None:
+        return None
+    # A date assigned as a string is still a string after save()
+    year = EVENT_DATE.to_python(event_date).year
+    return EVENT, place_id, significance or "", year
+
+
+def place_key(place_id, date_start):
+    year = partial_year(date_start)
+    if year is None:
+        return None
+    return PLACE, place_id, "", year
+
+
+def _add(key, delta):
+    kind, place_id, significance, year = key
+    rows = TimelineBucket.objects.filter(
+        kind=kind, place_id=place_id, significance=significance, year=year
+    )
+    if delta < 0:
+        rows.update(count=F("count") + delta)
+        rows.filter(count__lte=0).delete()
+        return
+    if rows.update(count=F("count") + delta):
+        return
+    try:
+        with transaction.atomic():
+            TimelineBucket.objects.create(
+                kind=kind, place_id=place_id, significance=significance,
+                year=year, decade=decade_of(year), count=delta,
+            )
+    except IntegrityError:  # created concurrently
+        rows.update(count=F("count") + delta)
+
+
+def moved(old_key, new_key):
+    """
+    Move one count from bucket ``old_key`` to ``new_key`` (None for
+    created/deleted). Returns whether the table changed.
+    """
+    if old_key == new_key:
+        return False
+    if old_key is not None:
+        _add(old_key, -1)
+    if new_key is not None:
+        _add(new_key, 1)
+    return True
+
+
+def rebuild_all():
+    """Recompute the whole table. Returns the number of rows written."""
+    rows = [
+        TimelineBucket(kind=EVENT, place_id=place_id,
+                       significance=significance, year=year,
+                       decade=decade_of(year), count=n)
+        for place_id, significance, year, n in (
+            HistoricEvent.objects.order_by()
+            .annotate(year=ExtractYear("event_date"))
+            .values("place_id", "significance", "year")
+            .annotate(n=Count("pk"))
+            .values_list("place_id", "significance", "year", "n")
+        )
+    ]
+    for place_id, date_start in HistoricPlace.objects.order_by().values_list(
+            "pk", "date_start").iterator():
+        year = partial_year(date_start)
+        if year is not None:
+            rows.append(TimelineBucket(kind=PLACE, place_id=place_id, year=year,
+                                       decade=decade_of(year), count=1))
+    with transaction.atomic():
+        TimelineBucket.objects.all().delete()
+        TimelineBucket.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def histogram(granularity, significance=(), bbox=None):
+    """
+    [{"start": year, "events": n, "places": n}] for every year or decade
+    with anything in it, oldest first. ``significance`` limits the events
+    (places have none); ``bbox`` is (min_lon, min_lat, max_lon, max_lat).
+    """
+    rows = TimelineBucket.objects.all()
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        rows = rows.filter(place__latitude__range=(min_lat, max_lat),
+                           place__longitude__range=(min_lon, max_lon))
+    events = rows.filter(kind=EVENT)
+    if significance:
+        events = events.filter(significance__in=significance)
+
+    buckets = {}
+    for kind, queryset in (("events", events),
+                           ("places", rows.filter(kind=PLACE))):
+        sums = (queryset.order_by(granularity).values_list(granularity)
+                .annotate(n=Sum("count")))
+        for start, n in sums:
+            bucket = buckets.setdefault(
+                start, {"start": start, "events": 0, "places": 0})
+            bucket[kind] = n
+    return [buckets[start] for start in sorted(buckets)]
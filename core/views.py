@@ -1,3 +1,84 @@
-from django.shortcuts import render
+import functools
 
-# Create your views here.
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+from .compression import negotiate
+
+INDEX_NAME = "index.html"
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_index():
+    """
+    Read the hashed index page and its precompressed siblings once per
+    process. Returns None when collectstatic has not produced them
+    (e.g. local DEBUG runs without a manifest).
+    """
+    if not hasattr(staticfiles_storage, "stored_name"):
+        return None  # not a manifest storage
+    try:
+        name = staticfiles_storage.stored_name(INDEX_NAME)
+    except ValueError:
+        return None
+    if name == INDEX_NAME or not staticfiles_storage.exists(name):
+        return None
+
+    variants = {}
+    for encoding, suffix in ENCODINGS:
+        if staticfiles_storage.exists(name + suffix):
+            with staticfiles_storage.open(name + suffix) as fh:
+                variants[encoding] = fh.read()
+    with staticfiles_storage.open(name) as fh:
+        variants[None] = fh.read()
+    return f'"{name}"', variants
+
+
+def _unhashed_index():
+    """
+    The plain index page, read on every request, for runs without a
+    manifest: from the frontend sources, else from STATIC_ROOT.
+    """
+    path = finders.find(INDEX_NAME)
+    if path is None and staticfiles_storage.exists(INDEX_NAME):
+        path = staticfiles_storage.path(INDEX_NAME)
+    if path is None:
+        raise Http404("No frontend index page.")
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+def frontend_index(request):
+    """
+    Serve the hashed index page at the site root.
+
+    The page itself is revalidated on every visit (``no-cache`` + ETag, so
+    repeat visits are a 304), while every asset it references is hashed and
+    cached forever by WhiteNoise.
+    """
+    index = _load_index()
+    if index is None:
+        response = HttpResponse(_unhashed_index(),
+                                content_type="text/html; charset=utf-8")
+        response["Cache-Control"] = "no-cache"
+        return response
+    etag, variants = index
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        encoding = negotiate(
+            request.headers.get("Accept-Encoding"),
+            available=[enc for enc, _ in ENCODINGS if enc in variants],
+        )
+        response = HttpResponse(
+            variants[encoding], content_type="text/html; charset=utf-8"
+        )
+        if encoding:
+            response["Content-Encoding"] = encoding
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
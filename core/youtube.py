@@ -0,0 +1,76 @@
+# core/youtube.py
+"""
+YouTube helpers for HistoricInterview.
+
+Video IDs are parsed once on save (``parse_video_id``); thumbnails and
+embeds are derived from the ID. Titles come from YouTube's oEmbed endpoint,
+fetched out of band by ``manage.py fetch_interview_metadata`` through the
+provider named in settings.YOUTUBE_OEMBED_PROVIDER, so that it can be
+swapped for a stub offline.
+"""
+import json
+import re
+from urllib.error import URLError
+from urllib.parse import parse_qs, urlencode, urlsplit
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+YOUTUBE_HOSTS = {
+    "youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com",
+    "youtube-nocookie.com", "www.youtube-nocookie.com",
+}
+PATH_PREFIXES = ("embed", "shorts", "live", "v")
+OEMBED_URL = "https://www.youtube.com/oembed"
+
+
+class OEmbedError(Exception):
+    pass
+
+
+def parse_video_id(url):
+    """The 11-character video ID of a YouTube URL, or "" if there is none."""
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return ""
+    host = (parts.hostname or "").lower()
+    segments = [s for s in parts.path.split("/") if s]
+    candidate = ""
+    if host == "youtu.be":
+        candidate = segments[0] if segments else ""
+    elif host in YOUTUBE_HOSTS:
+        if segments[:1] == ["watch"]:
+            candidate = parse_qs(parts.query).get("v", [""])[0]
+        elif len(segments) >= 2 and segments[0] in PATH_PREFIXES:
+            candidate = segments[1]
+    return candidate if VIDEO_ID_RE.match(candidate) else ""
+
+
+def thumbnail_url(video_id):
+    return f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
+
+
+def watch_url(video_id):
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def fetch_oembed(video_id, timeout=5.0):
+    """Default provider: ask YouTube's oEmbed endpoint about a video."""
+    query = urlencode({"url": watch_url(video_id), "format": "json"})
+    request = Request(f"{OEMBED_URL}?{query}",
+                      headers={"User-Agent": "cairo-backend"})
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+    except (URLError, OSError, ValueError) as exc:
+        raise OEmbedError(f"{video_id}: {exc}") from exc
+
+
+def oembed_provider():
+    """settings.YOUTUBE_OEMBED_PROVIDER: ``(video_id, timeout) -> dict``."""
+    return import_string(settings.YOUTUBE_OEMBED_PROVIDER)
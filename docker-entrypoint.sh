@@ -10,14 +10,46 @@ echo "Media root:  ${MEDIA_ROOT}"
 # Run migrations
 python manage.py migrate --noinput
 
+# Planner statistics; the admin also reads large tables' row counts from
+# them instead of running COUNT(*)
+python manage.py analyze_db
+
+# Nearby-places table: saves keep it current, but fixtures loaded with
+# loaddata bypass that, so rebuild it (cheap) on every start
+python manage.py build_place_neighbors
+
+# Timeline histogram buckets: same reasoning
+python manage.py build_timeline
+
+# Resumable uploads abandoned by their clients, and their partial files
+python manage.py expire_uploads
+
 # Collect static assets (including frontend) into STATIC_ROOT
 python manage.py collectstatic --noinput
 
-# Start Gunicorn
-exec gunicorn config.wsgi:application \
-  --bind 0.0.0.0:${PORT:-8000} \
-  --workers 3 \
-  --timeout 60 \
-  --access-logfile - \
-  --error-logfile -
-  
\ No newline at end of file
+# Prebuild map/detail documents into the shared cache so the first
+# visitors after a deploy do not pay for them. Never blocks startup for
+# longer than the budget, and never fails it.
+python manage.py warm_caches --budget "${WARM_CACHE_BUDGET:-30}" \
+  || echo "Cache warmup failed; continuing with a cold cache"
+
+# Fill in missing interview video titles from YouTube (a no-op once every
+# interview has been fetched). In the foreground, so it cannot outlive or
+# race the server it starts; a YouTube outage must not block the deploy.
+python manage.py fetch_interview_metadata \
+  --budget "${METADATA_FETCH_BUDGET:-30}" \
+  || echo "Interview metadata fetch failed; continuing"
+
+# Photos whose width/height/EXIF were never read (saved before they were
+# recorded, or a background read lost with its worker). A no-op when every
+# photo has been inspected; a large backlog is spread over several starts.
+python manage.py backfill_photo_metadata \
+  --budget "${PHOTO_BACKFILL_BUDGET:-60}" \
+  || echo "Photo metadata backfill failed; continuing"
+
+# Start Gunicorn. Worker class, count, threads, timeout and recycling are
+# sized in gunicorn.conf.py from CPU/memory and the WEB_* variables:
+#   SERVER_MODE=wsgi (default): gthread workers
+#   SERVER_MODE=asgi: uvicorn workers + async public endpoints, so slow
+#                     clients and SMTP do not pin a whole worker
+exec gunicorn -c gunicorn.conf.py
@@ -39,6 +39,7 @@ const placeMeta = document.getElementById("placeMeta");
 const placeHistory = document.getElementById("placeHistory");
 const placeEvents = document.getElementById("placeEvents");
 const placePersons = document.getElementById("placePersons");
+const placeNearby = document.getElementById("placeNearby");
 
 const gallery = document.getElementById("placeGallery");
 const galleryImg = document.getElementById("galleryImg");
@@ -334,9 +335,11 @@ function renderMarkers(geojson) {
       weight: 1.2
     }).addTo(map);
 
+    const counts = placeCounts(f.properties);
     const tooltipHtml =
       `<strong>${escapeHtml(f.properties.name)}</strong><br/>` +
-      `${escapeHtml(f.properties.brief || "")}`;
+      `${escapeHtml(f.properties.brief || "")}` +
+      (counts ? `<br/><small>${escapeHtml(counts)}</small>` : "");
     marker.bindTooltip(tooltipHtml, { direction: "top", offset: [0, -6] });
 
     marker.on("click", () => openPlaceModal(f.id));
@@ -358,6 +361,7 @@ function renderList(geojson) {
     li.innerHTML = `
       <div class="place-name">${escapeHtml(f.properties.name)}</div>
       <div class="place-brief">${escapeHtml(f.properties.brief || "")}</div>
+      <div class="place-counts">${escapeHtml(placeCounts(f.properties))}</div>
     `;
     li.addEventListener("click", () => openPlaceModal(f.id));
     elPlacesList.appendChild(li);
@@ -431,6 +435,7 @@ function openPlaceModal(placeId) {
       }
 
       placeOverlay.classList.add("visible");
+      loadNearby(placeId);
     })
     .catch(err => {
       console.error("Failed to fetch place details:", err);
@@ -438,9 +443,51 @@ function openPlaceModal(placeId) {
     });
 }
 
+function formatDistance(meters) {
+  return meters < 1000 ? `${meters} m` : `${(meters / 1000).toFixed(1)} km`;
+}
+
+function loadNearby(placeId) {
+  if (!placeNearby) return;
+  placeNearby.innerHTML = "";
+  const nearbyCol = placeNearby.closest(".col");
+  if (nearbyCol) nearbyCol.style.display = "none";
+
+  fetch(`${API_BASE}/places/${placeId}/nearby/?k=5`)
+    .then(r => {
+      if (!r.ok) throw new Error(`HTTP ${r.status}`);
+      return r.json();
+    })
+    .then(data => {
+      (data.results || []).forEach(pl => {
+        const li = document.createElement("li");
+        li.textContent = `${pl.name} (${formatDistance(pl.distance_m)})`;
+        li.addEventListener("click", () => openPlaceModal(pl.id));
+        placeNearby.appendChild(li);
+      });
+      if (nearbyCol && placeNearby.children.length > 0) {
+        nearbyCol.style.display = "block";
+      }
+    })
+    .catch(err => console.warn("Failed to fetch nearby places:", err));
+}
+
+function photoSize(p) {
+  return p.width && p.height
+    ? ` width="${p.width}" height="${p.height}"` : "";
+}
+
 function showPhoto(idx) {
   const p = currentPhotos[idx];
   if (!p) return;
+  // Known dimensions let the browser reserve the box before loading
+  if (p.width && p.height) {
+    galleryImg.width = p.width;
+    galleryImg.height = p.height;
+  } else {
+    galleryImg.removeAttribute("width");
+    galleryImg.removeAttribute("height");
+  }
   galleryImg.src = p.url;
   photoCaption.textContent = p.caption || "";
   photoCounter.textContent = `${idx + 1} / ${currentPhotos.length}`;
@@ -471,7 +518,7 @@ function openEventModal(eventId) {
       const photos = (ev.photos || []).filter(p => p.url);
       const photoHtml = photos.length
         ? `<div class="gallery mt" style="display:block">
-             <img src="${photos[0].url}" alt="">
+             <img src="${photos[0].url}" alt=""${photoSize(photos[0])}>
              <div class="caption">${escapeHtml(photos[0].caption || "")}</div>
            </div>`
         : "";
@@ -546,22 +593,8 @@ function openPersonModal(personId) {
     .catch(() => alert("Could not load person details."));
 }
 
-function makeYoutubeEmbed(url) {
-  if (!url) return null;
-  try {
-    const u = new URL(url);
-    if (u.hostname.includes("youtube.com")) {
-      const v = u.searchParams.get("v");
-      if (v) return `https://www.youtube.com/embed/${v}`;
-    }
-    if (u.hostname === "youtu.be") {
-      const id = u.pathname.slice(1);
-      if (id) return `https://www.youtube.com/embed/${id}`;
-    }
-  } catch (e) {
-    console.warn("Invalid YouTube URL:", url);
-  }
-  return null;
+function makeYoutubeEmbed(videoId) {
+  return videoId ? `https://www.youtube.com/embed/${videoId}` : null;
 }
 
 async function loadInterviews() {
@@ -569,7 +602,8 @@ async function loadInterviews() {
   if (interviewsCache.length > 0) return;
 
   try {
-    const url = `${API_BASE}/interviews/`;
+    // Compact, unpaginated feed; video IDs are parsed on the server
+    const url = `${API_BASE}/interviews/feed/`;
     console.log("Fetching interviews from:", url);
 
     const resp = await fetch(url);
@@ -583,10 +617,7 @@ async function loadInterviews() {
     const raw = await resp.json();
     console.log("Raw interviews JSON:", raw);
 
-    // ✅ Handle:
-    //  - paginated: { count, next, previous, results: [...] }
-    //  - plain array: [ ... ]
-    const items = Array.isArray(raw) ? raw : raw.results || [];
+    const items = raw.interviews;
 
     if (!Array.isArray(items)) {
       console.error("Interviews JSON not an array:", items);
@@ -627,11 +658,11 @@ function renderOralVideo(interview) {
   if (!oralVideoContainer) return;
   oralVideoContainer.innerHTML = "";
 
-  if (!interview || !interview.youtube_url) {
+  if (!interview) {
     return;
   }
 
-  const embedUrl = makeYoutubeEmbed(interview.youtube_url);
+  const embedUrl = makeYoutubeEmbed(interview.video_id);
   if (!embedUrl) {
     const msg = document.createElement("p");
     msg.textContent = "This interview does not have a valid YouTube link.";
@@ -644,7 +675,8 @@ function renderOralVideo(interview) {
 
   const iframe = document.createElement("iframe");
   iframe.src = embedUrl;
-  iframe.title = `Interview with ${interview.interviewee_name || "interviewee"}`;
+  iframe.title =
+    interview.title || `Interview with ${interview.interviewee_name || "interviewee"}`;
   iframe.allow =
     "accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture; web-share";
   iframe.allowFullscreen = true;
@@ -706,6 +738,16 @@ if (feedbackForm) {
 }
 
 // Small utilities
+// "12 events · 8 people · 5 photos", leaving out the zero counts
+function placeCounts(props) {
+  const parts = [
+    [props.events, "event", "events"],
+    [props.people, "person", "people"],
+    [props.photos, "photo", "photos"],
+  ].filter(([n]) => n > 0).map(([n, one, many]) => `${n} ${n === 1 ? one : many}`);
+  return parts.join(" · ");
+}
+
 function escapeHtml(s) {
   return (s ?? "").toString().replace(/[&<>"']/g, c => ({
     "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#039;"
@@ -0,0 +1,233 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings, sized from the container at start-up.
+
+    gunicorn -c gunicorn.conf.py
+
+Environment
+    SERVER_MODE         wsgi (default): gthread workers on config.wsgi
+                        asgi: uvicorn workers on config.asgi
+    WEB_WORKERS         fixed worker count (default: sized, see below)
+    WEB_THREADS         threads per gthread worker (default: 4)
+    WEB_WORKER_MEMORY_MB  memory budgeted per worker (default: 160)
+    WEB_MEMORY_RESERVE_MB memory kept free for the OS/cache (default: 256)
+    WEB_TIMEOUT         worker timeout in seconds (default: 60)
+    WEB_MAX_REQUESTS    recycle a worker after this many requests
+                        (default: 2000; 0 disables)
+    WEB_MAX_REQUESTS_JITTER  random extra requests per worker
+                        (default: 10% of WEB_MAX_REQUESTS)
+    WEB_STATS_EVERY     log worker stats every N requests (default: 500)
+    WEB_STATS_DIR       also write them to <dir>/<pid>.json (default: off)
+    GUNICORN_PRELOAD    1 (default) to load the app once in the master
+
+Workers = min(2 x CPUs + 1, (memory - reserve) / per-worker memory), at
+least 1. CPUs honour the cgroup quota and CPU affinity; memory is the
+cgroup limit or MemAvailable, whichever is smaller. Workers are recycled
+after WEB_MAX_REQUESTS (+ jitter, so they do not all restart together),
+which caps slow memory growth.
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+
+def _env_int(name, default):
+    value = os.environ.get(name, "")
+    return int(value) if value.strip() else default
+
+
+def cpu_count():
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+def memory_mb():
+    """Memory available to this container in MB, or None if unknown."""
+    candidates = []
+    for path in ("/sys/fs/cgroup/memory.max",
+                 "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            raw = Path(path).read_text().strip()
+        except OSError:
+            continue
+        if raw.isdigit() and int(raw) < 1 << 60:  # v1 "unlimited" is huge
+            candidates.append(int(raw) // (1024 * 1024))
+    try:
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                candidates.append(int(line.split()[1]) // 1024)
+    except OSError:
+        pass
+    return min(candidates) if candidates else None
+
+
+def worker_count(cpus, memory):
+    by_cpu = 2 * cpus + 1
+    if memory is None:
+        return by_cpu
+    spare = memory - _env_int("WEB_MEMORY_RESERVE_MB", 256)
+    by_memory = spare // _env_int("WEB_WORKER_MEMORY_MB", 160)
+    return max(1, min(by_cpu, by_memory))
+
+
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+CPUS = cpu_count()
+MEMORY_MB = memory_mb()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = _env_int("WEB_WORKERS", 0) or worker_count(CPUS, MEMORY_MB)
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    os.environ.setdefault("API_ASYNC_VIEWS", "true")
+else:
+    wsgi_app = "config.wsgi:application"
+    worker_class = "gthread"
+    threads = _env_int("WEB_THREADS", 4)
+
+timeout = _env_int("WEB_TIMEOUT", 60)
+graceful_timeout = 30
+keepalive = 5
+
+max_requests = _env_int("WEB_MAX_REQUESTS", 2000)
+max_requests_jitter = _env_int("WEB_MAX_REQUESTS_JITTER", max_requests // 10)
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+accesslog = "-"
+errorlog = "-"
+
+
+# --- per-worker request stats ----------------------------------------------
+
+class WorkerStats:
+    """Request count, 5xx count and latency of one worker process."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.recent = deque(maxlen=1000)
+        self.lock = threading.Lock()
+
+    def record(self, seconds, status):
+        with self.lock:
+            self.requests += 1
+            self.errors += status >= 500
+            self.total_s += seconds
+            self.max_s = max(self.max_s, seconds)
+            self.recent.append(seconds)
+            return self.requests
+
+    def snapshot(self):
+        with self.lock:
+            recent = sorted(self.recent)
+            requests = self.requests
+            total = self.total_s
+            data = {"pid": self.pid, "requests": requests,
+                    "errors": self.errors,
+                    "uptime_s": round(time.time() - self.started, 1),
+                    "mean_ms": round(total / requests * 1000, 1)
+                    if requests else None,
+                    "max_ms": round(self.max_s * 1000, 1)}
+        for name, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+            data[name] = (round(recent[min(len(recent) - 1,
+                                           int(len(recent) * q))] * 1000, 1)
+                          if recent else None)
+        return data
+
+
+_stats = None
+
+
+def _report(log, final=False):
+    data = _stats.snapshot()
+    log.info("worker %s stats%s: %s", data["pid"],
+             " (exiting)" if final else "", json.dumps(data))
+    stats_dir = os.environ.get("WEB_STATS_DIR")
+    if stats_dir:
+        path = Path(stats_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        tmp = path / f".{data['pid']}.tmp"
+        tmp.write_text(json.dumps(data))
+        tmp.replace(path / f"{data['pid']}.json")
+
+
+def _record(log, seconds, status):
+    count = _stats.record(seconds, status)
+    every = _env_int("WEB_STATS_EVERY", 500)
+    if every and count % every == 0:
+        _report(log)
+
+
+def _asgi_stats(app, log):
+    """uvicorn workers do not call pre/post_request: time the ASGI app."""
+    async def timed(scope, receive, send):
+        if scope["type"] != "http":
+            return await app(scope, receive, send)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await app(scope, receive, send_status)
+        finally:
+            _record(log, time.perf_counter() - started, status)
+    return timed
+
+
+def on_starting(server):
+    server.log.info(
+        "mode=%s workers=%s threads=%s class=%s (cpus=%s, memory=%sMB) "
+        "max_requests=%s+%s", SERVER_MODE, server.cfg.workers,
+        server.cfg.threads, server.cfg.worker_class_str, CPUS, MEMORY_MB,
+        server.cfg.max_requests, server.cfg.max_requests_jitter,
+    )
+
+
+def post_fork(server, worker):
+    global _stats
+    _stats = WorkerStats(worker.pid)
+
+
+def post_worker_init(worker):
+    if SERVER_MODE == "asgi":
+        worker.wsgi = _asgi_stats(worker.wsgi, worker.log)
+
+
+def pre_request(worker, req):
+    req._started = time.perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    started = getattr(req, "_started", None)
+    if started is not None:
+        _record(worker.log, time.perf_counter() - started,
+                resp.status_code or 0)
+
+
+def worker_exit(server, worker):
+    if _stats is not None:
+        _report(server.log, final=True)
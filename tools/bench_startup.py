@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Startup benchmark: boot time and memory of one worker per settings profile.
+
+    python tools/bench_startup.py                        # print a table
+    python tools/bench_startup.py --write tools/startup_benchmark.json
+
+Each run starts a fresh interpreter that imports ``config.wsgi`` (what a
+gunicorn worker does: django.setup() plus the eager URLconf import) and
+reports wall time, max RSS and the number of loaded modules. The median of
+``--runs`` runs is kept per profile. Compare numbers from the same machine
+only; the committed JSON records the machine it was taken on.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = ("config.settings", "config.settings_public")
+
+# Modules only the admin/CMS/docs/auth routes need. (django.contrib.admin
+# itself is always imported: DRF's schema generator pulls in admindocs.)
+WATCHED = (
+    "core.admin",
+    "core.cms_admin",
+    "drf_spectacular.openapi",
+    "rest_framework_simplejwt.authentication",
+)
+
+CHILD = r"""
+import json, resource, sys, time
+started = time.perf_counter()
+import config.wsgi  # noqa: F401
+elapsed = time.perf_counter() - started
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "import_s": elapsed,
+    "rss_mb": rss_kb / 1024,
+    "modules": len(sys.modules),
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def measure(settings_module):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    out = subprocess.run(
+        [sys.executable, "-X", "frozen_modules=off", "-c", CHILD % (WATCHED,)],
+        cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def bench(settings_module, runs):
+    samples = [measure(settings_module) for _ in range(runs)]
+    return {
+        "import_s": round(statistics.median(s["import_s"] for s in samples), 3),
+        "rss_mb": round(statistics.median(s["rss_mb"] for s in samples), 1),
+        "modules": samples[-1]["modules"],
+        "loaded": samples[-1]["loaded"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--profile", action="append", dest="profiles",
+                        help="settings module (repeatable); default: all")
+    parser.add_argument("--write", metavar="PATH",
+                        help="also store the results as JSON")
+    args = parser.parse_args()
+
+    results = {p: bench(p, args.runs) for p in args.profiles or PROFILES}
+
+    print(f"{'profile':28} {'import':>8} {'RSS':>9} {'modules':>8}")
+    for profile, r in results.items():
+        print(f"{profile:28} {r['import_s']:>7.3f}s {r['rss_mb']:>7.1f}MB "
+              f"{r['modules']:>8}")
+        if r["loaded"]:
+            print(f"{'':28} loads: {', '.join(r['loaded'])}")
+
+    if args.write:
+        report = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "runs": args.runs,
+            "profiles": results,
+        }
+        Path(args.write).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
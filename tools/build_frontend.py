@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Build the production copy of the static frontend.
+
+    python tools/build_frontend.py
+
+Reads frontend/ and writes build/frontend/ (point FRONTEND_DIR at it):
+  * app.js / styles.css minified (rjsmin / rcssmin)
+  * OTF fonts converted to WOFF2 (fontTools), with the OTF kept as fallback
+  * everything else copied as-is
+
+Hashing and gzip/Brotli precompression happen afterwards in collectstatic
+(core.storage.FrontendStaticFilesStorage), which also rewrites the asset
+references inside index.html to their hashed names.
+"""
+import re
+import shutil
+from pathlib import Path
+
+import rcssmin
+import rjsmin
+from fontTools.ttLib import TTFont
+
+SOURCE_DIR = Path("frontend")
+OUTPUT_DIR = Path("build/frontend")
+
+FONT_SRC_RE = re.compile(
+    r"""url\(["']?(?P<path>[^"')]+)\.otf["']?\)\s*format\(["']opentype["']\)"""
+)
+
+
+def convert_font(src: Path, dest: Path) -> Path:
+    woff2 = dest.with_suffix(".woff2")
+    font = TTFont(str(src))
+    font.flavor = "woff2"
+    font.save(str(woff2))
+    return woff2
+
+
+def prefer_woff2(css: str) -> str:
+    """Put a WOFF2 source in front of every OpenType font source."""
+    return FONT_SRC_RE.sub(
+        lambda m: (
+            f'url("{m["path"]}.woff2") format("woff2"), '
+            f'url("{m["path"]}.otf") format("opentype")'
+        ),
+        css,
+    )
+
+
+def build_file(src: Path, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    suffix = src.suffix.lower()
+
+    if suffix == ".js":
+        text = src.read_text(encoding="utf-8")
+        dest.write_text(rjsmin.jsmin(text), encoding="utf-8")
+    elif suffix == ".css":
+        text = prefer_woff2(src.read_text(encoding="utf-8"))
+        dest.write_text(rcssmin.cssmin(text), encoding="utf-8")
+    elif suffix == ".otf":
+        shutil.copy2(src, dest)
+        woff2 = convert_font(src, dest)
+        print(f"  {woff2.name}: {src.stat().st_size} -> "
+              f"{woff2.stat().st_size} bytes")
+        return
+    else:
+        shutil.copy2(src, dest)
+
+    print(f"  {dest.relative_to(OUTPUT_DIR)}: {src.stat().st_size} -> "
+          f"{dest.stat().st_size} bytes")
+
+
+def main() -> None:
+    if not SOURCE_DIR.exists():
+        raise SystemExit(f"Source dir {SOURCE_DIR} does not exist")
+
+    if OUTPUT_DIR.exists():
+        shutil.rmtree(OUTPUT_DIR)
+
+    print(f"Building {SOURCE_DIR} -> {OUTPUT_DIR}")
+    for src in sorted(SOURCE_DIR.rglob("*")):
+        if src.is_file():
+            build_file(src, OUTPUT_DIR / src.relative_to(SOURCE_DIR))
+
+
+if __name__ == "__main__":
+    main()
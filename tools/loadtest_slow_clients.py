@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Slow-client load test: how many trickling clients can one server process
+absorb while staying responsive?
+
+    python tools/loadtest_slow_clients.py --url http://127.0.0.1:8000/api/v1/places.geojson \\
+        --clients 50 --trickle 5
+
+Opens ``--clients`` connections that each dribble their request headers
+over ``--trickle`` seconds and then read the response in small pieces
+(what a phone on a rural link looks like to the server). Meanwhile a probe
+client issues normal requests back to back and records their latency.
+
+Run it once against each stack with a single worker, e.g.
+
+    gunicorn config.wsgi:application --workers 1
+    API_ASYNC_VIEWS=true gunicorn config.asgi:application \\
+        --worker-class uvicorn_worker.UvicornWorker --workers 1
+
+A sync worker serves one connection at a time, so the probe waits behind
+every slow client; the async worker keeps answering.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+def build_request(url) -> bytes:
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {parts.hostname}\r\n"
+        "User-Agent: cairo-loadtest\r\n"
+        "Accept: application/json\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode()
+
+
+async def slow_client(host, port, request, trickle, results):
+    started = time.perf_counter()
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+        delay = trickle / 2 / len(request)
+        for i in range(len(request)):
+            writer.write(request[i:i + 1])
+            await writer.drain()
+            await asyncio.sleep(delay)
+        status = await reader.readline()
+        while True:
+            chunk = await reader.read(512)
+            if not chunk:
+                break
+            await asyncio.sleep(trickle / 2 / 50)
+        writer.close()
+        ok = b" 200 " in status
+    except (OSError, asyncio.IncompleteReadError):
+        ok = False
+    results.append((ok, time.perf_counter() - started))
+
+
+async def probe(host, port, request, stop, latencies, timeout):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), timeout
+            )
+            writer.write(request)
+            await writer.drain()
+            await asyncio.wait_for(reader.read(), timeout)
+            writer.close()
+            latencies.append(time.perf_counter() - started)
+        except (OSError, asyncio.TimeoutError):
+            latencies.append(float("inf"))
+        await asyncio.sleep(0.05)
+
+
+async def run(args):
+    parts = urlsplit(args.url)
+    host, port = parts.hostname, parts.port or 80
+    request = build_request(args.url)
+
+    slow_results, latencies = [], []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(
+        probe(host, port, request, stop, latencies, args.timeout)
+    )
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        slow_client(host, port, request, args.trickle, slow_results)
+        for _ in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+
+    finite = sorted(x for x in latencies if x != float("inf"))
+    ok = sum(1 for success, _ in slow_results if success)
+    print(f"url:               {args.url}")
+    print(f"slow clients:      {ok}/{args.clients} ok, "
+          f"wall time {elapsed:.1f}s")
+    print(f"probe requests:    {len(latencies)} "
+          f"({len(latencies) - len(finite)} timed out)")
+    if finite:
+        p95 = finite[min(len(finite) - 1, int(len(finite) * 0.95))]
+        print(f"probe latency:     p50 {statistics.median(finite) * 1000:.0f} ms"
+              f", p95 {p95 * 1000:.0f} ms, max {finite[-1] * 1000:.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--trickle", type=float, default=5.0,
+                        help="seconds each slow client spends per request")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="probe request timeout in seconds")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()